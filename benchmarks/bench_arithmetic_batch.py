@@ -0,0 +1,71 @@
+"""Arithmetic solve+verify throughput: the base-class hooks vs the arithmetic overrides.
+
+"hooks" is what Trainer's serial path runs without the overrides (Solver.solve_batch and
+Verifier.verify_batch, i.e. solve every task, then verify every task); "interleaved"
+verifies each task right after solving it. Every measurement starts from an empty
+expression cache, so no side is timed against values another one computed.
+
+    python benchmarks/bench_arithmetic_batch.py [--sizes 10,100,1000,10000,100000]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from rzero.domains.arithmetic import (
+    _EVAL_CACHE,
+    ArithmeticChallenger,
+    ArithmeticSolver,
+    ArithmeticVerifier,
+    _eval_batch,
+    _safe_eval,
+)
+from rzero.solver import Solver
+from rzero.verifier import Verifier
+
+
+def _rate(n: int, fn) -> float:
+    _EVAL_CACHE.clear()
+    t0 = time.perf_counter()
+    fn()
+    return n / max(1e-9, time.perf_counter() - t0)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", default="10,100,1000,10000,100000")
+    ap.add_argument("--difficulty", type=float, default=0.8)
+    args = ap.parse_args()
+
+    random.seed(0)
+    solver, verifier = ArithmeticSolver(), ArithmeticVerifier()
+    print(
+        f"{'batch':>8} {'interleaved/s':>14} {'hooks/s':>14} {'override/s':>14} {'speedup':>8}"
+        f" {'loop evals/s':>14} {'batch evals/s':>14}"
+    )
+    for n in (int(x) for x in args.sizes.split(",")):
+        tasks = ArithmeticChallenger().propose_batch(n, difficulty=args.difficulty)
+
+        def interleaved() -> None:
+            for t in tasks:
+                verifier.verify(t, solver.solve(t))
+
+        def hooks() -> None:
+            Verifier.verify_batch(verifier, tasks, Solver.solve_batch(solver, tasks))
+
+        def override() -> None:
+            verifier.verify_batch(tasks, solver.solve_batch(tasks))
+
+        exprs = [t.prompt for t in tasks]
+        a, b, c = _rate(n, interleaved), _rate(n, hooks), _rate(n, override)
+        d = _rate(n, lambda: [_safe_eval(e) for e in exprs])
+        e = _rate(n, lambda: _eval_batch(exprs))
+        print(
+            f"{n:>8} {a:>14,.0f} {b:>14,.0f} {c:>14,.0f} {c / b:>7.1f}x"
+            f" {d:>14,.0f} {e:>14,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Pydantic models vs slotted records: objects/s, resident bytes and JSON bytes per sample.
+
+    python benchmarks/bench_records.py [--n 100000]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+import tracemalloc
+from datetime import datetime
+
+from rzero.records import (
+    SampleRecord,
+    SolutionRecord,
+    TaskRecord,
+    VerificationRecord,
+    dumps,
+    orjson,
+    record_rows,
+)
+from rzero.types import Sample, Solution, Task, Verification
+
+
+def _build(n: int, sample, task, solution, verification, now):
+    return [
+        sample(
+            task=task(
+                id=f"t{i}", domain="arithmetic", prompt="12 + 30", difficulty=0.5, created_at=now
+            ),
+            solution=solution(task_id=f"t{i}", solver="arith-heuristic", content="42"),
+            verification=verification(task_id=f"t{i}", passed=True, score=1.0),
+        )
+        for i in range(n)
+    ]
+
+
+def _measure(n: int, *types):
+    now = datetime.utcnow()
+    t0 = time.perf_counter()
+    _build(n, *types, now)
+    rate = n / (time.perf_counter() - t0)
+    tracemalloc.start()
+    objs = _build(n, *types, now)
+    resident = tracemalloc.get_traced_memory()[0] / n
+    tracemalloc.stop()
+    return objs, rate, resident
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=100_000)
+    args = ap.parse_args()
+    n = args.n
+
+    models, m_rate, m_bytes = _measure(n, Sample, Task, Solution, Verification)
+    records, r_rate, r_bytes = _measure(
+        n, SampleRecord, TaskRecord, SolutionRecord, VerificationRecord
+    )
+
+    t0 = time.perf_counter()
+    m_lines = [json.dumps(s.model_dump(mode="json"), ensure_ascii=False).encode() for s in models]
+    m_ser = n / (time.perf_counter() - t0)
+    t0 = time.perf_counter()
+    r_lines = [dumps(row) for row in record_rows(records)]
+    r_ser = n / (time.perf_counter() - t0)
+
+    print(f"n={n}  json encoder: {'orjson' if orjson is not None else 'stdlib json'}")
+    print(
+        f"{'':<10} {'build obj/s':>12} {'bytes/sample':>13} {'serialise/s':>12} "
+        f"{'json B/sample':>14}"
+    )
+    for name, rate, size, ser, lines in (
+        ("pydantic", m_rate, m_bytes, m_ser, m_lines),
+        ("records", r_rate, r_bytes, r_ser, r_lines),
+    ):
+        json_bytes = sum(map(len, lines)) / n
+        print(f"{name:<10} {rate:>12,.0f} {size:>13,.0f} {ser:>12,.0f} {json_bytes:>14,.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Arithmetic evaluation: the old recursive AST walk vs compiled closures vs the memoised
+_safe_eval.
+
+    python benchmarks/bench_safe_eval.py [--n 20000]
+
+"memoised" evaluates every prompt twice, as ArithmeticSolver + ArithmeticVerifier do.
+"""
+from __future__ import annotations
+
+import argparse
+import ast
+import operator as op
+import random
+import time
+
+from rzero.domains.arithmetic import (
+    _EVAL_CACHE,
+    ArithmeticChallenger,
+    TreeArithmeticChallenger,
+    _safe_eval,
+    compile_expr,
+)
+
+_OPS = {
+    ast.Add: op.add, ast.Sub: op.sub, ast.Mult: op.mul, ast.Div: op.truediv,
+    ast.FloorDiv: op.floordiv, ast.Mod: op.mod, ast.Pow: op.pow, ast.UAdd: op.pos, ast.USub: op.neg,
+}
+
+
+def legacy_eval(expr: str) -> float:
+    """The pre-compilation implementation (isinstance chain, re-parsed on every call)."""
+    def _eval(n: ast.AST) -> float:
+        if isinstance(n, ast.Expression):
+            return _eval(n.body)
+        if isinstance(n, ast.BinOp):
+            return _OPS[type(n.op)](_eval(n.left), _eval(n.right))  # type: ignore[index]
+        if isinstance(n, ast.UnaryOp):
+            return _OPS[type(n.op)](_eval(n.operand))  # type: ignore[index]
+        if isinstance(n, ast.Constant) and isinstance(n.value, (int, float)):
+            return float(n.value)
+        raise ValueError("bad node")
+    return _eval(ast.parse(expr, mode="eval"))
+
+
+def _rate(fn, exprs) -> float:
+    t0 = time.perf_counter()
+    for e in exprs:
+        try:
+            fn(e)
+        except Exception:
+            pass
+    return len(exprs) / (time.perf_counter() - t0)
+
+
+def _memoised(e: str) -> None:
+    try:
+        _safe_eval(e)
+    except Exception:
+        pass
+    _safe_eval(e)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=20_000)
+    args = ap.parse_args()
+    random.seed(0)
+    streams = {
+        name: [t.prompt for t in challenger.propose_batch(args.n, difficulty=0.8)]
+        for name, challenger in (
+            ("flat d=0.8", ArithmeticChallenger()),
+            ("tree d=0.8", TreeArithmeticChallenger(0)),
+        )
+    }
+    print(f"{'stream':<12} {'legacy x2/s':>12} {'compiled x2/s':>14} {'memoised x2/s':>14}")
+    for name, exprs in streams.items():
+        legacy = _rate(lambda e: (legacy_eval(e), legacy_eval(e)), exprs)
+        compiled = _rate(lambda e: (compile_expr(e)(), compile_expr(e)()), exprs)
+        _EVAL_CACHE.clear()
+        memo = _rate(_memoised, exprs)
+        print(f"{name:<12} {legacy:>12,.0f} {compiled:>14,.0f} {memo:>14,.0f}")
+    print("pow guard: 2 ** 10 ** 6 ->", end=" ")
+    t0 = time.perf_counter()
+    try:
+        _safe_eval("2 ** 10 ** 6")
+    except ValueError as e:
+        print(f"ValueError({e}) in {(time.perf_counter() - t0) * 1e6:.0f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""code-io verifications/sec: in-process exec vs the SandboxPool (serial, threaded, batched).
+
+    python benchmarks/bench_sandbox.py [--n 2000] [--workers 4] [--spin 20000]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from rzero.domains.code_io import CodeIOChallenger, CodeIOSolver, CodeIOVerifier
+from rzero.sandbox import SandboxPool
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=2000)
+    ap.add_argument("--workers", type=int, default=4)
+    ap.add_argument(
+        "--spin", type=int, default=0, help="extra loop iterations per call (CPU-heavy solutions)"
+    )
+    args = ap.parse_args()
+
+    random.seed(0)
+    tasks = CodeIOChallenger().propose_batch(args.n, difficulty=0.5)
+    solver = CodeIOSolver()
+    pairs = [(t, solver.solve(t)) for t in tasks]
+    if args.spin:
+        # prepend a busy loop to every call so execution, not IPC, dominates
+        for _, s in pairs:
+            head, body = s.content.split("\n", 1)
+            s.content = f"{head}\n    for _ in range({args.spin}):\n        pass\n{body}"
+
+    def rate(verifier: CodeIOVerifier, threads: int, batch: bool = False) -> float:
+        t0 = time.perf_counter()
+        if batch:
+            verifier.verify_batch([t for t, _ in pairs], [s for _, s in pairs])
+        elif threads <= 1:
+            for t, s in pairs:
+                verifier.verify(t, s)
+        else:
+            with ThreadPoolExecutor(threads) as ex:
+                list(ex.map(lambda p: verifier.verify(*p), pairs))
+        return len(pairs) / (time.perf_counter() - t0)
+
+    print(f"in-process:              {rate(CodeIOVerifier(), 1):>10,.0f} verifications/s")
+    with SandboxPool(args.workers) as pool:
+        v = CodeIOVerifier(sandbox=pool)
+        print(f"sandbox, serial:         {rate(v, 1):>10,.0f} verifications/s")
+        threads = f"sandbox, {args.workers} threads:"
+        print(f"{threads:<25}{rate(v, args.workers):>10,.0f} verifications/s")
+        print(f"sandbox, verify_batch:   {rate(v, 1, batch=True):>10,.0f} verifications/s")
+        print(pool.stats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""CLI startup: cumulative `import rzero.cli` time (python -X importtime) and `rzero --help`
+wall time.
+
+    python benchmarks/bench_startup.py [--runs 10]
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+from rzero.bench import STARTUP_BUDGET_US, startup
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=10)
+    args = ap.parse_args()
+
+    report = startup(args.runs)
+    print(
+        f"import rzero.cli: median {report['median_us'] / 1000:.1f} ms, "
+        f"min {report['min_us'] / 1000:.1f} ms "
+        f"({report['modules']} modules; budget {STARTUP_BUDGET_US / 1000:.0f} ms)"
+    )
+    print("slowest modules (self time):")
+    for self_us, name in report["top_self_us"]:
+        print(f"  {self_us / 1000:>7.2f} ms  {name}")
+
+    walls = []
+    for _ in range(args.runs):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "from rzero.cli import main; main()", "--help"],
+                       check=True, capture_output=True)
+        walls.append(time.perf_counter() - t0)
+    print(
+        f"rzero --help wall time: median {statistics.median(walls) * 1000:.1f} ms "
+        "(includes interpreter start)"
+    )
+
+
+if __name__ == "__main__":
+    main()
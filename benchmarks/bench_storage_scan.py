@@ -0,0 +1,69 @@
+"""Scan times: full JSONL parse vs projected iter_jsonl vs columnar column reads.
+
+    python benchmarks/bench_storage_scan.py [--rows 200000] [--dir /tmp/rzero-bench]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import statistics as st
+import time
+from pathlib import Path
+
+from rzero.columnar import ColumnarDataset, write_columnar
+from rzero.domains.code_io import CodeIOChallenger, CodeIOSolver, CodeIOVerifier
+from rzero.storage import JsonlSink, iter_jsonl
+from rzero.types import Sample
+
+
+def _timed(label: str, fn) -> None:
+    t0 = time.perf_counter()
+    out = fn()
+    print(f"{label:<40} {time.perf_counter() - t0:8.3f}s  -> {out:.4f}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=200_000)
+    ap.add_argument("--dir", type=Path, default=Path("/tmp/rzero-bench"))
+    args = ap.parse_args()
+
+    random.seed(0)
+    jsonl = args.dir / "samples.jsonl"
+    col = args.dir / "samples.col"
+    tasks = CodeIOChallenger().propose_batch(1000, difficulty=0.5)
+    solver, verifier = CodeIOSolver(), CodeIOVerifier()
+    batch = [
+        Sample(task=t, solution=(s := solver.solve(t)), verification=verifier.verify(t, s))
+        for t in tasks
+    ]
+    with JsonlSink(jsonl, append=False) as sink:
+        for ep in range(max(1, args.rows // len(batch))):
+            sink.write(batch, episode=ep)
+    write_columnar(iter_jsonl(jsonl), col)
+    ds = ColumnarDataset(col)
+    print(f"rows={len(ds)} jsonl={jsonl.stat().st_size / 1e6:.1f}MB")
+
+    _timed(
+        "jsonl full parse: mean score",
+        lambda: st.fmean(r["verification"]["score"] for r in iter_jsonl(jsonl)),
+    )
+    _timed(
+        "jsonl projected (mmap): mean score",
+        lambda: st.fmean(
+            r["verification.score"]
+            for r in iter_jsonl(jsonl, fields=["verification.score"], use_mmap=True)
+        ),
+    )
+    _timed("columnar column: mean score", lambda: st.fmean(ds.column("verification.score")))
+    last = len(ds) // len(batch) - 1
+    _timed(
+        f"columnar episode {last} rows: mean score",
+        lambda: st.fmean(
+            r["verification"]["score"] for a, b in ds.ranges(episode=last) for r in ds.rows(a, b)
+        ),
+    )
+
+
+if __name__ == "__main__":
+    main()
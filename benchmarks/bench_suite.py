@@ -0,0 +1,13 @@
+"""Full benchmark suite (same as `rzero bench`), with optional baseline comparison.
+
+    python benchmarks/bench_suite.py --sizes 100,1000,10000 --out bench.json
+    python benchmarks/bench_suite.py --baseline bench.json
+"""
+from __future__ import annotations
+
+import sys
+
+from rzero.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main(["bench", *sys.argv[1:]]))
@@ -1,4 +1,55 @@
 """R-zero reusable training loop and example domains."""
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any, Dict, List
+
 from .version import __version__
 
-__all__ = ["__version__"]
\ No newline at end of file
+# Public names resolve on first attribute access (PEP 562), so `import rzero` stays as cheap
+# as reading the version; `from rzero import Trainer` imports rzero.loop at that point.
+_LAZY: Dict[str, str] = {
+    "Trainer": "rzero.loop",
+    "AsyncTrainer": "rzero.loop",
+    "Curriculum": "rzero.curriculum",
+    "Challenger": "rzero.challenger",
+    "Solver": "rzero.solver",
+    "Verifier": "rzero.verifier",
+    "Task": "rzero.types",
+    "Solution": "rzero.types",
+    "Verification": "rzero.types",
+    "Sample": "rzero.types",
+}
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .challenger import Challenger
+    from .curriculum import Curriculum
+    from .loop import AsyncTrainer, Trainer
+    from .solver import Solver
+    from .types import Sample, Solution, Task, Verification
+    from .verifier import Verifier
+
+__all__ = [
+    "__version__",
+    "Trainer",
+    "AsyncTrainer",
+    "Curriculum",
+    "Challenger",
+    "Solver",
+    "Verifier",
+    "Task",
+    "Solution",
+    "Verification",
+    "Sample",
+]
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module 'rzero' has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+def __dir__() -> List[str]:
+    return sorted([*globals(), *_LAZY])
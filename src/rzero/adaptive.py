@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+# --- Adaptive episode sizing and early stopping (Trainer(adaptive=AdaptiveBatch(...))).
+# The batch size follows the observed per-task wall time (an EMA over whole episodes, so
+# per-episode overhead is amortised into it): each episode is sized to take about
+# ``episode_seconds``. ``time_budget`` (seconds) and ``task_budget`` (tasks, i.e. solver
+# calls) bound the whole run; the last episode is trimmed to what is left of them.
+# The run stops early once the curriculum reports convergence (Curriculum.converged, which
+# needs confidence stepping: Curriculum(z=...)) for ``patience`` consecutive episodes.
+
+@dataclass
+class AdaptiveBatch:
+    episode_seconds: Optional[float] = None
+    time_budget: Optional[float] = None
+    task_budget: Optional[int] = None
+    min_batch: int = 1
+    max_batch: int = 4096
+    patience: int = 2  # 0 = never stop early
+    alpha: float = 0.3
+    # running state
+    task_seconds: Optional[float] = None
+    tasks: int = 0
+    seconds: float = 0.0
+    converged_for: int = 0
+    stop_reason: Optional[str] = None
+
+    def next_size(self, batch_size: int, in_flight: int = 0) -> int:
+        """Tasks for the next episode (``batch_size`` until latency is known); 0 = stop.
+
+        ``in_flight`` tasks were handed out but not observed yet (a pipelined loop proposes
+        ahead); they count against the budgets.
+        """
+        if self.stop_reason is not None:
+            return 0
+        n = batch_size
+        if self.episode_seconds is not None and self.task_seconds:
+            n = round(self.episode_seconds / self.task_seconds)
+        n = max(self.min_batch, min(self.max_batch, n))
+        if self.time_budget is not None:
+            left = self.time_budget - self.seconds - in_flight * (self.task_seconds or 0.0)
+            if left <= 0:
+                return self._stop("time budget spent")
+            if self.task_seconds:
+                n = min(n, max(1, int(left / self.task_seconds)))
+        if self.task_budget is not None:
+            left_tasks = self.task_budget - self.tasks - in_flight
+            if left_tasks <= 0:
+                return self._stop("task budget spent")
+            n = min(n, left_tasks)
+        return n
+
+    def observe(self, n: int, seconds: float, converged: bool = False) -> None:
+        self.tasks += n
+        self.seconds += seconds
+        if n:
+            per_task = seconds / n
+            if self.task_seconds is None:
+                self.task_seconds = per_task
+            else:
+                self.task_seconds += self.alpha * (per_task - self.task_seconds)
+        self.converged_for = self.converged_for + 1 if converged else 0
+        if self.patience and self.converged_for >= self.patience:
+            self._stop("curriculum converged")
+
+    def _stop(self, reason: str) -> int:
+        self.stop_reason = reason
+        return 0
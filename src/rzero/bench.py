@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+import json
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from .storage import atomic_write_text
+from .version import __version__
+
+# --- Micro/end-to-end benchmark suite behind `rzero bench` (and benchmarks/bench_suite.py).
+# Each case is a context manager taking a size: setup happens before the yield, the yielded
+# callable is the timed body and returns how many items it processed, teardown follows.
+
+Case = Callable[..., Any]
+CASES: Dict[str, Case] = {}
+
+def case(name: str) -> Callable[[Case], Case]:
+    def _register(fn: Case) -> Case:
+        CASES[name] = contextmanager(fn)
+        return fn
+    return _register
+
+@case("safe_eval")
+def _safe_eval_case(n: int) -> Iterator[Callable[[], int]]:
+    from .domains.arithmetic import ArithmeticChallenger, _safe_eval
+
+    random.seed(0)
+    exprs = [t.prompt for t in ArithmeticChallenger().propose_batch(n, difficulty=0.8)]
+
+    def body() -> int:
+        for e in exprs:
+            _safe_eval(e)
+        return n
+    yield body
+
+@case("safe_eval_cold")
+def _safe_eval_cold_case(n: int) -> Iterator[Callable[[], int]]:
+    from .domains.arithmetic import _EVAL_CACHE, TreeArithmeticChallenger, _safe_eval
+
+    exprs = [t.prompt for t in TreeArithmeticChallenger(0).propose_batch(n, difficulty=0.8)]
+
+    def body() -> int:
+        _EVAL_CACHE.clear()  # parse + validate + evaluate every expression
+        for e in exprs:
+            _safe_eval(e)
+        return n
+    yield body
+
+@case("propose_batch")
+def _propose_case(n: int) -> Iterator[Callable[[], int]]:
+    from .domains.arithmetic import ArithmeticChallenger
+
+    random.seed(0)
+    ch = ArithmeticChallenger()
+    yield lambda: len(ch.propose_batch(n, difficulty=0.8))
+
+@case("propose_tree")
+def _propose_tree_case(n: int) -> Iterator[Callable[[], int]]:
+    from .domains.arithmetic import TreeArithmeticChallenger
+
+    ch = TreeArithmeticChallenger(0)
+    yield lambda: len(ch.propose_batch(n, difficulty=0.8))
+
+@case("codeio_verify")
+def _codeio_verify_case(n: int) -> Iterator[Callable[[], int]]:
+    from .domains.code_io import CodeIOChallenger, CodeIOSolver, CodeIOVerifier
+
+    random.seed(0)
+    tasks = CodeIOChallenger().propose_batch(n, difficulty=0.5)
+    sols = [CodeIOSolver().solve(t) for t in tasks]
+    verifier = CodeIOVerifier()  # no result cache: every call runs the tests
+
+    def body() -> int:
+        for t, s in zip(tasks, sols):
+            verifier.verify(t, s)
+        return n
+    yield body
+
+@case("sample_construct")
+def _sample_case(n: int) -> Iterator[Callable[[], int]]:
+    from .types import Sample, Solution, Task, Verification
+
+    def body() -> int:
+        for i in range(n):
+            tid = f"t{i}"
+            Sample(
+                task=Task(id=tid, domain="arithmetic", prompt="1 + 2", difficulty=0.5),
+                solution=Solution(task_id=tid, content="3"),
+                verification=Verification(task_id=tid, passed=True, score=1.0),
+            )
+        return n
+    yield body
+
+@case("record_construct")
+def _record_case(n: int) -> Iterator[Callable[[], int]]:
+    from .records import SampleRecord, SolutionRecord, TaskRecord, VerificationRecord
+
+    def body() -> int:
+        for i in range(n):
+            tid = f"t{i}"
+            SampleRecord(
+                TaskRecord(id=tid, domain="arithmetic", prompt="1 + 2", difficulty=0.5),
+                SolutionRecord(task_id=tid, content="3"),
+                VerificationRecord(task_id=tid, passed=True, score=1.0),
+            )
+        return n
+    yield body
+
+def _samples(n: int) -> List[Any]:
+    from .domains.arithmetic import ArithmeticChallenger, ArithmeticSolver, ArithmeticVerifier
+    from .types import Sample
+
+    random.seed(0)
+    tasks = ArithmeticChallenger().propose_batch(n, difficulty=0.5)
+    sols = ArithmeticSolver().solve_batch(tasks)
+    vers = ArithmeticVerifier().verify_batch(tasks, sols)
+    return [Sample(task=t, solution=s, verification=v) for t, s, v in zip(tasks, sols, vers)]
+
+@case("write_jsonl")
+def _write_case(n: int) -> Iterator[Callable[[], int]]:
+    from .storage import write_jsonl
+
+    tmp = Path(tempfile.mkdtemp(prefix="rzero-bench-"))
+    samples = _samples(n)
+    try:
+        yield lambda: (write_jsonl(samples, tmp / "s.jsonl"), n)[1]
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+@case("read_jsonl")
+def _read_case(n: int) -> Iterator[Callable[[], int]]:
+    from .storage import read_jsonl, write_jsonl
+
+    tmp = Path(tempfile.mkdtemp(prefix="rzero-bench-"))
+    path = write_jsonl(_samples(n), tmp / "s.jsonl")
+    try:
+        yield lambda: len(read_jsonl(path))
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+@case("trainer_run")
+def _trainer_case(
+    n: int,
+    episodes: int = 1,
+    domain: str = "arithmetic",
+) -> Iterator[Callable[[], int]]:
+    from .loop import Trainer
+
+    if domain == "arithmetic":
+        from .domains.arithmetic import ArithmeticChallenger as C
+        from .domains.arithmetic import ArithmeticSolver as S
+        from .domains.arithmetic import ArithmeticVerifier as V
+    else:
+        from .domains.code_io import CodeIOChallenger as C  # type: ignore[assignment]
+        from .domains.code_io import CodeIOSolver as S
+        from .domains.code_io import CodeIOVerifier as V
+
+    def body() -> int:
+        random.seed(0)
+        trainer = Trainer(challenger=C(), solver=S(), verifier=V(), keep_samples=False)
+        trainer.run(episodes=episodes, batch_size=n)
+        return n * episodes
+    yield body
+
+@case("trainer_run_codeio")
+def _trainer_codeio_case(n: int, episodes: int = 1) -> Iterator[Callable[[], int]]:
+    yield from _trainer_case(n, episodes, domain="code-io")
+
+# Startup cost is measured in a fresh interpreter: `python -X importtime` reports per module
+# self and cumulative microseconds on stderr.
+STARTUP_BUDGET_US = 150_000  # cumulative import time of rzero.cli (tests/test_startup.py)
+
+def import_times(statement: str = "import rzero.cli") -> Dict[str, tuple[int, int]]:
+    """{module: (self_us, cumulative_us)} for running ``statement`` in a new interpreter."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                          capture_output=True, text=True, check=True)
+    out: Dict[str, tuple[int, int]] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|")
+        out[name.strip()] = (int(self_us), int(cum_us))
+    return out
+
+def startup(runs: int = 5, module: str = "rzero.cli") -> Dict[str, Any]:
+    """Median cumulative import time of ``module`` over ``runs`` fresh interpreters."""
+    samples = [import_times(f"import {module}") for _ in range(max(1, runs))]
+    cumulative = [s[module][1] for s in samples]
+    last = samples[-1]
+    return {
+        "module": module,
+        "median_us": statistics.median(cumulative),
+        "min_us": min(cumulative),
+        "modules": len(last),
+        "top_self_us": sorted(((v[0], k) for k, v in last.items()), reverse=True)[:10],
+    }
+
+def key(name: str, size: int, episodes: Optional[int]) -> str:
+    return f"{name}[n={size}]" if episodes is None else f"{name}[e={episodes},n={size}]"
+
+def measure(
+    name: str,
+    size: int,
+    *,
+    episodes: Optional[int] = None,
+    repeat: int = 3,
+    warmup: int = 1,
+) -> Dict[str, Any]:
+    """Time one case: ``warmup`` untimed runs, then best/median of ``repeat`` timed runs."""
+    kwargs = {} if episodes is None else {"episodes": episodes}
+    times: List[float] = []
+    items = 0
+    with CASES[name](size, **kwargs) as body:
+        for _ in range(max(0, warmup)):
+            body()
+        for _ in range(max(1, repeat)):
+            t0 = time.perf_counter()
+            items = body()
+            times.append(time.perf_counter() - t0)
+    best = min(times)
+    return {
+        "name": name,
+        "size": size,
+        "episodes": episodes,
+        "items": items,
+        "best_s": best,
+        "median_s": statistics.median(times),
+        "items_per_s": items / max(best, 1e-12),
+    }
+
+def run_suite(
+    names: Optional[Sequence[str]] = None,
+    sizes: Sequence[int] = (100, 1000),
+    episodes: Sequence[int] = (1, 5),
+    *,
+    repeat: int = 3,
+    warmup: int = 1,
+    progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    """Run every selected case across ``sizes`` (and ``episodes`` for the trainer_run cases)."""
+    results: Dict[str, Dict[str, Any]] = {}
+    for name in names or list(CASES):
+        if name not in CASES:
+            raise KeyError(f"unknown benchmark {name!r}; available: {', '.join(CASES)}")
+        for size in sizes:
+            for ep in (episodes if name.startswith("trainer_run") else (None,)):
+                r = measure(name, size, episodes=ep, repeat=repeat, warmup=warmup)
+                results[key(name, size, ep)] = r
+                if progress is not None:
+                    progress(r)
+    return {
+        "meta": {
+            "rzero": __version__,
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+def compare(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    *,
+    tolerance: float = 0.10,
+) -> List[Dict[str, Any]]:
+    """Per-benchmark throughput ratio vs baseline; ``regressed`` when it fell by > tolerance."""
+    out: List[Dict[str, Any]] = []
+    base = baseline.get("results", {})
+    for key, r in current["results"].items():
+        b = base.get(key)
+        if b is None:
+            continue
+        ratio = r["items_per_s"] / max(b["items_per_s"], 1e-12)
+        out.append({"key": key, "baseline": b["items_per_s"], "current": r["items_per_s"],
+                    "ratio": ratio, "regressed": ratio < 1.0 - tolerance})
+    return out
+
+def save(report: Dict[str, Any], path: str | Path) -> Path:
+    return atomic_write_text(path, json.dumps(report, indent=2))
+
+def load(path: str | Path) -> Dict[str, Any]:
+    return json.loads(Path(path).expanduser().read_text(encoding="utf-8"))
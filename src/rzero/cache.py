@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Generic, Hashable, Iterator, Optional, Tuple, TypeVar
+
+from .storage import atomic_write_text
+
+# --- Small thread-safe LRU with optional byte budget and TTL, shared by the caches in rzero.
+
+V = TypeVar("V")
+
+def content_hash(*parts: Any) -> str:
+    """Stable sha256 over JSON-able parts (tuples/lists hash the same; others via repr)."""
+    blob = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=repr)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expired: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / max(1, self.hits + self.misses)
+
+class LRUCache(Generic[V]):
+    """Least-recently-used cache bounded by entry count and (optionally) total bytes.
+
+    ``sizeof`` estimates an entry's size (default: sys.getsizeof of the value);
+    ``ttl_s`` expires entries lazily on access.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        *,
+        max_bytes: Optional[int] = None,
+        ttl_s: Optional[float] = None,
+        sizeof: Optional[Callable[[V], int]] = None,
+    ) -> None:
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max_bytes
+        self.ttl_s = ttl_s
+        self.sizeof = sizeof or sys.getsizeof
+        self.stats = CacheStats()
+        self.bytes = 0
+        self._data: "OrderedDict[Hashable, Tuple[V, int, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    # Pickles as a snapshot (process executors, distributed workers); each copy has its own lock.
+    def __getstate__(self) -> Dict[str, Any]:
+        with self._lock:
+            state = self.__dict__.copy()
+            state["_data"] = OrderedDict(self._data)
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return self._live(key) is not None
+
+    def _live(self, key: Hashable) -> Optional[Tuple[V, int, float]]:
+        entry = self._data.get(key)
+        ttl = self.ttl_s
+        if entry is not None and ttl is not None and time.monotonic() - entry[2] > ttl:
+            self._drop(key)
+            self.stats.expired += 1
+            return None
+        return entry
+
+    def _drop(self, key: Hashable) -> None:
+        _, size, _ = self._data.pop(key)
+        self.bytes -= size
+
+    def get(self, key: Hashable, default: Optional[V] = None) -> Optional[V]:
+        with self._lock:
+            entry = self._live(key)
+            if entry is None:
+                self.stats.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.stats.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: V) -> None:
+        size = self.sizeof(value)
+        with self._lock:
+            if key in self._data:
+                self._drop(key)
+            self._data[key] = (value, size, time.monotonic())
+            self.bytes += size
+            while len(self._data) > self.max_entries or (
+                self.max_bytes is not None and self.bytes > self.max_bytes and len(self._data) > 1
+            ):
+                self._drop(next(iter(self._data)))
+                self.stats.evictions += 1
+
+    def items(self) -> Iterator[Tuple[Hashable, V]]:
+        with self._lock:
+            snapshot = [(k, v[0]) for k, v in self._data.items()]
+        return iter(snapshot)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._data),
+            "bytes": self.bytes,
+            "hits": self.stats.hits,
+            "misses": self.stats.misses,
+            "evictions": self.stats.evictions,
+            "hit_rate": round(self.stats.hit_rate, 4),
+        }
+
+    # Persistence for JSON-able values (keys are stored as strings).
+    def save_json(self, path: str | Path) -> Path:
+        return atomic_write_text(path, json.dumps({str(k): v for k, v in self.items()}))
+
+    def load_json(self, path: str | Path) -> int:
+        p = Path(path).expanduser()
+        if not p.exists():
+            return 0
+        data = json.loads(p.read_text(encoding="utf-8"))
+        for k, v in data.items():
+            self.put(k, v)
+        return len(data)
+
+class SqliteStore:
+    """On-disk key -> JSON value store with TTL, for caches that should survive restarts."""
+
+    def __init__(self, path: str | Path, *, ttl_s: Optional[float] = None) -> None:
+        import sqlite3
+
+        p = Path(path).expanduser()
+        p.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_s = ttl_s
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(p), check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS kv "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)"
+        )
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._db.execute("SELECT value, created FROM kv WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        if self.ttl_s is not None and time.time() - row[1] > self.ttl_s:
+            with self._lock:
+                self._db.execute("DELETE FROM kv WHERE key = ?", (key,))
+            return None
+        return json.loads(row[0])
+
+    def put(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO kv (key, value, created) VALUES (?, ?, ?)",
+                (key, json.dumps(value), time.time()),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+class ResponseCache:
+    """Two-level cache: in-memory LRU in front of an optional SqliteStore (same TTL)."""
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        *,
+        ttl_s: Optional[float] = None,
+        path: Optional[str | Path] = None,
+    ) -> None:
+        self.memory: LRUCache[Any] = LRUCache(max_entries, ttl_s=ttl_s)
+        self.disk = SqliteStore(path, ttl_s=ttl_s) if path is not None else None
+        self.disk_hits = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.memory.get(key)
+        if value is None and self.disk is not None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.disk_hits += 1
+                self.memory.put(key, value)
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        self.memory.put(key, value)
+        if self.disk is not None:
+            self.disk.put(key, value)
+
+    def summary(self) -> Dict[str, Any]:
+        return {**self.memory.summary(), "disk_hits": self.disk_hits}
+
+    def close(self) -> None:
+        if self.disk is not None:
+            self.disk.close()
@@ -2,6 +2,7 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from typing import List, TypedDict
 from .types import Task
+from .records import TaskRecord
 
 class EpisodeFeedback(TypedDict, total=False):
     difficulty: float
@@ -12,6 +13,14 @@ class Challenger(ABC):
     """Produces tasks for a given domain and difficulty, and may learn from feedback."""
     @abstractmethod
     def propose_batch(self, n: int, *, difficulty: float) -> List[Task]: ...
+    # Optional fast-path hook (Trainer(records=True)); override to skip pydantic entirely
+    def propose_records(self, n: int, *, difficulty: float) -> List[TaskRecord]:
+        return [TaskRecord.from_model(t) for t in self.propose_batch(n, difficulty=difficulty)]
     # Optional training hook
     def update(self, feedback: EpisodeFeedback) -> None:  # no-op by default
         pass
+    # Optional persistence hooks (used by Trainer checkpoints)
+    def save(self, path: str) -> None:  # pragma: no cover
+        pass
+    def load(self, path: str) -> None:  # pragma: no cover
+        pass
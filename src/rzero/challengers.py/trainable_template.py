@@ -28,3 +28,17 @@ class RewriteChallengerTrainable(Challenger):
         r = float(feedback.get("reward", 0.0))
         step = 0.02 if r >= 0.8 else (-0.02 if r <= 0.2 else 0.0)
         self.bias = max(-0.2, min(0.2, self.bias + step))
+
+    def save(self, path: str) -> None:
+        import json
+        import pathlib
+        p = pathlib.Path(path)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text(json.dumps({"bias": self.bias}), encoding="utf-8")
+
+    def load(self, path: str) -> None:
+        import json
+        import pathlib
+        p = pathlib.Path(path)
+        if p.exists():
+            self.bias = float(json.loads(p.read_text(encoding="utf-8"))["bias"])
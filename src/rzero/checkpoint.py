@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import json
+import os
+import random
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+from .storage import atomic_write_text
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .loop import Trainer
+
+# --- Trainer checkpoints: everything needed to continue a run as if it never stopped.
+#   <ckpt>              JSON: episode, difficulty, curriculum, RNG state, dataset offset
+#                       (bytes of a JSONL dataset, or the last row id of a sample store)
+#   <ckpt>.solver       Solver.save() output (if the solver writes anything)
+#   <ckpt>.challenger   Challenger.save() output (likewise)
+# Component state is written first (each via temp file + rename) and the JSON last, so the
+# JSON never refers to state newer or older than itself.
+
+VERSION = 1
+
+_ADAPTIVE_STATE = ("task_seconds", "tasks", "seconds", "converged_for")
+
+def _rng_to_json(state: Any) -> List[Any]:
+    version, internal, gauss = state
+    return [version, list(internal), gauss]
+
+def _rng_from_json(data: List[Any]) -> Any:
+    version, internal, gauss = data
+    return (version, tuple(internal), gauss)
+
+def _save_component(save: Callable[[str], None], path: Path) -> Optional[str]:
+    tmp = path.with_name(path.name + ".tmp")
+    if tmp.exists():
+        tmp.unlink()
+    save(str(tmp))
+    if not tmp.exists():  # default no-op hook
+        return None
+    with tmp.open("rb") as f:
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    return str(path)
+
+@dataclass
+class ProposalState:
+    """Global RNG and challenger state right after an episode's tasks were proposed.
+
+    Loops that propose ahead of the episode they apply (PipelinedTrainer) take one per
+    checkpointed episode and hand it to ``capture``; ``challenger_state`` is a file written
+    by Challenger.save, moved into place when the checkpoint is captured.
+    """
+    rng_state: Any
+    challenger_state: Optional[str] = None
+
+    @classmethod
+    def take(cls, challenger: Any, path: str | Path) -> "ProposalState":
+        return cls(random.getstate(), _save_component(challenger.save, Path(path)))
+
+    def discard(self) -> None:
+        if self.challenger_state:
+            Path(self.challenger_state).unlink(missing_ok=True)
+
+@dataclass
+class TrainerCheckpoint:
+    episode: int
+    difficulty: float
+    rng_state: List[Any]
+    curriculum: Dict[str, Any] = field(default_factory=dict)
+    solver_state: Optional[str] = None
+    challenger_state: Optional[str] = None
+    dataset: Optional[str] = None
+    # bytes (JSONL) or last row id (sample store) of the dataset that belong to episodes < episode
+    dataset_offset: Optional[int] = None
+    # AdaptiveBatch running state (budgets come from the new run)
+    adaptive: Optional[Dict[str, Any]] = None
+    version: int = VERSION
+
+    @classmethod
+    def capture(
+        cls,
+        trainer: "Trainer",
+        path: str | Path,
+        proposal: Optional[ProposalState] = None,
+    ) -> "TrainerCheckpoint":
+        """Save component state next to ``path`` and return the matching checkpoint.
+
+        RNG and challenger state come from ``proposal`` when given, else from their current
+        state.
+        """
+        p = Path(path).expanduser()
+        p.parent.mkdir(parents=True, exist_ok=True)
+        offset = trainer.sink.checkpoint() if trainer.sink is not None else None
+        adaptive = None
+        if trainer.adaptive is not None:
+            adaptive = {k: getattr(trainer.adaptive, k) for k in _ADAPTIVE_STATE}
+        challenger_path = p.with_name(p.name + ".challenger")
+        if proposal is None:
+            rng_state = random.getstate()
+            challenger_state = _save_component(trainer.challenger.save, challenger_path)
+        else:
+            rng_state, challenger_state = proposal.rng_state, None
+            if proposal.challenger_state:
+                os.replace(proposal.challenger_state, challenger_path)
+                challenger_state = str(challenger_path)
+        return cls(
+            episode=trainer.episode,
+            difficulty=trainer.difficulty,
+            rng_state=_rng_to_json(rng_state),
+            curriculum=asdict(trainer.curriculum),
+            solver_state=_save_component(trainer.solver.save, p.with_name(p.name + ".solver")),
+            challenger_state=challenger_state,
+            dataset=str(getattr(trainer.sink, "path", "")) or None,
+            dataset_offset=offset,
+            adaptive=adaptive,
+        )
+
+    def save(self, path: str | Path) -> None:
+        atomic_write_text(path, json.dumps(asdict(self), indent=2))
+
+    @classmethod
+    def load(cls, path: str | Path) -> "TrainerCheckpoint":
+        data = json.loads(Path(path).expanduser().read_text(encoding="utf-8"))
+        if data.get("version") != VERSION:
+            raise ValueError(f"unsupported checkpoint version {data.get('version')!r}")
+        return cls(**data)
+
+    def restore(self, trainer: "Trainer") -> None:
+        """Put the trainer, its components and the global RNG back in the saved state."""
+        trainer.episode = self.episode
+        trainer.difficulty = self.difficulty
+        for k, v in self.curriculum.items():
+            setattr(trainer.curriculum, k, v)
+        random.setstate(_rng_from_json(self.rng_state))
+        if self.adaptive and trainer.adaptive is not None:
+            for k, v in self.adaptive.items():
+                setattr(trainer.adaptive, k, v)
+        if self.solver_state:
+            trainer.solver.load(self.solver_state)
+        if self.challenger_state:
+            trainer.challenger.load(self.challenger_state)
+
+    def truncate_dataset(self, path: Optional[str | Path] = None) -> None:
+        """Drop rows written after the checkpoint (a partial or unfinished episode)."""
+        from .samplestore import SampleStore, is_store
+
+        target = Path(path or self.dataset or "").expanduser()
+        if self.dataset_offset is None or not target.is_file():
+            return
+        if is_store(target):
+            with SampleStore(target) as store:
+                store.truncate(self.episode, after_id=self.dataset_offset)
+            return
+        if target.stat().st_size > self.dataset_offset:
+            os.truncate(target, self.dataset_offset)
@@ -1,26 +1,44 @@
 from __future__ import annotations
 
-import json
+from contextlib import ExitStack
 from pathlib import Path
-from typing import Literal
+from typing import Any
 
 import click
 
-from .loop import Trainer
-from .curriculum import Curriculum
-from .storage import write_jsonl
-from .domains.arithmetic import ArithmeticChallenger, ArithmeticSolver, ArithmeticVerifier
-from .domains.code_io import CodeIOChallenger, CodeIOSolver, CodeIOVerifier
+from . import domains
 
-DATA_DIR = Path("./data").expanduser()
-DATA_DIR.mkdir(parents=True, exist_ok=True)
+# --- Startup stays cheap: commands import what they use (pydantic, the loop, domains) in
+# their bodies, and --domain is resolved through the plugin registry (rzero.plugins) only
+# when `run` starts, so neither domain modules nor entry-point metadata load at import.
+# tests/test_startup.py holds `import rzero.cli` to an import-time budget.
+
+DATA_DIR = Path("./data")  # created by the sink on first write, not at import
+# Mirrors rzero.execution.EXECUTORS (importing that module would pull in asyncio).
+EXECUTOR_CHOICES = ("serial", "thread", "process", "asyncio")
+# "auto" is resolved by the Trainer from component capabilities.
 
 @click.group()
 def main() -> None:
     """rzero CLI: run training loops and manage datasets."""
 
 @main.command()
-@click.option("--domain", type=click.Choice(["arithmetic", "code-io"]), default="arithmetic")
+@click.option(
+    "--domain",
+    default="arithmetic",
+    show_default=True,
+    help=(
+        f"{', '.join(domains.names())}, or an installed plugin (see `rzero domains`); "
+        "comma-separate several to mix them in each episode."
+    ),
+)
+@click.option(
+    "--schedule",
+    type=click.Choice(["uniform", "throughput", "learning"]),
+    default="uniform",
+    show_default=True,
+    help="Several domains: how the batch is split between them.",
+)
 @click.option("--solver", type=click.Choice(["heuristic", "llm"]), default="heuristic", show_default=True)
 @click.option("--episodes", type=int, default=2, show_default=True)
 @click.option("--batch-size", type=int, default=8, show_default=True)
@@ -29,7 +47,30 @@ def main() -> None:
     type=click.Path(dir_okay=False, path_type=Path),
     default=DATA_DIR / "rzero_samples.jsonl",
     show_default=True,
-    help="JSONL output path for samples (defaults to ./data/rzero_samples.jsonl).",
+    help=(
+        "JSONL output path for samples (defaults to ./data/rzero_samples.jsonl); .gz/.zst "
+        "compress, .db/.sqlite writes an append-only, deduplicating sample store."
+    ),
+)
+@click.option(
+    "--append/--overwrite",
+    default=False,
+    show_default=True,
+    help="Append to an existing dataset instead of replacing it.",
+)
+@click.option(
+    "--flush-every",
+    type=int,
+    default=1,
+    show_default=True,
+    help="Flush the dataset every N episodes.",
+)
+@click.option(
+    "--fsync-every",
+    type=int,
+    default=0,
+    show_default=True,
+    help="fsync the dataset every N episodes (0 = never).",
 )
 @click.option("--seed-difficulty", type=float, default=0.5, show_default=True, help="Initial difficulty [0..1].")
 @click.option("--model", default="gpt-5-mini", show_default=True, help="LLM model name (only used when --solver=llm).")
@@ -40,80 +81,1000 @@ def main() -> None:
     show_default=True,
     help="LLM temperature; some models (e.g. gpt-5-*) only allow their default and will ignore this.",
 )
-def run(domain: str, solver: str, episodes: int, batch_size: int, dataset: Path, seed_difficulty: float, model: str, temperature: float) -> None:
+@click.option(
+    "--executor",
+    type=click.Choice([*EXECUTOR_CHOICES, "auto"]),
+    default="serial",
+    show_default=True,
+    help="How tasks in an episode are solved/verified; auto picks from component capabilities.",
+)
+@click.option(
+    "--workers",
+    type=int,
+    default=1,
+    show_default=True,
+    help="Concurrent solve/verify workers (ignored for --executor=serial).",
+)
+@click.option(
+    "--max-in-flight",
+    type=int,
+    default=None,
+    help="Max tasks submitted at once (defaults to 2 x workers).",
+)
+@click.option(
+    "--sandbox/--no-sandbox",
+    default=False,
+    show_default=True,
+    help="code-io: run solutions in isolated worker processes.",
+)
+@click.option(
+    "--sandbox-workers",
+    type=int,
+    default=4,
+    show_default=True,
+    help="Sandbox worker processes.",
+)
+@click.option(
+    "--sandbox-timeout",
+    type=float,
+    default=2.0,
+    show_default=True,
+    help="Per-solution wall-clock limit (seconds).",
+)
+@click.option(
+    "--arith-depth",
+    type=int,
+    default=None,
+    help=(
+        "arithmetic: generate nested expressions up to this depth (scaled by difficulty), with "
+        "stored answers."
+    ),
+)
+@click.option(
+    "--task-seed",
+    type=int,
+    default=None,
+    help="Seed for the --arith-depth generator (reproducible task streams).",
+)
+@click.option(
+    "--task-bank",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    default=None,
+    help="code-io: spec bank (JSONL/JSON, see `rzero bank build`) instead of the built-in specs.",
+)
+@click.option("--task-tag", default=None, help="code-io: only sample specs with this tag.")
+@click.option(
+    "--verify-cache/--no-verify-cache",
+    default=True,
+    show_default=True,
+    help=(
+        "code-io: memoise verification outcomes by (spec, solution) hash; off with process or "
+        "distributed workers, which would only update copies."
+    ),
+)
+@click.option(
+    "--verify-cache-file",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Load/save the verification cache here between runs.",
+)
+@click.option(
+    "--llm-cache/--no-llm-cache",
+    default=False,
+    show_default=True,
+    help="Reuse identical LLM responses (sensible at temperature 0).",
+)
+@click.option(
+    "--llm-cache-db",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="SQLite file backing the LLM response cache.",
+)
+@click.option(
+    "--llm-cache-ttl",
+    type=float,
+    default=None,
+    help="Seconds before a cached LLM response expires.",
+)
+@click.option(
+    "--coordinator",
+    "coordinator_addr",
+    default=None,
+    help="HOST:PORT to serve task leases on; solve+verify then runs on `rzero worker` processes.",
+)
+@click.option(
+    "--local-workers",
+    type=int,
+    default=0,
+    show_default=True,
+    help=(
+        "Worker processes to start on this machine (with --coordinator, or alone for 127.0.0.1:0)."
+    ),
+)
+@click.option(
+    "--lease-size",
+    type=int,
+    default=32,
+    show_default=True,
+    help="Tasks per lease handed to a worker.",
+)
+@click.option(
+    "--lease-timeout",
+    type=float,
+    default=60.0,
+    show_default=True,
+    help="Seconds before an unanswered lease is handed to another worker.",
+)
+@click.option(
+    "--checkpoint",
+    "checkpoint_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Checkpoint file (default with --resume/--checkpoint-every: DATASET.ckpt.json).",
+)
+@click.option(
+    "--checkpoint-every",
+    type=int,
+    default=None,
+    help="Episodes between checkpoints (default 1 when checkpointing).",
+)
+@click.option(
+    "--resume",
+    is_flag=True,
+    help=(
+        "Continue from the checkpoint: restores difficulty, episode, RNG, solver/challenger state "
+        "and truncates the dataset to the checkpointed offset."
+    ),
+)
+@click.option(
+    "--records/--no-records",
+    default=False,
+    show_default=True,
+    help="Serial fast path on slotted records instead of pydantic models.",
+)
+@click.option(
+    "--pipeline/--no-pipeline",
+    default=False,
+    show_default=True,
+    help="Overlap propose/solve/verify/update across episodes.",
+)
+@click.option(
+    "--prefetch",
+    type=int,
+    default=1,
+    show_default=True,
+    help="Episodes proposed ahead of the solver (--pipeline).",
+)
+@click.option(
+    "--chunk-size",
+    type=int,
+    default=None,
+    help="Tasks handed from solve to verify at a time (--pipeline; default: whole episode).",
+)
+@click.option(
+    "--max-staleness",
+    type=int,
+    default=1,
+    show_default=True,
+    help="Episodes whose update may still be pending when solving starts (--pipeline).",
+)
+@click.option(
+    "--confidence",
+    type=float,
+    default=None,
+    help=(
+        "Step difficulty only when this confidence interval (e.g. 0.95) on pooled accuracy clears "
+        "the target band; stop early once it sits inside."
+    ),
+)
+@click.option(
+    "--episode-seconds",
+    type=float,
+    default=None,
+    help="Resize each episode to take about this long, from the observed per-task latency.",
+)
+@click.option(
+    "--time-budget",
+    type=float,
+    default=None,
+    help="Stop after this many seconds (the last episode is trimmed to fit).",
+)
+@click.option(
+    "--task-budget",
+    type=int,
+    default=None,
+    help="Stop after this many tasks (solver calls) in total.",
+)
+@click.option(
+    "--max-batch",
+    type=int,
+    default=4096,
+    show_default=True,
+    help="Largest episode --episode-seconds may choose.",
+)
+@click.option(
+    "--patience",
+    type=int,
+    default=2,
+    show_default=True,
+    help="Converged episodes before stopping early with --confidence (0 = never).",
+)
+@click.option(
+    "--metrics-json",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Write per-stage timings (p50/p95/p99) and counters as JSON.",
+)
+@click.option(
+    "--metrics-prom",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Write the same metrics in Prometheus text format.",
+)
+@click.option(
+    "--profile",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Write a cProfile dump of the run (open with pstats/snakeviz).",
+)
+@click.option(
+    "--llm-client",
+    type=click.Choice(["openai", "http"]),
+    default="openai",
+    show_default=True,
+    help="openai SDK, or the built-in pooled/rate-limited HTTP client (rzero.llm.LLM).",
+)
+@click.option(
+    "--llm-base-url",
+    default=None,
+    help=(
+        "OpenAI-compatible API base URL for --llm-client=http (default: $OPENAI_BASE_URL or "
+        "api.openai.com)."
+    ),
+)
+@click.option(
+    "--llm-concurrency",
+    type=int,
+    default=8,
+    show_default=True,
+    help="Initial concurrent requests for --llm-client=http; adapts to rate limits.",
+)
+@click.option(
+    "--llm-max-retries",
+    type=int,
+    default=5,
+    show_default=True,
+    help="Retries on 429/5xx/connection errors (jittered backoff).",
+)
+@click.option(
+    "--llm-timeout",
+    type=float,
+    default=60.0,
+    show_default=True,
+    help="Per-request timeout in seconds.",
+)
+@click.option(
+    "--llm-rps",
+    type=float,
+    default=None,
+    help="Cap on requests per second (token bucket).",
+)
+def run(
+    domain: str,
+    schedule: str,
+    solver: str,
+    episodes: int,
+    batch_size: int,
+    dataset: Path,
+    append: bool,
+    flush_every: int,
+    fsync_every: int,
+    seed_difficulty: float,
+    model: str,
+    temperature: float,
+    executor: str,
+    workers: int,
+    max_in_flight: int | None,
+    sandbox: bool,
+    sandbox_workers: int,
+    sandbox_timeout: float,
+    arith_depth: int | None,
+    task_seed: int | None,
+    task_bank: Path | None,
+    task_tag: str | None,
+    verify_cache: bool,
+    verify_cache_file: Path | None,
+    llm_cache: bool,
+    llm_cache_db: Path | None,
+    llm_cache_ttl: float | None,
+    llm_client: str,
+    llm_base_url: str | None,
+    llm_concurrency: int,
+    llm_max_retries: int,
+    llm_timeout: float,
+    llm_rps: float | None,
+    coordinator_addr: str | None,
+    local_workers: int,
+    lease_size: int,
+    lease_timeout: float,
+    checkpoint_path: Path | None,
+    checkpoint_every: int | None,
+    resume: bool,
+    records: bool,
+    pipeline: bool,
+    prefetch: int,
+    chunk_size: int | None,
+    max_staleness: int,
+    confidence: float | None,
+    episode_seconds: float | None,
+    time_budget: float | None,
+    task_budget: int | None,
+    max_batch: int,
+    patience: int,
+    metrics_json: Path | None,
+    metrics_prom: Path | None,
+    profile: Path | None,
+) -> None:
     """Run the training loop for a domain."""
-    # Domain wiring
-    if domain == "arithmetic":
-        from .domains.arithmetic import ArithmeticChallenger, ArithmeticSolver, ArithmeticVerifier
-        challenger = ArithmeticChallenger()
-        verifier = ArithmeticVerifier()
+    from . import plugins
+    from .curriculum import Curriculum
+    from .loop import Trainer
+
+    names = [d.strip() for d in domain.split(",") if d.strip()]
+    try:
+        plugin = [plugins.get(n) for n in names][0]
+    except (KeyError, IndexError) as e:
+        message = str(e.args[0]) if e.args else "no domain given"
+        raise click.BadParameter(message, param_hint="--domain")
+    adaptive = any(v is not None for v in (confidence, episode_seconds, time_budget, task_budget))
+    if confidence is not None and not 0 < confidence < 1:
+        raise click.BadParameter("must be between 0 and 1", param_hint="--confidence")
+    if len(names) > 1:
+        given = _explicit_options(click.get_current_context(), _SINGLE_DOMAIN_OPTIONS)
+        if given:
+            raise click.UsageError(
+                "several domains use each plugin's default components; "
+                f"{', '.join(given)} cannot be combined with them."
+            )
+        _run_multi(
+            names, schedule, episodes, batch_size, seed_difficulty, executor, workers, records,
+            dataset, append, flush_every, fsync_every, metrics_json, metrics_prom,
+        )
+        return
+    stack = ExitStack()
+    # Domain wiring: built-ins take their extra options, plugins are default-constructed
+    if domain not in domains.DOMAINS:
+        if solver == "llm":
+            click.echo(
+                f"LLM solver is not supported for {domain}; using the plugin's solver.", err=True
+            )
+        challenger, solver_impl, verifier = plugin.create()
+    elif domain == "arithmetic":
+        mod = domains.load(domain)
+        if arith_depth is not None:
+            challenger = mod.TreeArithmeticChallenger(task_seed, max_depth=arith_depth)
+        else:
+            challenger = mod.ArithmeticChallenger()
+        verifier = mod.ArithmeticVerifier()
         if solver == "llm":
             click.echo("LLM solver is not supported for arithmetic; using heuristic.", err=True)
-        from .domains.arithmetic import ArithmeticSolver as DefaultSolver
-        solver_impl = DefaultSolver()
+        solver_impl = mod.ArithmeticSolver()
     else:
-        from .domains.code_io import CodeIOChallenger, CodeIOSolver, CodeIOVerifier
-        challenger = CodeIOChallenger()
-        verifier = CodeIOVerifier()
+        from .domains.taskbank import TaskBank
+        mod = domains.load(domain)
+        bank = TaskBank.load(task_bank) if task_bank is not None else mod.default_bank()
+        if task_tag is not None and task_tag not in bank.tags:
+            raise click.UsageError(f"no specs tagged {task_tag!r}; tags: {', '.join(bank.tags)}")
+        challenger = mod.CodeIOChallenger(bank, tag=task_tag)
+        pool = None
+        if sandbox:
+            if executor == "process":
+                raise click.UsageError(
+                    "--sandbox already isolates execution; "
+                    "use --executor thread to run it in parallel."
+                )
+            from .sandbox import SandboxPool
+            pool = stack.enter_context(SandboxPool(sandbox_workers, timeout_s=sandbox_timeout))
+        # Process and distributed workers get a pickled copy of the verifier per episode, so
+        # their cache updates never reach this process: the cache would not hit or persist.
+        shipped = (executor == "process" and workers > 1) or (
+            coordinator_addr is not None or local_workers > 0
+        )
+        if verify_cache and shipped:
+            ctx = click.get_current_context()
+            given = _explicit_options(ctx, ("verify_cache", "verify_cache_file"))
+            if given:
+                raise click.UsageError(
+                    f"{', '.join(given)}: process and distributed workers only get a copy of "
+                    "the cache; use --executor thread or --no-verify-cache."
+                )
+            verify_cache = False
+        cache = None
+        if verify_cache:
+            from .cache import LRUCache
+            cache = LRUCache(max_entries=100_000)
+            if verify_cache_file is not None:
+                cache.load_json(verify_cache_file)
+                stack.callback(cache.save_json, verify_cache_file)
+            stack.callback(lambda: click.echo(f"Verification cache: {cache.summary()}"))
+        verifier = mod.CodeIOVerifier(sandbox=pool, cache=cache, bank=bank)
         if solver == "llm":
             try:
                 from .solvers.llm_codeio import CodeIOLLMSolver
-                solver_impl = CodeIOLLMSolver(model=model, temperature=temperature)
+                responses = None
+                if llm_cache or llm_cache_db is not None:
+                    from .cache import ResponseCache
+                    responses = ResponseCache(ttl_s=llm_cache_ttl, path=llm_cache_db)
+                    stack.callback(responses.close)
+                    stack.callback(lambda: click.echo(f"LLM response cache: {responses.summary()}"))
+                client = None
+                if llm_client == "http":
+                    from .llm import LLM
+                    client = LLM(
+                        base_url=llm_base_url,
+                        timeout_s=llm_timeout,
+                        max_retries=llm_max_retries,
+                        concurrency=llm_concurrency,
+                        requests_per_s=llm_rps,
+                    )
+                    stack.callback(client.close)
+                    stack.callback(lambda: click.echo(f"LLM client: {client.stats}"))
+                solver_impl = CodeIOLLMSolver(
+                    model=model, temperature=temperature, client=client, cache=responses
+                )
             except Exception as e:
                 raise click.ClickException(str(e))
         else:
-            solver_impl = CodeIOSolver()
+            solver_impl = mod.CodeIOSolver()
 
-    trainer = Trainer(
+    pipelined: dict = {}
+    trainer_cls = Trainer
+    if coordinator_addr is not None or local_workers > 0:
+        if sandbox:
+            raise click.UsageError(
+                "--sandbox cannot be shipped to distributed workers; use --no-sandbox."
+            )
+        if pipeline:
+            raise click.UsageError("--pipeline and distributed workers cannot be combined.")
+        from .distributed import (
+            Coordinator,
+            DistributedTrainer,
+            coordinator_authkey,
+            parse_address,
+            start_local_workers,
+        )
+        bind = parse_address(coordinator_addr or "127.0.0.1:0")
+        try:
+            authkey, generated = coordinator_authkey(bind)
+        except ValueError as e:
+            raise click.UsageError(str(e))
+        coord = stack.enter_context(Coordinator(
+            bind,
+            authkey=authkey,
+            lease_size=lease_size,
+            lease_timeout_s=lease_timeout,
+        ))
+        host, port = coord.address
+        click.echo(f"Coordinator listening on {host}:{port}")
+        if generated and coordinator_addr is not None:
+            click.echo(
+                "RZERO_AUTHKEY is not set; workers on this host need "
+                f"RZERO_AUTHKEY={authkey.decode()}",
+                err=True,
+            )
+        start_local_workers(local_workers, coord.address, authkey=authkey)
+        stack.callback(lambda: click.echo(f"Coordinator: {coord.stats}"))
+        trainer_cls = DistributedTrainer
+        pipelined = {"coordinator": coord}
+    elif pipeline:
+        from .pipeline import PipelinedTrainer
+        trainer_cls = PipelinedTrainer
+        pipelined = {"prefetch": prefetch, "chunk_size": chunk_size, "max_staleness": max_staleness}
+    trainer = trainer_cls(
         challenger=challenger,
         solver=solver_impl,
         verifier=verifier,
-        curriculum=Curriculum(),
+        curriculum=Curriculum(z=_z_score(confidence) if confidence is not None else None),
         difficulty=seed_difficulty,
+        executor=executor,
+        workers=workers,
+        max_in_flight=max_in_flight,
+        keep_samples=False,
+        records=records,
+        **pipelined,
     )
+    if adaptive:
+        from .adaptive import AdaptiveBatch
+        trainer.adaptive = AdaptiveBatch(
+            episode_seconds=episode_seconds,
+            time_budget=time_budget,
+            task_budget=task_budget,
+            max_batch=max_batch,
+            patience=patience if confidence is not None else 0,
+        )
+    plan = trainer.plan_execution()
+    if plan is not None:
+        with_records = " + records" if plan.records else ""
+        click.echo(f"Executor: {plan.executor}{with_records} ({plan.reason})")
+    if metrics_json is not None or metrics_prom is not None:
+        from .metrics import Metrics
+        trainer.metrics = Metrics()
+
+    if resume or checkpoint_path is not None or checkpoint_every is not None:
+        ckpt_file = checkpoint_path or dataset.with_name(dataset.name + ".ckpt.json")
+        trainer.checkpoint = str(ckpt_file)
+        trainer.checkpoint_every = checkpoint_every or 1
+        if resume and ckpt_file.exists():
+            ckpt = trainer.resume(str(ckpt_file))
+            ckpt.truncate_dataset(dataset)
+            append = True
+            episodes = max(0, episodes - ckpt.episode)
+            click.echo(
+                f"Resuming at episode {ckpt.episode} (difficulty {ckpt.difficulty:.2f}); "
+                f"{episodes} episode(s) left."
+            )
+        elif resume:
+            click.echo(f"No checkpoint at {ckpt_file}; starting fresh.", err=True)
+
+    # Samples stream to disk per episode, so a crash keeps everything up to the last flush.
+    with stack:
+        sink = stack.enter_context(_open_sink(dataset, append, flush_every, fsync_every))
+        trainer.sink = sink
+        if profile is not None:
+            import cProfile
+            profiler = cProfile.Profile()
+            stack.callback(lambda: click.echo(f"Wrote profile to {profile}"))
+            stack.callback(profiler.dump_stats, str(profile))
+            profiler.enable()
+            stack.callback(profiler.disable)
+        trainer.run(episodes=episodes, batch_size=batch_size)
+    if trainer.metrics is not None:
+        if metrics_json is not None:
+            click.echo(f"Wrote metrics to {trainer.metrics.write_json(metrics_json)}")
+        if metrics_prom is not None:
+            click.echo(f"Wrote metrics to {trainer.metrics.write_prometheus(metrics_prom)}")
+    click.echo(f"Collected {sink.count} samples. Final difficulty ~ {trainer.difficulty:.2f}.")
+    _echo_duplicates(sink)
+    if trainer.adaptive is not None and trainer.adaptive.stop_reason is not None:
+        click.echo(f"Stopped after {trainer.episode} episode(s): {trainer.adaptive.stop_reason}.")
+    click.echo(f"Wrote samples to {sink.path}")
+    if pipeline:
+        summary = trainer.stats.summary()  # type: ignore[attr-defined]
+        stages = ", ".join(f"{k}={v['utilization']:.0%}" for k, v in summary["stages"].items())
+        click.echo(f"Stage utilization: {stages} (bottleneck: {summary['bottleneck']})")
+
+# `run` options that configure one domain's components or the single-domain loop; a
+# multi-domain run default-constructs every slot, so these must stay at their defaults.
+_SINGLE_DOMAIN_OPTIONS = (
+    "solver", "model", "temperature", "max_in_flight", "sandbox", "sandbox_workers",
+    "sandbox_timeout", "arith_depth", "task_seed", "task_bank", "task_tag", "verify_cache",
+    "verify_cache_file",
+    "llm_cache", "llm_cache_db", "llm_cache_ttl", "llm_client", "llm_base_url", "llm_concurrency",
+    "llm_max_retries", "llm_timeout", "llm_rps", "coordinator_addr", "local_workers", "lease_size",
+    "lease_timeout", "checkpoint_path", "checkpoint_every", "resume", "pipeline", "prefetch",
+    "chunk_size", "max_staleness", "confidence", "episode_seconds", "time_budget", "task_budget",
+    "max_batch", "patience", "profile",
+)
+
+def _explicit_options(ctx: click.Context, names: tuple[str, ...]) -> list[str]:
+    """Flags of ``names`` that were given on the command line (or via the environment)."""
+    from click.core import ParameterSource
+
+    flags = {p.name: p.opts[0] for p in ctx.command.params}
+    defaults = (None, ParameterSource.DEFAULT)
+    return [flags[n] for n in names if ctx.get_parameter_source(n) not in defaults]
+
+def _open_sink(dataset: Path, append: bool, flush_every: int, fsync_every: int) -> Any:
+    from .samplestore import STORE_SUFFIXES, SampleStore
+    from .storage import JsonlSink
+
+    if dataset.suffix in STORE_SUFFIXES:
+        return SampleStore(dataset, append=append)  # duplicates of stored samples are skipped
+    return JsonlSink(dataset, append=append, flush_every=flush_every, fsync_every=fsync_every)
+
+def _echo_duplicates(sink: Any) -> None:
+    if getattr(sink, "duplicates", 0):
+        click.echo(f"Skipped {sink.duplicates} samples already in {sink.path}.")
+
+def _z_score(confidence: float) -> float:
+    from statistics import NormalDist
+    return NormalDist().inv_cdf((1 + confidence) / 2)
+
+def _run_multi(
+    names: list[str],
+    schedule: str,
+    episodes: int,
+    batch_size: int,
+    difficulty: float,
+    executor: str,
+    workers: int,
+    records: bool,
+    dataset: Path,
+    append: bool,
+    flush_every: int,
+    fsync_every: int,
+    metrics_json: Path | None,
+    metrics_prom: Path | None,
+) -> None:
+    """`rzero run --domain a,b`: default-constructed components per domain, one mixed dataset."""
+    from .multidomain import MultiDomainTrainer, Scheduler
+
+    trainer = MultiDomainTrainer.from_plugins(
+        names,
+        scheduler=Scheduler(schedule),
+        keep_samples=False,
+        difficulty=difficulty,
+        executor=executor,
+        workers=workers,
+        records=records,
+    )
+    if metrics_json is not None or metrics_prom is not None:
+        from .metrics import Metrics
+        trainer.metrics = Metrics()
+    with _open_sink(dataset, append, flush_every, fsync_every) as sink:
+        trainer.sink = sink
+        trainer.run(episodes=episodes, batch_size=batch_size)
+    if trainer.metrics is not None:
+        if metrics_json is not None:
+            click.echo(f"Wrote metrics to {trainer.metrics.write_json(metrics_json)}")
+        if metrics_prom is not None:
+            click.echo(f"Wrote metrics to {trainer.metrics.write_prometheus(metrics_prom)}")
+    for name, row in trainer.summary().items():
+        click.echo(
+            f"{name}: difficulty {row['difficulty']:.2f}, {row['tasks']} tasks, "
+            f"accuracy ~ {row['accuracy']:.2f}, {row['tasks_per_s']:,.0f} tasks/s, "
+            f"last share {row['share']}"
+        )
+    click.echo(f"Collected {sink.count} samples.")
+    _echo_duplicates(sink)
+    click.echo(f"Wrote samples to {sink.path}")
+
+@main.command("domains")
+def domains_cmd() -> None:
+    """List domains (built-in and installed plugins) with component capabilities."""
+    from . import plugins
+
+    flags = ("batched", "asynchronous", "thread_safe", "process_safe", "records")
+    for name in plugins.names():
+        try:
+            plugin = plugins.get(name)
+            caps = {
+                which: plugins.capabilities_of(plugin.load(which))
+                for which in ("challenger", "solver", "verifier")
+            }
+        except Exception as e:  # a broken plugin should not hide the others
+            click.echo(f"{name}: failed to load ({e})")
+            continue
+        click.echo(f"{name}: {plugin.description}".rstrip(": "))
+        for which, c in caps.items():
+            click.echo(f"  {which:<10} {', '.join(f for f in flags if getattr(c, f)) or '-'}")
+
+@main.group("bank")
+def bank_cmd() -> None:
+    """Build and inspect code-io task banks."""
+
+@bank_cmd.command("build")
+@click.argument("out", type=click.Path(dir_okay=False, path_type=Path))
+@click.option("-n", "--count", type=int, default=5000, show_default=True, help="Specs to generate.")
+@click.option("--seed", type=int, default=0, show_default=True)
+@click.option(
+    "--builtin/--no-builtin",
+    default=True,
+    show_default=True,
+    help="Include the built-in specs.",
+)
+def bank_build(out: Path, count: int, seed: int, builtin: bool) -> None:
+    """Generate a synthetic spec bank (JSONL, one spec per line)."""
+    from .domains.code_io import _SPEC_BANK
+    from .domains.taskbank import TaskBank, synthesize
+
+    bank = TaskBank(synthesize(count, seed=seed, extra=_SPEC_BANK if builtin else ()))
+    click.echo(f"Wrote {len(bank)} specs to {bank.save(out)}")
+
+@bank_cmd.command("stats")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option("--buckets", type=int, default=10, show_default=True)
+def bank_stats(path: Path, buckets: int) -> None:
+    """Specs per difficulty bucket and tag."""
+    from .domains.taskbank import TaskBank
+
+    bank = TaskBank.load(path, buckets=buckets)
+    click.echo(f"{len(bank)} specs (id {bank.id})")
+    for b, n in enumerate(bank.sizes):
+        click.echo(f"  difficulty {b / buckets:.1f}-{(b + 1) / buckets:.1f}: {n}")
+    click.echo(f"  tags: {', '.join(bank.tags)}")
+
+@main.command("worker")
+@click.argument("address")
+def worker_cmd(address: str) -> None:
+    """Serve task leases from a coordinator at HOST:PORT (authkey from $RZERO_AUTHKEY)."""
+    from .distributed import authkey_from_env, parse_address, run_worker
+
+    authkey = authkey_from_env()
+    if authkey is None:
+        raise click.UsageError("set RZERO_AUTHKEY to the coordinator's key.")
+    done = run_worker(parse_address(address), authkey=authkey, connect_timeout_s=60.0)
+    click.echo(f"Worker processed {done} tasks.")
+
+@main.command("bench")
+@click.option("--only", default=None, help="Comma-separated benchmark names (default: all).")
+@click.option("--sizes", default="100,1000", show_default=True, help="Comma-separated batch sizes.")
+@click.option(
+    "--episodes",
+    default="1,5",
+    show_default=True,
+    help="Comma-separated episode counts (trainer_run cases).",
+)
+@click.option(
+    "--repeat",
+    type=int,
+    default=3,
+    show_default=True,
+    help="Timed runs per case (best is reported).",
+)
+@click.option(
+    "-o",
+    "--out",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Write results as JSON.",
+)
+@click.option(
+    "--baseline",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    default=None,
+    help="Compare against a saved results JSON.",
+)
+@click.option(
+    "--tolerance",
+    type=float,
+    default=0.10,
+    show_default=True,
+    help="Allowed throughput drop vs baseline before failing.",
+)
+@click.option("--list", "list_only", is_flag=True, help="List benchmark names and exit.")
+def bench_cmd(
+    only: str | None,
+    sizes: str,
+    episodes: str,
+    repeat: int,
+    out: Path | None,
+    baseline: Path | None,
+    tolerance: float,
+    list_only: bool,
+) -> None:
+    """Measure hot-path throughput; exits non-zero on a regression vs --baseline."""
+    from . import bench
+
+    if list_only:
+        click.echo("\n".join(bench.CASES))
+        return
+    names = [n.strip() for n in only.split(",")] if only else None
+
+    def _show(r: dict) -> None:
+        name = bench.key(r["name"], r["size"], r["episodes"])
+        click.echo(
+            f"{name:<36} {r['items_per_s']:>14,.0f} items/s  best {r['best_s'] * 1000:>10.2f} ms"
+        )
 
-    samples = trainer.run(episodes=episodes, batch_size=batch_size)
-    click.echo(f"Collected {len(samples)} samples. Final difficulty ~ {trainer.difficulty:.2f}.")
-    path = write_jsonl(samples, dataset)
-    click.echo(f"Wrote samples to {path}")
-
-@main.command("dataset")
-@click.option("-p", "--path", type=click.Path(dir_okay=False, exists=True, path_type=Path), required=True)
-def dataset_cmd(path: Path) -> None:
-    """Quickly show dataset stats."""
-    import statistics as st
-    rows = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
-    n = len(rows)
-    scores = [r["verification"]["score"] for r in rows]
-    acc = sum(1 for s in scores if s >= 1.0) / max(1, n)
-    click.echo(f"Samples: {n}")
-    if scores:
-        click.echo(f"Accuracy: {acc:.3f}, mean score: {st.mean(scores):.3f}")
+    try:
+        report = bench.run_suite(
+            names,
+            [int(x) for x in sizes.split(",")],
+            [int(x) for x in episodes.split(",")],
+            repeat=repeat,
+            progress=_show,
+        )
+    except KeyError as e:
+        raise click.UsageError(str(e.args[0]))
+    if out is not None:
+        click.echo(f"Wrote results to {bench.save(report, out)}")
+    if baseline is not None:
+        rows = bench.compare(report, bench.load(baseline), tolerance=tolerance)
+        for row in rows:
+            flag = "REGRESSION" if row["regressed"] else ""
+            click.echo(f"{row['key']:<36} x{row['ratio']:.2f} {flag}")
+        regressed = [r["key"] for r in rows if r["regressed"]]
+        if regressed:
+            raise click.ClickException(
+                f"{len(regressed)} benchmark(s) regressed more than {tolerance:.0%}"
+            )
+
+@main.group("dataset", invoke_without_command=True)
+@click.option(
+    "-p",
+    "--path",
+    type=click.Path(exists=True, path_type=Path),
+    default=None,
+    help="JSONL file, columnar directory or sample store.",
+)
+@click.option(
+    "--mmap/--no-mmap",
+    "use_mmap",
+    default=True,
+    show_default=True,
+    help="Memory-map uncompressed files.",
+)
+@click.option(
+    "--buckets",
+    type=int,
+    default=10,
+    show_default=True,
+    help="Number of difficulty buckets.",
+)
+@click.option("--json", "as_json", is_flag=True, help="Print the full breakdown as JSON.")
+@click.pass_context
+def dataset_cmd(
+    ctx: click.Context,
+    path: Path | None,
+    use_mmap: bool,
+    buckets: int,
+    as_json: bool,
+) -> None:
+    """Quickly show dataset stats (one streaming pass, constant memory)."""
+    if ctx.invoked_subcommand is not None:
+        return
+    if path is None:
+        raise click.UsageError("Missing option '-p' / '--path'.")
+    import json
+
+    from .columnar import iter_rows
+    from .stats import STATS_FIELDS, DatasetStats
+
+    stats = DatasetStats(buckets=buckets)
+    for row in iter_rows(path, fields=STATS_FIELDS, use_mmap=use_mmap):
+        stats.add(row)
+    summary = stats.summary()
+    if as_json:
+        click.echo(json.dumps(summary, indent=2))
+        return
+    click.echo(f"Samples: {summary['samples']}")
+    if not summary["samples"]:
+        return
+    click.echo(f"Accuracy: {summary['accuracy']:.3f}, mean score: {summary['mean_score']:.3f}")
+    groups = (("domain", "by_domain"), ("difficulty", "by_difficulty"), ("solver", "by_solver"))
+    for title, key in groups:
+        click.echo(f"By {title}:")
+        for name, g in summary[key].items():
+            click.echo(
+                f"  {name:<24} n={g['samples']:<8} acc={g['accuracy']:.3f} "
+                f"score={g['mean_score']:.3f}"
+            )
+    lat = summary["latency_ms"]
+    if lat["samples"]:
+        click.echo(
+            f"Latency ms: p50={lat['p50']:.1f} p95={lat['p95']:.1f} p99={lat['p99']:.1f} "
+            f"(n={lat['samples']})"
+        )
+
+@dataset_cmd.command("convert")
+@click.argument("src", type=click.Path(exists=True, path_type=Path))
+@click.argument("dst", type=click.Path(path_type=Path))
+@click.option(
+    "--to",
+    "fmt",
+    type=click.Choice(["columnar", "jsonl"]),
+    default="columnar",
+    show_default=True,
+)
+def dataset_convert(src: Path, dst: Path, fmt: str) -> None:
+    """Convert a dataset between JSONL and the indexed columnar layout."""
+    from .columnar import convert
+
+    out = convert(src, dst, to=fmt)
+    click.echo(f"Wrote {fmt} dataset to {out}")
+
+@dataset_cmd.command("compact")
+@click.argument("sources", nargs=-1, required=True, type=click.Path(exists=True, path_type=Path))
+@click.option(
+    "-o",
+    "--out",
+    type=click.Path(path_type=Path),
+    required=True,
+    help="Sample store (.db/.sqlite; merged into if it exists) or a new JSONL file.",
+)
+def dataset_compact(sources: tuple[Path, ...], out: Path) -> None:
+    """Merge dataset shards (JSONL, columnar or stores) keeping one row per distinct sample."""
+    from .samplestore import compact
+
+    try:
+        result = compact(sources, out)
+    except ValueError as e:
+        raise click.UsageError(str(e))
+    click.echo(
+        f"Wrote {result['rows']} samples to {out} ({result['inserted']} new, "
+        f"{result['duplicates']} duplicates dropped)."
+    )
 
 @main.command()
-@click.option("-p", "--path", type=click.Path(dir_okay=False, exists=True, path_type=Path), required=True)
+@click.option(
+    "-p",
+    "--path",
+    type=click.Path(exists=True, path_type=Path),
+    required=True,
+    help="JSONL file, columnar directory or sample store.",
+)
 @click.option("--save", type=click.Path(dir_okay=False, path_type=Path), default=None, help="Optional path to save solver state after replay.")
-def replay(path: Path, save: Path | None) -> None:
+@click.option(
+    "--chunk-size",
+    type=int,
+    default=10_000,
+    show_default=True,
+    help="Rows parsed per chunk (bounds peak memory).",
+)
+@click.option(
+    "--update-size",
+    type=int,
+    default=None,
+    help="Samples per Solver.update call (defaults to --chunk-size).",
+)
+@click.option(
+    "--workers",
+    type=int,
+    default=1,
+    show_default=True,
+    help="Processes parsing chunks in parallel.",
+)
+@click.option("--start", type=int, default=0, show_default=True, help="First row to replay.")
+@click.option("--limit", type=int, default=None, help="Max rows to replay.")
+@click.option(
+    "--checkpoint",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Record progress + solver state here.",
+)
+@click.option(
+    "--checkpoint-every",
+    type=int,
+    default=1,
+    show_default=True,
+    help="Checkpoint every N chunks.",
+)
+@click.option(
+    "--resume",
+    is_flag=True,
+    help="Continue from --checkpoint (restores solver state and offset).",
+)
+def replay(
+    path: Path,
+    save: Path | None,
+    chunk_size: int,
+    update_size: int | None,
+    workers: int,
+    start: int,
+    limit: int | None,
+    checkpoint: Path | None,
+    checkpoint_every: int,
+    resume: bool,
+) -> None:
     """Replay a dataset (JSONL of Samples) to update a trainable solver."""
-    from .domains.code_io import CodeIOChallenger, CodeIOVerifier
+    from .replay import ReplayCheckpoint
+    from .replay import replay as run_replay
     from .solvers.trainable_template import CodeIOTrainable
-    from .storage import read_jsonl
-    from .types import Sample, Task, Solution, Verification
-
-    # Build samples back from JSON (schema-aware)
-    rows = read_jsonl(path)
-    samples = [
-        Sample(
-            task=Task(**row["task"]),
-            solution=Solution(**row["solution"]),
-            verification=Verification(**row["verification"]),
-        )
-        for row in rows
-    ]
 
     solver = CodeIOTrainable()
-    solver.update(samples)
-    click.echo(f"Replayed {len(samples)} samples into {solver.name}.")
+    if resume:
+        if checkpoint is None or not checkpoint.exists():
+            raise click.UsageError("--resume needs an existing --checkpoint file.")
+        ckpt = ReplayCheckpoint.load(checkpoint)
+        solver.load(ckpt.solver_state)
+        if limit is not None:
+            limit = max(0, limit - (ckpt.offset - start))
+        start = ckpt.offset
+        click.echo(f"Resuming at row {start}.")
+
+    end = run_replay(
+        solver,
+        path,
+        chunk_size=chunk_size,
+        update_size=update_size,
+        workers=workers,
+        start=start,
+        limit=limit,
+        checkpoint=checkpoint,
+        checkpoint_every=checkpoint_every,
+    )
+    click.echo(f"Replayed {end - start} samples into {solver.name}.")
 
     if save:
         solver.save(str(save))
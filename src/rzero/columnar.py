@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+import bisect
+import hashlib
+import json
+import math
+import mmap
+import sys
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from .samplestore import SampleStore, is_store
+from .storage import _project, iter_jsonl
+
+# --- Columnar dataset layout (a directory), stdlib only:
+#   meta.json              row count, column types, byte order
+#   <column>.bin           fixed-width numeric column (array typecode in meta)
+#   <column>.dict.json     value table for dictionary-encoded string columns (codes in .bin)
+#   rows.jsonl / rows.off  full rows plus N+1 byte offsets, for row-range reads
+#   ids.hash / ids.row     sorted 64-bit task-id hashes and their row numbers
+#   index.json             [start, stop) row runs per domain and per episode
+
+FORMAT = "rzero-columnar"
+
+# column name -> (source dotted path, array typecode or "dict")
+COLUMNS: Dict[str, tuple[str, str]] = {
+    "episode": ("episode", "i"),
+    "task.domain": ("task.domain", "dict"),
+    "task.difficulty": ("task.difficulty", "d"),
+    "solution.solver": ("solution.solver", "dict"),
+    "solution.latency_ms": ("solution.latency_ms", "d"),
+    "verification.passed": ("verification.passed", "b"),
+    "verification.score": ("verification.score", "d"),
+}
+
+def is_columnar(path: str | Path) -> bool:
+    return (Path(path).expanduser() / "meta.json").is_file()
+
+def _id_hash(task_id: str) -> int:
+    digest = hashlib.blake2b(task_id.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+def _get(row: Dict[str, Any], dotted: str) -> Any:
+    v: Any = row
+    for k in dotted.split("."):
+        v = v.get(k) if isinstance(v, dict) else None
+    return v
+
+def _add_run(runs: Dict[str, List[List[int]]], key: str, i: int) -> None:
+    spans = runs.setdefault(key, [])
+    if spans and spans[-1][1] == i:
+        spans[-1][1] = i + 1
+    else:
+        spans.append([i, i + 1])
+
+def write_columnar(rows: Iterable[Dict[str, Any]], path: str | Path) -> Path:
+    """Write sample rows (as produced by model_dump/JSONL) into a columnar directory."""
+    out = Path(path).expanduser()
+    out.mkdir(parents=True, exist_ok=True)
+    cols: Dict[str, array] = {}
+    tables: Dict[str, Dict[str, int]] = {}
+    for name, (_, kind) in COLUMNS.items():
+        cols[name] = array("I" if kind == "dict" else kind)
+        if kind == "dict":
+            tables[name] = {}
+    offsets = array("Q", [0])
+    id_pairs: List[tuple[int, int]] = []
+    index: Dict[str, Dict[str, List[List[int]]]] = {"domain": {}, "episode": {}}
+    n = 0
+    with (out / "rows.jsonl").open("wb") as fr:
+        for row in rows:
+            line = (json.dumps(row, ensure_ascii=False) + "\n").encode("utf-8")
+            fr.write(line)
+            offsets.append(offsets[-1] + len(line))
+            for name, (src, kind) in COLUMNS.items():
+                v = _get(row, src)
+                if kind == "dict":
+                    table = tables[name]
+                    cols[name].append(table.setdefault(str(v), len(table)))
+                elif kind == "d":
+                    cols[name].append(math.nan if v is None else float(v))
+                elif kind == "i":
+                    cols[name].append(-1 if v is None else int(v))
+                else:
+                    cols[name].append(1 if v else 0)
+            id_pairs.append((_id_hash(str(_get(row, "task.id"))), n))
+            _add_run(index["domain"], str(_get(row, "task.domain")), n)
+            ep = row.get("episode")
+            _add_run(index["episode"], str(-1 if ep is None else ep), n)
+            n += 1
+
+    for name, (_, kind) in COLUMNS.items():
+        (out / f"{name}.bin").write_bytes(cols[name].tobytes())
+        if kind == "dict":
+            values = sorted(tables[name], key=tables[name].__getitem__)
+            (out / f"{name}.dict.json").write_text(json.dumps(values), encoding="utf-8")
+    (out / "rows.off").write_bytes(offsets.tobytes())
+    id_pairs.sort()
+    (out / "ids.hash").write_bytes(array("Q", (h for h, _ in id_pairs)).tobytes())
+    (out / "ids.row").write_bytes(array("Q", (r for _, r in id_pairs)).tobytes())
+    (out / "index.json").write_text(json.dumps(index), encoding="utf-8")
+    meta = {
+        "format": FORMAT,
+        "version": 1,
+        "rows": n,
+        "byteorder": sys.byteorder,
+        "columns": {name: kind for name, (_, kind) in COLUMNS.items()},
+    }
+    (out / "meta.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    return out
+
+class ColumnarDataset:
+    """Read-side view of a columnar directory; every accessor reads only what it needs."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path).expanduser()
+        self.meta = json.loads((self.path / "meta.json").read_text(encoding="utf-8"))
+        if self.meta.get("format") != FORMAT:
+            raise ValueError(f"{self.path} is not an {FORMAT} dataset")
+        self._swap = self.meta.get("byteorder", sys.byteorder) != sys.byteorder
+        self._index: Optional[Dict[str, Dict[str, List[List[int]]]]] = None
+
+    def __len__(self) -> int:
+        return int(self.meta["rows"])
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.meta["columns"])
+
+    def _read_array(
+        self,
+        fname: str,
+        typecode: str,
+        start: int = 0,
+        stop: Optional[int] = None,
+    ) -> array:
+        a = array(typecode)
+        with (self.path / fname).open("rb") as f:
+            f.seek(start * a.itemsize)
+            count = -1 if stop is None else max(0, stop - start)
+            data = f.read() if count < 0 else f.read(count * a.itemsize)
+        a.frombytes(data)
+        if self._swap:
+            a.byteswap()
+        return a
+
+    def column(self, name: str, start: int = 0, stop: Optional[int] = None) -> Sequence[Any]:
+        """Values of one column for rows [start, stop); dictionary columns are decoded."""
+        kind = self.meta["columns"][name]
+        if kind == "dict":
+            table = json.loads((self.path / f"{name}.dict.json").read_text(encoding="utf-8"))
+            return [table[c] for c in self._read_array(f"{name}.bin", "I", start, stop)]
+        values = self._read_array(f"{name}.bin", kind, start, stop)
+        if name == "solution.latency_ms":
+            return [None if math.isnan(v) else v for v in values]
+        return values
+
+    def byte_offset(self, row: int) -> int:
+        """Position of ``row`` within rows.jsonl (plain JSONL, row order)."""
+        return self._read_array("rows.off", "Q", row, row + 1)[0]
+
+    def rows(
+        self,
+        start: int = 0,
+        stop: Optional[int] = None,
+        *,
+        block: int = 4096,
+    ) -> Iterator[Dict[str, Any]]:
+        """Full rows for [start, stop), read ``block`` rows per contiguous byte range."""
+        stop = len(self) if stop is None else min(stop, len(self))
+        with (self.path / "rows.jsonl").open("rb") as f:
+            for lo in range(start, stop, block):
+                offs = self._read_array("rows.off", "Q", lo, min(stop, lo + block) + 1)
+                f.seek(offs[0])
+                for line in f.read(offs[-1] - offs[0]).splitlines():
+                    if line.strip():
+                        yield json.loads(line)
+
+    def find(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Look a row up by task id: binary search over the memory-mapped sorted hash file."""
+        if len(self) == 0:
+            return None
+        h = _id_hash(task_id)
+        with (
+            (self.path / "ids.hash").open("rb") as f,
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+        ):
+            hashes: Sequence[int] = (
+                self._read_array("ids.hash", "Q") if self._swap else memoryview(mm).cast("Q")
+            )
+            try:
+                i = bisect.bisect_left(hashes, h)
+                candidates = []
+                while i < len(hashes) and hashes[i] == h:
+                    candidates.append(i)
+                    i += 1
+            finally:
+                if isinstance(hashes, memoryview):
+                    hashes.release()
+        for i in candidates:
+            row_no = self._read_array("ids.row", "Q", i, i + 1)[0]
+            for row in self.rows(row_no, row_no + 1):
+                if _get(row, "task.id") == task_id:
+                    return row
+        return None
+
+    def ranges(
+        self,
+        *,
+        domain: Optional[str] = None,
+        episode: Optional[int] = None,
+    ) -> List[tuple[int, int]]:
+        """[start, stop) row runs matching domain and/or episode (intersection)."""
+        if self._index is None:
+            self._index = json.loads((self.path / "index.json").read_text(encoding="utf-8"))
+        spans: Optional[List[tuple[int, int]]] = None
+        for key, value in (("domain", domain), ("episode", episode)):
+            if value is None:
+                continue
+            cur = [(a, b) for a, b in self._index[key].get(str(value), [])]
+            spans = cur if spans is None else _intersect(spans, cur)
+        return [(0, len(self))] if spans is None else spans
+
+    def iter_fields(self, fields: Sequence[str]) -> Iterator[Dict[str, Any]]:
+        """Projected rows like storage.iter_jsonl(fields=...), served from columns when possible."""
+        if not all(f in self.meta["columns"] for f in fields):
+            for row in self.rows():
+                yield {f: _get(row, f) for f in fields}
+            return
+        cols = [self.column(f) for f in fields]
+        for values in zip(*cols):
+            yield dict(zip(fields, values))
+
+def _intersect(a: List[tuple[int, int]], b: List[tuple[int, int]]) -> List[tuple[int, int]]:
+    out, i, j = [], 0, 0
+    while i < len(a) and j < len(b):
+        lo, hi = max(a[i][0], b[j][0]), min(a[i][1], b[j][1])
+        if lo < hi:
+            out.append((lo, hi))
+        if a[i][1] < b[j][1]:
+            i += 1
+        else:
+            j += 1
+    return out
+
+def iter_rows(
+    path: str | Path,
+    *,
+    fields: Optional[Sequence[str]] = None,
+    use_mmap: bool = False,
+) -> Iterator[Dict[str, Any]]:
+    """Rows from a JSONL file, a columnar directory or a SampleStore, with optional projection."""
+    if is_columnar(path):
+        ds = ColumnarDataset(path)
+        return ds.iter_fields(fields) if fields is not None else ds.rows()
+    if is_store(path):
+        return _store_rows(path, fields)
+    return iter_jsonl(path, fields=fields, use_mmap=use_mmap)
+
+def _store_rows(path: str | Path, fields: Optional[Sequence[str]]) -> Iterator[Dict[str, Any]]:
+    split = [tuple(f.split(".")) for f in fields] if fields is not None else None
+    with SampleStore(path) as store:
+        for row in store.rows():
+            yield _project(row, split) if split is not None else row
+
+def convert(src: str | Path, dst: str | Path, *, to: str = "columnar") -> Path:
+    """Convert between JSONL (optionally compressed) and the columnar layout."""
+    if to == "columnar":
+        return write_columnar(iter_rows(src), dst)
+    if to == "jsonl":
+        from .storage import JsonlSink
+
+        p = Path(dst).expanduser()
+        with JsonlSink(p, append=False, flush_every=16) as sink:
+            chunk: List[Dict[str, Any]] = []
+            for row in iter_rows(src):
+                chunk.append(row)
+                if len(chunk) >= 10_000:
+                    sink.write_rows(chunk)
+                    chunk = []
+            sink.write_rows(chunk)
+        return p
+    raise ValueError(f"unknown format {to!r}; expected 'columnar' or 'jsonl'")
@@ -1,6 +1,21 @@
 from __future__ import annotations
 
+import math
 from dataclasses import dataclass
+from typing import Optional, Tuple
+
+def wilson_interval(correct: float, n: float, z: float = 1.96) -> Tuple[float, float]:
+    """Wilson score interval for a success rate of ``correct`` out of ``n``.
+
+    ``(0, 1)`` when n == 0.
+    """
+    if n <= 0:
+        return 0.0, 1.0
+    p = correct / n
+    denom = 1.0 + z * z / n
+    centre = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return max(0.0, centre - half), min(1.0, centre + half)
 
 @dataclass
 class Curriculum:
@@ -9,10 +24,53 @@ class Curriculum:
     step: float = 0.05
     min_diff: float = 0.05
     max_diff: float = 0.95
+    # Confidence stepping: with ``z`` set (1.96 ~ 95%), episodes at one difficulty are pooled
+    # and difficulty moves only once the Wilson interval of the pooled accuracy lies wholly
+    # above or below the target band; otherwise it holds and keeps collecting evidence.
+    # ``window`` caps the pooled task count so old evidence fades as the solver improves.
+    z: Optional[float] = None
+    window: int = 512
+    correct: float = 0.0
+    seen: float = 0.0
 
     def adjust(self, difficulty: float, accuracy: float) -> float:
         if accuracy > self.target_high:
             difficulty = min(self.max_diff, difficulty + self.step)
         elif accuracy < self.target_low:
             difficulty = max(self.min_diff, difficulty - self.step)
-        return round(difficulty, 3)
\ No newline at end of file
+        return round(difficulty, 3)
+
+    def interval(self) -> Tuple[float, float]:
+        return wilson_interval(self.correct, self.seen, self.z or 1.96)
+
+    def observe(self, difficulty: float, correct: int, n: int) -> float:
+        """Next difficulty after an episode with ``correct`` of ``n`` tasks passing."""
+        if self.z is None:
+            return self.adjust(difficulty, correct / max(1, n))
+        self.correct += correct
+        self.seen += n
+        if self.seen > self.window:
+            scale = self.window / self.seen
+            self.correct *= scale
+            self.seen = float(self.window)
+        lo, hi = self.interval()
+        if lo > self.target_high and difficulty < self.max_diff:
+            difficulty = min(self.max_diff, difficulty + self.step)
+        elif hi < self.target_low and difficulty > self.min_diff:
+            difficulty = max(self.min_diff, difficulty - self.step)
+        else:
+            return difficulty
+        self.correct = self.seen = 0.0  # evidence was gathered at the old difficulty
+        return round(difficulty, 3)
+
+    def converged(self, difficulty: float) -> bool:
+        """Confident that more episodes will not move ``difficulty``: the interval lies inside
+        the band, or clears it on a side where difficulty is already at its limit."""
+        if self.z is None or self.seen == 0:
+            return False
+        lo, hi = self.interval()
+        if lo >= self.target_low and hi <= self.target_high:
+            return True
+        too_easy = lo > self.target_high and difficulty >= self.max_diff
+        too_hard = hi < self.target_low and difficulty <= self.min_diff
+        return too_easy or too_hard
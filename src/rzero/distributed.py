@@ -0,0 +1,344 @@
+from __future__ import annotations
+
+import ipaddress
+import multiprocessing as mp
+import os
+import secrets
+import socket
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from multiprocessing.connection import Client, Connection, Listener
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from .loop import Trainer
+from .metrics import span
+from .solver import Solver
+from .types import Sample, Task
+from .verifier import Verifier
+
+# --- Coordinator/worker execution for the Trainer.
+# The coordinator keeps everything stateful (challenger, curriculum, difficulty, the solver
+# being trained, the sink) and splits each episode into leases of ``lease_size`` tasks.
+# Workers connect over multiprocessing.connection (TCP, authkey-checked pickles), ask for a
+# lease, run solve_batch + verify_batch and send the Samples back. A lease whose worker
+# disconnects, or that is not returned within ``lease_timeout_s``, goes back to the queue;
+# the first result to arrive for a lease wins. Workers get a pickled (solver, verifier)
+# snapshot on their first lease and again whenever the coordinator's solver was updated.
+
+# Both ends unpickle what they receive, so the authkey is what stands between the channel
+# and remote code execution: there is no built-in default. A coordinator reachable from
+# other hosts needs $RZERO_AUTHKEY; a loopback-only one may use a random one-off key.
+
+Address = Tuple[str, int]
+
+def authkey_from_env() -> Optional[bytes]:
+    key = os.environ.get("RZERO_AUTHKEY")
+    return key.encode() if key else None
+
+def is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+def coordinator_authkey(address: Address) -> Tuple[bytes, bool]:
+    """(authkey, generated): $RZERO_AUTHKEY, else a random key for a loopback-only bind.
+
+    Raises ValueError for a non-loopback address without $RZERO_AUTHKEY.
+    """
+    key = authkey_from_env()
+    if key is not None:
+        return key, False
+    if not is_loopback(address[0]):
+        raise ValueError(f"set RZERO_AUTHKEY before binding a coordinator to {address[0]}; "
+                         "workers unpickle what it sends, so the channel needs a secret key")
+    return secrets.token_hex(16).encode(), True
+
+def parse_address(text: str) -> Address:
+    host, _, port = text.rpartition(":")
+    return (host or "127.0.0.1", int(port))
+
+@dataclass
+class _Lease:
+    id: int
+    tasks: List[Task]
+    holder: Optional[int] = None
+    deadline: float = 0.0
+    samples: Optional[List[Sample]] = None
+
+@dataclass
+class CoordinatorStats:
+    leases: int = 0
+    reclaimed: int = 0
+    duplicates: int = 0
+    workers_seen: int = 0
+    workers_lost: int = 0
+
+class Coordinator:
+    """Hands out task leases to connected workers and collects their samples."""
+
+    def __init__(
+        self,
+        address: Address = ("127.0.0.1", 0),
+        *,
+        authkey: bytes,
+        lease_size: int = 32,
+        lease_timeout_s: float = 60.0,
+    ) -> None:
+        self.lease_size = max(1, lease_size)
+        self.lease_timeout_s = lease_timeout_s
+        self.stats = CoordinatorStats()
+        self._listener = Listener(address, authkey=authkey)
+        self._cond = threading.Condition()
+        self._pending: Deque[int] = deque()
+        self._leases: Dict[int, _Lease] = {}
+        self._next_id = 0
+        self._components: Any = None
+        self._version = 0
+        self._closed = False
+        self._error: Optional[BaseException] = None
+        self._accepter = threading.Thread(
+            target=self._accept_loop, name="rzero-coordinator", daemon=True
+        )
+        self._accepter.start()
+
+    @property
+    def address(self) -> Address:
+        return self._listener.address  # type: ignore[return-value]
+
+    def set_components(self, solver: Solver, verifier: Verifier) -> None:
+        """Snapshot shipped to workers with their next lease."""
+        with self._cond:
+            self._components = (solver, verifier)
+            self._version += 1
+
+    # -- lease table
+    def _reclaim_expired(self) -> None:
+        now = time.monotonic()
+        for lease in self._leases.values():
+            if lease.samples is None and lease.holder is not None and lease.deadline < now:
+                self._requeue(lease)
+
+    def _requeue(self, lease: _Lease) -> None:
+        lease.holder = None
+        self._pending.appendleft(lease.id)
+        self.stats.reclaimed += 1
+        self._cond.notify_all()
+
+    def _checkout(self, worker: int, timeout: float) -> Optional[_Lease]:
+        with self._cond:
+            end = time.monotonic() + timeout
+            while not self._closed:
+                self._reclaim_expired()
+                while self._pending:
+                    lease = self._leases.get(self._pending.popleft())
+                    if lease is not None and lease.samples is None:
+                        lease.holder = worker
+                        lease.deadline = time.monotonic() + self.lease_timeout_s
+                        return lease
+                left = end - time.monotonic()
+                if left <= 0:
+                    return None
+                self._cond.wait(min(left, 0.1))
+            return None
+
+    def _complete(self, lease_id: int, samples: List[Sample]) -> None:
+        with self._cond:
+            lease = self._leases.get(lease_id)
+            if lease is None or lease.samples is not None:
+                self.stats.duplicates += 1
+                return
+            lease.samples = samples
+            self._cond.notify_all()
+
+    def _drop_worker(self, worker: int) -> None:
+        with self._cond:
+            self.stats.workers_lost += 1
+            for lease in self._leases.values():
+                if lease.holder == worker and lease.samples is None:
+                    self._requeue(lease)
+
+    def run_batch(self, tasks: Sequence[Task]) -> List[Sample]:
+        """Lease ``tasks`` out and block until every lease has come back (input order kept)."""
+        ids: List[int] = []
+        with self._cond:
+            for lo in range(0, len(tasks), self.lease_size):
+                lease = _Lease(self._next_id, list(tasks[lo:lo + self.lease_size]))
+                self._next_id += 1
+                self._leases[lease.id] = lease
+                self._pending.append(lease.id)
+                ids.append(lease.id)
+            self.stats.leases += len(ids)
+            self._cond.notify_all()
+            while not all(self._leases[i].samples is not None for i in ids):
+                if self._error is not None:
+                    raise self._error
+                if self._closed:
+                    raise RuntimeError("coordinator closed with leases outstanding")
+                self._reclaim_expired()
+                self._cond.wait(0.1)
+            out: List[Sample] = []
+            for i in ids:
+                out.extend(self._leases.pop(i).samples or [])
+        return out
+
+    # -- connections
+    def _accept_loop(self) -> None:
+        worker = 0
+        while not self._closed:
+            try:
+                conn = self._listener.accept()
+            except (OSError, EOFError):  # closed, or a client failed the auth handshake
+                if self._closed:
+                    return
+                continue
+            worker += 1
+            with self._cond:
+                self.stats.workers_seen += 1
+            threading.Thread(
+                target=self._serve, args=(conn, worker), name=f"rzero-lease-{worker}", daemon=True
+            ).start()
+
+    def _serve(self, conn: Connection, worker: int) -> None:
+        sent_version = 0
+        try:
+            while True:
+                msg = conn.recv()
+                if msg[0] == "result":
+                    self._complete(msg[1], msg[2])
+                    continue
+                # "ready": wait briefly for work so idle workers do not spin
+                lease = self._checkout(worker, timeout=1.0)
+                if lease is None:
+                    conn.send(("stop",) if self._closed else ("idle",))
+                    if self._closed:
+                        return
+                    continue
+                with self._cond:
+                    version, components = self._version, self._components
+                shipped = components if version != sent_version else None
+                conn.send(("lease", lease.id, shipped, lease.tasks))
+                sent_version = version
+        except (EOFError, OSError):
+            if not self._closed:
+                self._drop_worker(worker)
+        except Exception as e:  # e.g. unpicklable components: fail the run, not just this worker
+            with self._cond:
+                self._error = e
+                self._cond.notify_all()
+        finally:
+            conn.close()
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._listener.close()
+
+    def __enter__(self) -> "Coordinator":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+def run_worker(
+    address: Address,
+    *,
+    authkey: bytes,
+    verifier_factory: Optional[Callable[[], Verifier]] = None,
+    connect_timeout_s: float = 10.0,
+) -> int:
+    """Serve leases until the coordinator says stop or goes away; returns tasks processed.
+
+    ``verifier_factory`` builds a local verifier instead of using the shipped one (e.g. a
+    sandboxed CodeIOVerifier, whose process pool cannot be pickled).
+    """
+    deadline = time.monotonic() + connect_timeout_s
+    while True:
+        try:
+            conn = Client(address, authkey=authkey)
+            break
+        except ConnectionRefusedError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+    local_verifier = verifier_factory() if verifier_factory is not None else None
+    solver: Optional[Solver] = None
+    verifier: Optional[Verifier] = local_verifier
+    done = 0
+    try:
+        while True:
+            conn.send(("ready", socket.gethostname(), os.getpid()))
+            msg = conn.recv()
+            if msg[0] == "stop":
+                return done
+            if msg[0] == "idle":
+                continue
+            _, lease_id, components, tasks = msg
+            if components is not None:
+                solver, shipped = components
+                verifier = local_verifier or shipped
+            assert solver is not None and verifier is not None, "lease arrived before components"
+            sols = solver.solve_batch(tasks)
+            vers = verifier.verify_batch(tasks, sols)
+            samples = [
+                Sample(task=t, solution=s, verification=v) for t, s, v in zip(tasks, sols, vers)
+            ]
+            conn.send(("result", lease_id, samples))
+            done += len(tasks)
+    except (EOFError, OSError):  # coordinator shut down
+        return done
+    finally:
+        conn.close()
+
+def start_local_workers(
+    n: int,
+    address: Address,
+    *,
+    authkey: bytes,
+    verifier_factory: Optional[Callable[[], Verifier]] = None,
+) -> List[Any]:
+    """Start ``n`` worker processes on this machine (fork where available)."""
+    ctx = mp.get_context("fork" if "fork" in mp.get_all_start_methods() else "spawn")
+    procs = []
+    for _ in range(n):
+        p = ctx.Process(
+            target=run_worker,
+            args=(address,),
+            kwargs={"authkey": authkey, "verifier_factory": verifier_factory},
+            daemon=True,
+        )
+        p.start()
+        procs.append(p)
+    return procs
+
+@dataclass
+class DistributedTrainer(Trainer):
+    """Trainer whose solve+verify step runs on workers attached to ``coordinator``.
+
+    Proposing, the curriculum, sinks and component updates stay in this process; the
+    solver snapshot on workers is refreshed after every episode in which it was updated.
+    """
+    coordinator: Optional[Coordinator] = None
+    _shipped: bool = field(default=False, init=False, repr=False)
+
+    def run_episode(self, batch_size: int) -> tuple[list[Any], float]:
+        if self.coordinator is None:
+            raise ValueError("DistributedTrainer needs a coordinator")
+        if not self._shipped:
+            self.coordinator.set_components(self.solver, self.verifier)
+            self._shipped = True
+        with span(self.metrics, "propose"):
+            tasks = self.challenger.propose_batch(batch_size, difficulty=self.difficulty)
+        with span(self.metrics, "solve_verify"):
+            samples = self.coordinator.run_batch(tasks)
+        return self._finish_episode(samples, len(tasks))
+
+    def update_components(self, ep_samples: list[Sample], accuracy: float) -> None:
+        super().update_components(ep_samples, accuracy)
+        if type(self.solver).update is not Solver.update:
+            self._shipped = False  # workers need the updated solver
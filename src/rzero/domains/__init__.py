@@ -0,0 +1,43 @@
+"""Built-in task domains, imported on first use."""
+from __future__ import annotations
+
+import importlib
+from types import ModuleType
+from typing import Dict, List
+
+from ..plugins import DomainPlugin, register
+
+# --- Built-in domains, registered as plugins (see rzero.plugins). Components are named by
+# "module:attr", so importing this package imports no domain: `rzero --help` or
+# `rzero dataset` never pay for pydantic or the domain modules.
+
+BUILTIN: List[DomainPlugin] = [
+    register(DomainPlugin(
+        "arithmetic",
+        "rzero.domains.arithmetic:ArithmeticChallenger",
+        "rzero.domains.arithmetic:ArithmeticSolver",
+        "rzero.domains.arithmetic:ArithmeticVerifier",
+        "Arithmetic expressions, solved and verified by a safe evaluator.",
+    )),
+    register(DomainPlugin(
+        "code-io",
+        "rzero.domains.code_io:CodeIOChallenger",
+        "rzero.domains.code_io:CodeIOSolver",
+        "rzero.domains.code_io:CodeIOVerifier",
+        "Small Python functions, verified by running their tests.",
+    )),
+]
+
+# name -> implementing module
+DOMAINS: Dict[str, str] = {p.name: str(p.challenger).partition(":")[0] for p in BUILTIN}
+
+def names() -> List[str]:
+    return list(DOMAINS)
+
+def load(name: str) -> ModuleType:
+    """Import (once) and return the module implementing built-in domain ``name``."""
+    try:
+        module = DOMAINS[name]
+    except KeyError:
+        raise KeyError(f"unknown domain {name!r}; available: {', '.join(DOMAINS)}") from None
+    return importlib.import_module(module)
@@ -1,57 +1,188 @@
 from __future__ import annotations
 
 import ast
+import json
 import operator as op
 import random
+import re
 import string
 from dataclasses import dataclass
-from typing import Any, List
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Iterator, List, Optional
 
 from ..types import Task, Solution, Verification
+from ..records import SolutionRecord, TaskRecord, VerificationRecord
+from ..cache import LRUCache
 from ..challenger import Challenger
 from ..solver import Solver
 from ..verifier import Verifier
+from ..plugins import Capabilities
 
-# Safe eval for arithmetic expressions
-_ALLOWED = {
+# Safe expression engine. An expression is parsed and validated once into a tree of
+# closures (a node-type dispatch table, no isinstance chains); results, including errors,
+# are memoised by expression string in a bounded LRU, so the solver and verifier
+# evaluating the same prompt pay for parsing once. Literals are floats, as before, and
+# ** refuses exponents above _MAX_EXPONENT instead of grinding through them.
+_MAX_EXPONENT = 1024.0
+
+def _pow(a: float, b: float) -> float:
+    if abs(b) > _MAX_EXPONENT:
+        raise ValueError(f"exponent {b:g} too large")
+    return op.pow(a, b)
+
+_BIN_OPS = {
     ast.Add: op.add,
     ast.Sub: op.sub,
     ast.Mult: op.mul,
     ast.Div: op.truediv,
     ast.FloorDiv: op.floordiv,
     ast.Mod: op.mod,
-    ast.Pow: op.pow,
-    ast.UAdd: op.pos,
-    ast.USub: op.neg,
+    ast.Pow: _pow,
 }
+_UNARY_OPS = {ast.UAdd: op.pos, ast.USub: op.neg}
 
-def _safe_eval(expr: str) -> float:
-    node = ast.parse(expr, mode="eval")
-
-    def _eval(n: ast.AST) -> float:
-        if isinstance(n, ast.Expression):
-            return _eval(n.body)
-        if isinstance(n, ast.Num):  # type: ignore[attr-defined]
-            return float(n.n)  # type: ignore[attr-defined]
-        if isinstance(n, ast.BinOp):
-            if type(n.op) not in _ALLOWED:
-                raise ValueError("op not allowed")
-            return _ALLOWED[type(n.op)](_eval(n.left), _eval(n.right))  # type: ignore[index]
-        if isinstance(n, ast.UnaryOp):
-            if type(n.op) not in _ALLOWED:
-                raise ValueError("uop not allowed")
-            return _ALLOWED[type(n.op)](_eval(n.operand))  # type: ignore[index]
-        if isinstance(n, ast.Constant) and isinstance(n.value, (int, float)):
-            return float(n.value)
+Compiled = Callable[[], float]
+
+def _compile_constant(n: ast.Constant) -> Compiled:
+    if type(n.value) not in (int, float):  # bools are ints, but not numbers here
+        raise ValueError("bad node")
+    value = float(n.value)
+    return lambda: value
+
+def _compile_binop(n: ast.BinOp) -> Compiled:
+    f = _BIN_OPS.get(type(n.op))
+    if f is None:
+        raise ValueError("op not allowed")
+    left, right = _compile(n.left), _compile(n.right)
+    return lambda: f(left(), right())
+
+def _compile_unary(n: ast.UnaryOp) -> Compiled:
+    f = _UNARY_OPS.get(type(n.op))
+    if f is None:
+        raise ValueError("uop not allowed")
+    operand = _compile(n.operand)
+    return lambda: f(operand())
+
+_COMPILERS: dict[type, Callable[[Any], Compiled]] = {
+    ast.Expression: lambda n: _compile(n.body),
+    ast.Constant: _compile_constant,
+    ast.BinOp: _compile_binop,
+    ast.UnaryOp: _compile_unary,
+}
+
+def _compile(n: ast.AST) -> Compiled:
+    compiler = _COMPILERS.get(type(n))
+    if compiler is None:
         raise ValueError("bad node")
-    return _eval(node)
+    return compiler(n)
+
+def compile_expr(expr: str) -> Compiled:
+    """Validate ``expr`` and return a closure computing its value.
+
+    Raises ValueError if the expression is not allowed.
+    """
+    return _compile(ast.parse(expr, mode="eval"))
+
+# Values or exceptions by expression string. Per process, like code_io._CODE_CACHE.
+_EVAL_CACHE: LRUCache[Any] = LRUCache(max_entries=65_536, sizeof=lambda v: 64)
+
+def _safe_eval(expr: str) -> float:
+    hit = _EVAL_CACHE.get(expr)
+    if hit is None:
+        try:
+            hit = compile_expr(expr)()
+        except Exception as e:
+            hit = e
+        _EVAL_CACHE.put(expr, hit)
+    if isinstance(hit, Exception):
+        raise type(hit)(*hit.args)  # a fresh instance: cached errors do not pile up tracebacks
+    return hit
+
+# Batch path: expressions already in _EVAL_CACHE are answered from it. The misses that are
+# "flat" (unsigned literals joined by binary operators, no parens) are tokenised, grouped
+# by operator sequence, and evaluated column-wise with map() over the operator functions,
+# following Python precedence/associativity so results are bit-identical to _safe_eval;
+# their values go back into _EVAL_CACHE, so a verify_batch after solve_batch on the same
+# prompts is all hits. Everything else, and any group that raises, uses _safe_eval.
+_NUM = r"(?:\d+\.\d*|\.\d+|0+|[1-9]\d{0,14})"
+_BINOP = r"(?:\*\*|//|[-+*/%])"
+_FLAT = re.compile(rf"[ \t]*{_NUM}(?:[ \t]*{_BINOP}[ \t]*{_NUM})*[ \t]*\Z").match
+_TOKENS = re.compile(rf"{_NUM}|{_BINOP}").findall
+_BINOPS = {
+    "**": _pow, "*": op.mul, "/": op.truediv, "//": op.floordiv, "%": op.mod,
+    "+": op.add, "-": op.sub,
+}
+_LEVELS = (("*", "/", "//", "%"), ("+", "-"))
+
+def _eval_columns(ops: tuple[str, ...], columns: List[List[float]]) -> List[float]:
+    cols, rest = list(columns), list(ops)
+    i = len(rest) - 1
+    while i >= 0:  # ** binds tightest and is right-associative
+        if rest[i] == "**":
+            cols[i:i + 2] = [list(map(_pow, cols[i], cols[i + 1]))]
+            del rest[i]
+        i -= 1
+    for level in _LEVELS:  # then left-to-right per level
+        i = 0
+        while i < len(rest):
+            if rest[i] in level:
+                cols[i:i + 2] = [list(map(_BINOPS[rest[i]], cols[i], cols[i + 1]))]
+                del rest[i]
+            else:
+                i += 1
+    return cols[0]
+
+def _eval_one(expr: str) -> float | Exception:
+    try:
+        return _safe_eval(expr)
+    except Exception as e:
+        return e
+
+def _eval_batch(exprs: List[str]) -> List[float | Exception]:
+    """Evaluate many expressions at once; duplicates and cached ones are evaluated once."""
+    seen: dict[str, float | Exception] = {}
+    groups: dict[tuple[str, ...], tuple[List[str], List[List[str]]]] = {}
+    for e in dict.fromkeys(exprs):
+        hit = _EVAL_CACHE.get(e)
+        if hit is not None:
+            seen[e] = hit
+        elif _FLAT(e):
+            toks = _TOKENS(e)
+            members, rows = groups.setdefault(tuple(toks[1::2]), ([], []))
+            members.append(e)
+            rows.append(toks[0::2])
+        else:
+            seen[e] = _eval_one(e)
+    for ops, (members, rows) in groups.items():
+        try:
+            values = _eval_columns(ops, [list(map(float, c)) for c in zip(*rows)])
+        except Exception:  # e.g. ZeroDivisionError somewhere in the column
+            values = [_eval_one(e) for e in members]
+        else:
+            for e, v in zip(members, values):
+                _EVAL_CACHE.put(e, v)
+        seen.update(zip(members, values))
+    return [seen[e] for e in exprs]
+
+def _format(value: float) -> str:
+    return str(int(value)) if value.is_integer() else f"{value:.6f}"
 
 class ArithmeticChallenger(Challenger):
+    capabilities = Capabilities(thread_safe=True, process_safe=True)
+
     def propose_batch(self, n: int, *, difficulty: float) -> List[Task]:
-        tasks: List[Task] = []
+        return self._propose(n, difficulty, Task)
+
+    def propose_records(self, n: int, *, difficulty: float) -> List[TaskRecord]:
+        return self._propose(n, difficulty, TaskRecord)
+
+    def _propose(self, n: int, difficulty: float, make: Callable[..., Any]) -> List[Any]:
+        tasks: List[Any] = []
         # difficulty influences number range and operators
         max_n = int(10 + 90 * difficulty)  # 10..100
         ops = ['+', '-'] + (['*'] if difficulty >= 0.3 else []) + (['/'] if difficulty >= 0.6 else [])
+        now = datetime.utcnow()
         for i in range(n):
             a, b = random.randint(1, max_n), random.randint(1, max_n)
             c = random.randint(1, max_n) if difficulty >= 0.6 else None
@@ -61,31 +192,175 @@ class ArithmeticChallenger(Challenger):
                 op2 = random.choice(ops)
                 expr = f"{expr} {op2} {c}"
             task_id = "arith-" + ''.join(random.choices(string.ascii_lowercase + string.digits, k=8))
-            tasks.append(Task(id=task_id, domain="arithmetic", prompt=expr, difficulty=difficulty))
+            tasks.append(make(
+                id=task_id, domain="arithmetic", prompt=expr, difficulty=difficulty, created_at=now
+            ))
         return tasks
 
+# Tree generator: random draws are made in blocks (one rng.choices call per few thousand
+# values) and consumed by a recursive builder that formats and evaluates each node in the
+# same pass. Every operator application is parenthesised and computed with the _BINOPS
+# functions on floats in evaluation order, so the stored answer is bit-identical to
+# _safe_eval(prompt). Operators are swapped for "+" where they would divide by zero or
+# push a product past _MAX_PRODUCT.
+_BLOCK = 4096
+_MAX_PRODUCT = 1e9
+
+class _Draws:
+    """Endless stream of ``rng.choices(population)``, sampled ``_BLOCK`` at a time."""
+
+    def __init__(self, rng: random.Random, population: List[Any]) -> None:
+        self.rng, self.population = rng, population
+        self._it: Iterator[Any] = iter(())
+
+    def __call__(self) -> Any:
+        try:
+            return next(self._it)
+        except StopIteration:
+            self._it = iter(self.rng.choices(self.population, k=_BLOCK))
+            return next(self._it)
+
+class TreeArithmeticChallenger(ArithmeticChallenger):
+    """Seeded generator of nested expressions whose depth grows with difficulty.
+
+    Depth is ``1 + round(difficulty * (max_depth - 1))``: the left spine always reaches it,
+    right subtrees are shallower. The ground truth goes into ``meta["answer"]``, which
+    ArithmeticVerifier uses instead of re-evaluating the prompt. The generator's RNG is
+    independent of the global ``random`` module and is saved/restored with checkpoints.
+    """
+
+    def __init__(self, seed: Optional[int] = None, *, max_depth: int = 8) -> None:
+        self.rng = random.Random(seed)
+        self.max_depth = max(1, max_depth)
+
+    def depth(self, difficulty: float) -> int:
+        return 1 + round(min(1.0, max(0.0, difficulty)) * (self.max_depth - 1))
+
+    def _propose(self, n: int, difficulty: float, make: Callable[..., Any]) -> List[Any]:
+        rng = self.rng
+        max_n = int(10 + 90 * difficulty)
+        ops = ['+', '-'] + (['*'] if difficulty >= 0.3 else [])
+        ops += ['/'] if difficulty >= 0.6 else []
+        leaf, pick_op, shape = _Draws(rng, list(range(1, max_n + 1))), _Draws(rng, ops), rng.random
+        binops = _BINOPS
+
+        def build(depth: int) -> tuple[str, float]:
+            if depth == 0:
+                a = leaf()
+                return str(a), float(a)
+            ls, lv = build(depth - 1)
+            u = shape()
+            rs, rv = build(int(u * u * depth))
+            o = pick_op()
+            if (o == '/' and rv == 0) or (o == '*' and abs(lv * rv) > _MAX_PRODUCT):
+                o = '+'
+            return f"({ls} {o} {rs})", binops[o](lv, rv)
+
+        depth = self.depth(difficulty)
+        now = datetime.utcnow()
+        tasks: List[Any] = []
+        for _ in range(n):
+            expr, value = build(depth)
+            tasks.append(make(
+                id=f"arith-{rng.getrandbits(48):012x}",
+                domain="arithmetic",
+                prompt=expr[1:-1],
+                difficulty=difficulty,
+                meta={"answer": value},
+                created_at=now,
+            ))
+        return tasks
+
+    def save(self, path: str) -> None:
+        version, internal, gauss = self.rng.getstate()
+        Path(path).write_text(json.dumps([version, list(internal), gauss]), encoding="utf-8")
+
+    def load(self, path: str) -> None:
+        version, internal, gauss = json.loads(Path(path).read_text(encoding="utf-8"))
+        self.rng.setstate((version, tuple(internal), gauss))
+
 class ArithmeticSolver(Solver):
     name = "arith-heuristic"
+    capabilities = Capabilities(thread_safe=True, process_safe=True)
+
     def solve(self, task: Task) -> Solution:
         try:
             value = _safe_eval(task.prompt)
-            if value.is_integer():
-                ans = str(int(value))
-            else:
-                ans = f"{value:.6f}"
-            return Solution(task_id=task.id, solver=self.name, content=ans)
+            return Solution(task_id=task.id, solver=self.name, content=_format(value))
         except Exception as e:
             return Solution(task_id=task.id, solver=self.name, content="ERROR", meta={"error": str(e)})
 
+    def solve_batch(self, tasks: List[Task]) -> List[Solution]:
+        return self._solve(tasks, Solution)
+
+    def solve_records(self, tasks: List[TaskRecord]) -> List[SolutionRecord]:
+        return self._solve(tasks, SolutionRecord)
+
+    def _solve(self, tasks: List[Any], make: Callable[..., Any]) -> List[Any]:
+        out: List[Any] = []
+        for t, v in zip(tasks, _eval_batch([t.prompt for t in tasks])):
+            if isinstance(v, Exception):
+                error = {"error": str(v)}
+                out.append(make(task_id=t.id, solver=self.name, content="ERROR", meta=error))
+            else:
+                out.append(make(task_id=t.id, solver=self.name, content=_format(v)))
+        return out
+
+def _truths(tasks: List[Any]) -> List[float | Exception]:
+    """Ground truth per task: meta["answer"] when the generator stored one, else evaluated."""
+    answers: List[Any] = [t.meta.get("answer") if t.meta else None for t in tasks]
+    missing = [t.prompt for t, a in zip(tasks, answers) if a is None]
+    if missing:
+        evaluated = iter(_eval_batch(missing))
+        answers = [next(evaluated) if a is None else a for a in answers]
+    return answers
+
 class ArithmeticVerifier(Verifier):
+    capabilities = Capabilities(thread_safe=True, process_safe=True)
+
     def verify(self, task: Task, solution: Solution) -> Verification:
-        try:
-            truth = _safe_eval(task.prompt)
-        except Exception as e:
-            return Verification(task_id=task.id, passed=False, score=0.0, feedback=f"bad task: {e}")
+        truth = task.meta.get("answer") if task.meta else None
+        if truth is None:
+            try:
+                truth = _safe_eval(task.prompt)
+            except Exception as e:
+                return Verification(
+                    task_id=task.id, passed=False, score=0.0, feedback=f"bad task: {e}"
+                )
         try:
             pred = float(solution.content)
         except Exception:
             return Verification(task_id=task.id, passed=False, score=0.0, feedback="non-numeric")
         passed = abs(pred - truth) < 1e-6
-        return Verification(task_id=task.id, passed=passed, score=1.0 if passed else 0.0, feedback="")
\ No newline at end of file
+        return Verification(task_id=task.id, passed=passed, score=1.0 if passed else 0.0, feedback="")
+
+    def verify_batch(self, tasks: List[Task], solutions: List[Solution]) -> List[Verification]:
+        return self._verify(tasks, solutions, Verification)
+
+    def verify_records(
+        self,
+        tasks: List[TaskRecord],
+        solutions: List[SolutionRecord],
+    ) -> List[VerificationRecord]:
+        return self._verify(tasks, solutions, VerificationRecord)
+
+    def _verify(
+        self,
+        tasks: List[Any],
+        solutions: List[Any],
+        make: Callable[..., Any],
+    ) -> List[Any]:
+        out: List[Any] = []
+        for t, sol, truth in zip(tasks, solutions, _truths(tasks)):
+            if isinstance(truth, Exception):
+                feedback = f"bad task: {truth}"
+                out.append(make(task_id=t.id, passed=False, score=0.0, feedback=feedback))
+                continue
+            try:
+                pred = float(sol.content)
+            except Exception:
+                out.append(make(task_id=t.id, passed=False, score=0.0, feedback="non-numeric"))
+                continue
+            passed = abs(pred - truth) < 1e-6
+            out.append(make(task_id=t.id, passed=passed, score=1.0 if passed else 0.0, feedback=""))
+        return out
@@ -2,50 +2,94 @@ from __future__ import annotations
 
 import random
 import string
-from typing import Any, Callable, Dict, List
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
 
 from ..types import Task, Solution, Verification
 from ..challenger import Challenger
 from ..solver import Solver
 from ..verifier import Verifier
+from ..plugins import Capabilities
+from ..cache import LRUCache, content_hash
+from .taskbank import TaskBank, spec_of
 
-# --- Code-IO domain: generate tiny function specs with tests, solve heuristically, verify by execution.
+if TYPE_CHECKING:
+    from ..sandbox import SandboxPool
+
+# --- Code-IO domain: sample function specs with tests from a TaskBank, solve heuristically,
+# verify by execution.
 
 _SPEC_BANK = [
     {
+        "id": "add",
         "name": "add",
         "prompt": "Write a function add(a, b) that returns a + b.",
-        "tests": [((1, 2), 3), ((-5, 5), 0), ((10, -3), 7)]
+        "tests": [((1, 2), 3), ((-5, 5), 0), ((10, -3), 7)],
+        "difficulty": 0.2,
+        "tags": ["arith"],
     },
     {
+        "id": "reverse_string",
         "name": "reverse_string",
         "prompt": "Write a function reverse_string(s) that returns the reversed string.",
-        "tests": [(("abc",), "cba"), (("",), ""), (("racecar",), "racecar")]
+        "tests": [(("abc",), "cba"), (("",), ""), (("racecar",), "racecar")],
+        "difficulty": 0.4,
+        "tags": ["string"],
     },
     {
+        "id": "factorial",
         "name": "factorial",
         "prompt": "Write a function factorial(n) that returns n! for n>=0 (with factorial(0)==1).",
-        "tests": [((0,), 1), ((3,), 6), ((5,), 120)]
+        "tests": [((0,), 1), ((3,), 6), ((5,), 120)],
+        "difficulty": 0.6,
+        "tags": ["loop"],
     },
 ]
 
+_default_bank: Optional[TaskBank] = None
+
+def default_bank() -> TaskBank:
+    """The built-in specs as a single-bucket bank: every difficulty samples all three."""
+    global _default_bank
+    if _default_bank is None:
+        _default_bank = TaskBank(_SPEC_BANK, buckets=1, id="builtin")
+    return _default_bank
+
 def _rand_id(prefix: str) -> str:
     return prefix + "-" + "".join(random.choices(string.ascii_lowercase + string.digits, k=8))
 
 class CodeIOChallenger(Challenger):
+    """Samples specs near the requested difficulty (optionally only those tagged ``tag``).
+
+    Tasks reference their spec by id (meta = {"bank", "spec_id", "name"}); resolve it with
+    rzero.domains.taskbank.spec_of.
+    """
+
+    capabilities = Capabilities(thread_safe=True, process_safe=True)
+
+    def __init__(self, bank: Optional[TaskBank] = None, *, tag: Optional[str] = None) -> None:
+        self.bank = bank or default_bank()
+        self.tag = tag
+
     def propose_batch(self, n: int, *, difficulty: float) -> List[Task]:
         tasks: List[Task] = []
         for _ in range(n):
-            spec = random.choice(_SPEC_BANK)
-            prompt = spec["prompt"]
-            task = Task(id=_rand_id("code"), domain="code-io", prompt=prompt, difficulty=difficulty, meta={"spec": spec})
+            spec = self.bank.sample(difficulty, tag=self.tag)
+            task = Task(
+                id=_rand_id("code"),
+                domain="code-io",
+                prompt=spec["prompt"],
+                difficulty=difficulty,
+                meta=self.bank.task_meta(spec),
+            )
             tasks.append(task)
         return tasks
 
 class CodeIOSolver(Solver):
     name = "codeio-heuristic"
+    capabilities = Capabilities(thread_safe=True, process_safe=True)
+
     def solve(self, task: Task) -> Solution:
-        spec = task.meta.get("spec") or {}
+        spec = spec_of(task)
         name = spec.get("name", "")
         if name == "add":
             code = "def add(a, b):\n    return a + b\n"
@@ -59,35 +103,134 @@ class CodeIOSolver(Solver):
                 "    for i in range(2, n+1):\n        out *= i\n"
                 "    return out\n"
             )
+        elif "solution" in spec:  # synthetic bank specs carry a reference solution
+            code = spec["solution"]
         else:
             code = "# TODO: unknown spec\n"
         return Solution(task_id=task.id, solver=self.name, content=code)
 
+# Compiled solution code, keyed by source. Per process, so sandbox workers keep their own.
+_CODE_CACHE: LRUCache[Any] = LRUCache(
+    max_entries=2048, max_bytes=64 * 1024 * 1024, sizeof=lambda c: len(c.co_code) + 512
+)
+
+def _compiled(code: str) -> Any:
+    obj = _CODE_CACHE.get(code)
+    if obj is None:
+        obj = compile(code, "<string>", "exec")
+        _CODE_CACHE.put(code, obj)
+    return obj
+
+def run_tests(code: str, name: str, tests: List[Any]) -> tuple[int, str]:
+    """Exec ``code`` in a restricted namespace and count passing tests -> (passed, feedback)."""
+    builtins = {"range": range, "len": len, "ValueError": ValueError}
+    global_ns: Dict[str, Any] = {"__builtins__": builtins}
+    local_ns: Dict[str, Any] = {}
+    try:
+        exec(_compiled(code), global_ns, local_ns)
+    except Exception as e:
+        return 0, f"exec error: {e}"
+
+    fn = local_ns.get(name)
+    if not callable(fn):
+        return 0, "function not defined"
+
+    passed = 0
+    for args, expected in tests:
+        try:
+            out = fn(*args)
+            if out == expected:
+                passed += 1
+        except Exception:
+            # counts as failure
+            pass
+    return passed, ""
+
 class CodeIOVerifier(Verifier):
+    """Runs the spec's tests against the solution.
+
+    By default code runs in-process. Pass a ``SandboxPool`` (rzero.sandbox) to run it in
+    pre-forked worker processes with timeouts and resource limits instead.
+
+    With ``cache`` set, outcomes are memoised by a content hash of (function name, tests,
+    solution code); hits skip execution entirely and are marked ``meta["cache"] = "hit"``.
+
+    ``bank`` (default: the built-in specs) is only held so that pickling the verifier
+    (process executor, distributed workers) carries the bank along and registers it in the
+    process where tasks are resolved.
+    """
+
+    capabilities = Capabilities(thread_safe=True, process_safe=True)
+
+    def __init__(self, sandbox: Optional[SandboxPool] = None, cache: Optional[LRUCache[Any]] = None,
+                 bank: Optional[TaskBank] = None) -> None:
+        self.sandbox = sandbox
+        self.cache = cache
+        self.bank = bank or default_bank()
+        if sandbox is not None:  # the pool's worker processes cannot be shipped
+            self.capabilities = Capabilities(thread_safe=True)
+
+    def _run(self, code: str, name: str, tests: List[Any]) -> tuple[int, str, bool]:
+        """(passed, feedback, transient); transient outcomes (sandbox timeouts, crashed
+        workers) may differ on a retry and are never cached."""
+        if self.sandbox is not None:
+            passed, feedback = self.sandbox.run(code, name, tests)
+            return passed, feedback, self.sandbox.is_transient(feedback)
+        passed, feedback = run_tests(code, name, tests)
+        return passed, feedback, False
+
     def verify(self, task: Task, solution: Solution) -> Verification:
-        spec = task.meta.get("spec") or {}
+        spec = spec_of(task)
         name = spec.get("name", "")
         tests = spec.get("tests", [])
-        # Execute in a restricted namespace
-        global_ns: Dict[str, Any] = {"__builtins__": {"range": range, "len": len, "ValueError": ValueError}}
-        local_ns: Dict[str, Any] = {}
-        try:
-            exec(solution.content, global_ns, local_ns)
-        except Exception as e:
-            return Verification(task_id=task.id, passed=False, score=0.0, feedback=f"exec error: {e}")
-
-        fn = local_ns.get(name)
-        if not callable(fn):
-            return Verification(task_id=task.id, passed=False, score=0.0, feedback="function not defined")
-
-        passed = 0
-        for args, expected in tests:
-            try:
-                out = fn(*args)
-                if out == expected:
-                    passed += 1
-            except Exception:
-                # counts as failure
-                pass
-        score = passed / max(1, len(tests))
-        return Verification(task_id=task.id, passed=score == 1.0, score=score, feedback="")
\ No newline at end of file
+        meta: Dict[str, Any] = {}
+        if self.cache is None:
+            passed, feedback, _ = self._run(solution.content, name, tests)
+        else:
+            key = content_hash(name, tests, solution.content)
+            hit = self.cache.get(key)
+            if hit is not None:
+                passed, feedback = hit
+                meta["cache"] = "hit"
+            else:
+                passed, feedback, transient = self._run(solution.content, name, tests)
+                if not transient:
+                    self.cache.put(key, (passed, feedback))
+        return _verification(task, passed, feedback, len(tests), meta)
+
+    def verify_batch(self, tasks: List[Task], solutions: List[Solution]) -> List[Verification]:
+        """With a sandbox, the batch's cache misses run on all pool workers at once; a
+        per-task loop would keep one worker busy and leave the rest idle."""
+        if self.sandbox is None:
+            return super().verify_batch(tasks, solutions)
+        jobs: Dict[Any, tuple[str, str, List[Any]]] = {}  # distinct misses, in order
+        keys, hits = [], {}
+        for task, sol in zip(tasks, solutions):
+            spec = spec_of(task)
+            name, tests = spec.get("name", ""), spec.get("tests", [])
+            key = content_hash(name, tests, sol.content) if self.cache is not None else len(keys)
+            keys.append((key, len(tests)))
+            hit = self.cache.get(key) if self.cache is not None else None
+            if hit is not None:
+                hits[key] = hit
+            else:
+                jobs.setdefault(key, (sol.content, name, tests))
+        ran = dict(zip(jobs, self.sandbox.run_many(list(jobs.values()))))
+        for key, (passed, feedback) in ran.items():
+            if self.cache is not None and not self.sandbox.is_transient(feedback):
+                self.cache.put(key, (passed, feedback))
+        out: List[Verification] = []
+        for task, (key, n_tests) in zip(tasks, keys):
+            if key in hits:
+                out.append(_verification(task, *hits[key], n_tests, {"cache": "hit"}))
+            else:
+                out.append(_verification(task, *ran[key], n_tests, {}))
+        return out
+
+def _verification(
+    task: Task, passed: int, feedback: str, n_tests: int, meta: Dict[str, Any]
+) -> Verification:
+    if feedback:
+        return Verification(task_id=task.id, passed=False, score=0.0, feedback=feedback, meta=meta)
+    score = passed / max(1, n_tests)
+    return Verification(task_id=task.id, passed=score == 1.0, score=score, feedback="", meta=meta)
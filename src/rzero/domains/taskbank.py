@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+import json
+
+import random
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from ..cache import content_hash
+from ..storage import atomic_write_bytes, iter_lines
+
+# --- Indexed bank of code-io specs.
+# A spec is {"id", "name", "prompt", "tests": [[args, expected], ...], "difficulty", "tags",
+# optional "solution"}. The bank buckets specs by difficulty and by (tag, bucket), and keeps
+# for every bucket the flat list of spec indices within ``window`` buckets of it, so
+# sampling a task is one list lookup plus random.choice. Tasks carry only
+# meta={"bank", "spec_id", "name"}; spec_of() resolves them through the banks registered
+# in this process (banks register themselves when built or unpickled).
+
+_BANKS: Dict[str, "TaskBank"] = {}
+
+class TaskBank:
+    def __init__(
+        self,
+        specs: Iterable[Dict[str, Any]],
+        *,
+        buckets: int = 10,
+        window: int = 1,
+        id: Optional[str] = None,
+    ) -> None:
+        self.buckets = max(1, buckets)
+        self.window = max(0, window)
+        self.specs: List[Dict[str, Any]] = []
+        self._by_id: Dict[str, int] = {}
+        for spec in specs:
+            if spec["id"] in self._by_id:
+                continue
+            self._by_id[spec["id"]] = len(self.specs)
+            self.specs.append(spec)
+        if not self.specs:
+            raise ValueError("task bank is empty")
+        self.id = id or content_hash([s["id"] for s in self.specs])[:16]
+        self._build()
+        _BANKS[self.id] = self
+
+    def _bucket(self, difficulty: float) -> int:
+        return min(self.buckets - 1, max(0, int(difficulty * self.buckets)))
+
+    def _build(self) -> None:
+        exact: List[List[int]] = [[] for _ in range(self.buckets)]
+        tagged: Dict[str, List[List[int]]] = {}
+        for i, spec in enumerate(self.specs):
+            b = self._bucket(float(spec.get("difficulty", 0.5)))
+            exact[b].append(i)
+            for tag in spec.get("tags", ()):
+                tagged.setdefault(tag, [[] for _ in range(self.buckets)])[b].append(i)
+        self.sizes = [len(b) for b in exact]
+        self._near = self._windows(exact)
+        self._near_tag = {tag: self._windows(bs) for tag, bs in tagged.items()}
+
+    def _windows(self, exact: List[List[int]]) -> List[List[int]]:
+        """Per bucket: specs within ``window`` buckets, widening until something matches."""
+        out: List[List[int]] = []
+        for b in range(self.buckets):
+            w = self.window
+            while True:
+                near = range(max(0, b - w), min(self.buckets, b + w + 1))
+                pool = [i for k in near for i in exact[k]]
+                if pool or w >= self.buckets:
+                    break
+                w += 1
+            out.append(pool)
+        return out
+
+    def __len__(self) -> int:
+        return len(self.specs)
+
+    @property
+    def tags(self) -> List[str]:
+        return sorted(self._near_tag)
+
+    def get(self, spec_id: str) -> Dict[str, Any]:
+        return self.specs[self._by_id[spec_id]]
+
+    def sample(
+        self,
+        difficulty: float,
+        *,
+        tag: Optional[str] = None,
+        rng: Any = random,
+    ) -> Dict[str, Any]:
+        """A spec near ``difficulty`` (optionally with ``tag``); O(1)."""
+        near = self._near if tag is None else self._near_tag.get(tag)
+        if near is None:
+            raise KeyError(f"no specs tagged {tag!r}")
+        return self.specs[rng.choice(near[self._bucket(difficulty)])]
+
+    def task_meta(self, spec: Dict[str, Any]) -> Dict[str, Any]:
+        return {"bank": self.id, "spec_id": spec["id"], "name": spec["name"]}
+
+    # Persistence: JSONL (optionally .gz/.zst) or a JSON list.
+    @classmethod
+    def load(cls, path: str | Path, **kw: Any) -> "TaskBank":
+        p = Path(path).expanduser()
+        if p.suffix == ".json":
+            specs = json.loads(p.read_text(encoding="utf-8"))
+        else:
+            specs = [json.loads(line) for line in iter_lines(p)]
+        return cls(specs, **kw)
+
+    def save(self, path: str | Path) -> Path:
+        """Write JSONL (compressed by suffix) via a temp file + rename."""
+        data = "".join(json.dumps(s) + "\n" for s in self.specs).encode("utf-8")
+        return atomic_write_bytes(path, data)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"specs": self.specs, "buckets": self.buckets, "window": self.window, "id": self.id}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:  # rebuild indexes and re-register
+        self.__init__(  # type: ignore[misc]
+            state["specs"], buckets=state["buckets"], window=state["window"], id=state["id"]
+        )
+
+def spec_of(task: Any) -> Dict[str, Any]:
+    """The spec a code-io task refers to (older datasets embed it as meta["spec"]).
+
+    Raises KeyError when the task's bank is not registered in this process (load it with
+    TaskBank.load first); without its tests every solution would silently score 0.
+    """
+    meta = task.meta or {}
+    spec = meta.get("spec")
+    if spec is not None:
+        return spec
+    bank_id = meta.get("bank")
+    if bank_id is None:
+        return {"name": meta.get("name", "")}
+    bank = _BANKS.get(bank_id)
+    if bank is None and bank_id == "builtin":
+        from .code_io import default_bank  # registers the built-in specs
+
+        bank = default_bank()
+    if bank is None:
+        raise KeyError(
+            f"task {task.id!r} refers to task bank {bank_id!r}, which is not loaded in this "
+            f"process; load it with TaskBank.load(path) (loaded: {', '.join(_BANKS) or 'none'})"
+        )
+    return bank.get(meta["spec_id"])
+
+def name_of(task: Any) -> str:
+    """The function name a code-io task asks for; needs no bank."""
+    meta = task.meta or {}
+    return meta.get("name") or spec_of(task).get("name", "")
+
+# --- Synthetic spec families, for building large banks (rzero bank build).
+# Each reference solution only uses the builtins run_tests allows (range, len, ValueError).
+
+def _family_specs(rng: random.Random) -> Dict[str, Any]:
+    kind = rng.choice(
+        ["add", "scale", "clamp", "sum_multiples", "count_char", "poly", "fib_mod", "digits"]
+    )
+    if kind == "add":
+        k = rng.randint(1, 99)
+        name, args = f"add_{k}", "x"
+        body, doc = f"    return x + {k}\n", f"returns x + {k}"
+        inputs, diff, tags = [(rng.randint(-50, 50),) for _ in range(4)], 0.1, ["arith"]
+    elif kind == "scale":
+        k = rng.randint(2, 20)
+        name, args = f"scale_{k}", "x"
+        body, doc = f"    return x * {k}\n", f"returns x multiplied by {k}"
+        inputs, diff, tags = [(rng.randint(-50, 50),) for _ in range(4)], 0.2, ["arith"]
+    elif kind == "clamp":
+        lo, hi = sorted(rng.sample(range(-20, 21), 2))
+        name, args = f"clamp_{lo + 20}_{hi + 20}", "x"
+        body = (
+            f"    if x < {lo}:\n        return {lo}\n"
+            f"    if x > {hi}:\n        return {hi}\n"
+            "    return x\n"
+        )
+        doc = f"clamps x to the range [{lo}, {hi}]"
+        inputs, diff, tags = [(rng.randint(-30, 30),) for _ in range(5)], 0.35, ["branch"]
+    elif kind == "sum_multiples":
+        k = rng.randint(2, 9)
+        name, args = f"sum_multiples_{k}", "n"
+        body = (
+            "    total = 0\n"
+            "    for i in range(n):\n"
+            f"        if i % {k} == 0:\n"
+            "            total += i\n"
+            "    return total\n"
+        )
+        doc = f"returns the sum of all i in [0, n) divisible by {k}"
+        inputs, diff, tags = [(rng.randint(0, 60),) for _ in range(4)], 0.5, ["loop"]
+    elif kind == "count_char":
+        c = rng.choice("abcdexyz")
+        name, args = f"count_{c}", "s"
+        body = (
+            "    n = 0\n"
+            "    for ch in s:\n"
+            f"        if ch == {c!r}:\n"
+            "            n += 1\n"
+            "    return n\n"
+        )
+        doc = f"returns how many times {c!r} occurs in s"
+        inputs = [
+            ("".join(rng.choice("abcdexyz") for _ in range(rng.randint(0, 12))),) for _ in range(4)
+        ]
+        diff, tags = 0.45, ["string", "loop"]
+    elif kind == "poly":
+        a, b, c = rng.randint(-5, 5), rng.randint(-9, 9), rng.randint(-9, 9)
+        name, args = f"poly_{a + 5}_{b + 9}_{c + 9}", "x"
+        body, doc = f"    return {a} * x * x + {b} * x + {c}\n", f"returns {a}*x**2 + {b}*x + {c}"
+        inputs, diff, tags = [(rng.randint(-10, 10),) for _ in range(4)], 0.6, ["arith"]
+    elif kind == "fib_mod":
+        m = rng.randint(5, 1000)
+        name, args = f"fib_mod_{m}", "n"
+        body = (
+            "    a, b = 0, 1\n"
+            "    for _ in range(n):\n"
+            f"        a, b = b, (a + b) % {m}\n"
+            "    return a\n"
+        )
+        doc = f"returns the n-th Fibonacci number (fib(0) == 0) modulo {m}"
+        inputs, diff, tags = [(rng.randint(0, 40),) for _ in range(4)], 0.8, ["loop", "sequence"]
+    else:
+        base = rng.randint(2, 9)
+        name, args = f"digit_sum_base{base}", "n"
+        body = (
+            "    if n < 0:\n"
+            "        raise ValueError('n must be >= 0')\n"
+            "    s = 0\n"
+            "    while n:\n"
+            f"        s += n % {base}\n"
+            f"        n //= {base}\n"
+            "    return s\n"
+        )
+        doc = f"returns the sum of the base-{base} digits of n (n >= 0)"
+        inputs, diff, tags = [(rng.randint(0, 10_000),) for _ in range(4)], 0.9, ["loop", "number"]
+    code = f"def {name}({args}):\n{body}"
+    ns: Dict[str, Any] = {"__builtins__": {"range": range, "len": len, "ValueError": ValueError}}
+    exec(code, ns)
+    return {
+        "id": name,
+        "name": name,
+        "prompt": f"Write a function {name}({args}) that {doc}.",
+        "tests": [[list(a), ns[name](*a)] for a in inputs],
+        "difficulty": round(min(1.0, max(0.0, diff + rng.uniform(-0.05, 0.05))), 3),
+        "tags": tags,
+        "solution": code,
+    }
+
+def synthesize(
+    n: int,
+    *,
+    seed: int = 0,
+    extra: Sequence[Dict[str, Any]] = (),
+) -> List[Dict[str, Any]]:
+    """Up to ``n`` distinct synthetic specs (plus ``extra``), deterministic for a seed."""
+    rng = random.Random(seed)
+    specs: Dict[str, Dict[str, Any]] = {s["id"]: s for s in extra}
+    attempts = 0
+    while len(specs) < n and attempts < n * 20:
+        attempts += 1
+        spec = _family_specs(rng)
+        specs.setdefault(spec["id"], spec)
+    return list(specs.values())
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import Any, Callable, List, Literal, Optional, Sequence, TypeVar
+
+# --- Ordered, bounded fan-out used by the Trainer to solve/verify a batch concurrently.
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+ExecutorKind = Literal["serial", "thread", "process", "asyncio"]
+EXECUTORS: tuple[str, ...] = ("serial", "thread", "process", "asyncio")
+
+# Process workers receive the callable once (via the pool initializer) instead of per task.
+_WORKER_FN: Optional[Callable[[Any], Any]] = None
+
+def _init_worker(fn: Callable[[Any], Any]) -> None:
+    global _WORKER_FN
+    _WORKER_FN = fn
+
+def _call_worker(item: Any) -> Any:
+    assert _WORKER_FN is not None, "worker not initialised"
+    return _WORKER_FN(item)
+
+def _bounded(pool: Executor, fn: Callable[[Any], R], items: Sequence[Any], limit: int) -> List[R]:
+    results: List[Any] = [None] * len(items)
+    pending: dict[Future[R], int] = {}
+    nxt = 0
+    while nxt < len(items) or pending:
+        while nxt < len(items) and len(pending) < limit:
+            pending[pool.submit(fn, items[nxt])] = nxt
+            nxt += 1
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for fut in done:
+            results[pending.pop(fut)] = fut.result()
+    return results
+
+async def _gather_bounded(fn: Callable[[Any], R], items: Sequence[Any], limit: int) -> List[R]:
+    sem = asyncio.Semaphore(limit)
+
+    async def _one(item: Any) -> R:
+        async with sem:
+            return await asyncio.to_thread(fn, item)
+
+    return list(await asyncio.gather(*(_one(i) for i in items)))
+
+def map_ordered(
+    fn: Callable[[T], R],
+    items: Sequence[T],
+    *,
+    executor: str = "serial",
+    workers: int = 1,
+    max_in_flight: Optional[int] = None,
+) -> List[R]:
+    """Apply fn to every item, returning results in input order.
+
+    At most ``max_in_flight`` items (default ``2 * workers``) are submitted at once.
+    For ``process``, fn and everything it closes over must be picklable; it is shipped to
+    each worker once when the pool starts.
+    """
+    if executor not in EXECUTORS:
+        raise ValueError(f"unknown executor {executor!r}; expected one of {EXECUTORS}")
+    if executor == "serial" or workers <= 1 or len(items) <= 1:
+        return [fn(i) for i in items]
+    limit = max(1, max_in_flight or 2 * workers)
+    if executor == "thread":
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return _bounded(pool, fn, items, limit)
+    if executor == "process":
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(fn,)
+        ) as ppool:
+            return _bounded(ppool, _call_worker, items, limit)
+    return asyncio.run(_gather_bounded(fn, items, min(limit, workers)))
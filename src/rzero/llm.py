@@ -1,8 +1,257 @@
 from __future__ import annotations
 
-# placeholder for an LLM client wrapper.
-# Can implement OpenAI / Azure / etc. here later 
+import http.client
+import json
+import os
+import queue
+import random
+import re
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List, Mapping, Optional
+from urllib.parse import urlsplit
+
+# --- Shared OpenAI-compatible chat client (stdlib only).
+# One LLM instance is meant to be shared by every solver in a process: it owns the HTTP
+# keep-alive connections, the adaptive concurrency limit and the optional request-rate bucket.
+# `llm.chat.completions.create(**kwargs)` mirrors the openai SDK, so it can be passed as the
+# `client=` of CodeIOLLMSolver.
+
+_RETRY_STATUS = {408, 409, 429, 500, 502, 503, 504}
+_DURATION = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+
+class LLMError(RuntimeError):
+    def __init__(self, message: str, status: Optional[int] = None) -> None:
+        super().__init__(message)
+        self.status = status
+
+def _parse_duration(text: Optional[str]) -> Optional[float]:
+    """Parse '1.5', '20ms', '1m30s' style durations (Retry-After / x-ratelimit-reset-*)."""
+    if not text:
+        return None
+    text = text.strip()
+    try:
+        return float(text)
+    except ValueError:
+        pass
+    scale = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+    parts = _DURATION.findall(text)
+    return sum(float(v) * scale[u] for v, u in parts) if parts else None
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit: +1 per limit-many successes, halved on a rate-limit response."""
+
+    def __init__(self, initial: int, *, minimum: int = 1, maximum: int = 64) -> None:
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(self.maximum, max(self.minimum, initial)))
+        self.in_flight = 0
+        self._paused_until = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        with self._cond:
+            while True:
+                wait = self._paused_until - time.monotonic()
+                if wait <= 0 and self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    return
+                self._cond.wait(timeout=wait if wait > 0 else None)
+
+    def release(self) -> None:
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify()
+
+    def on_success(self) -> None:
+        with self._cond:
+            self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+            self._cond.notify_all()
+
+    def on_throttle(self, pause_s: float = 0.0) -> None:
+        with self._cond:
+            self.limit = max(self.minimum, self.limit / 2.0)
+            if pause_s > 0:
+                self._paused_until = max(self._paused_until, time.monotonic() + pause_s)
+
+    def observe(self, headers: Mapping[str, str]) -> None:
+        """Use x-ratelimit-* headers: pause until reset when the request budget is spent."""
+        remaining = headers.get("x-ratelimit-remaining-requests")
+        if remaining is None:
+            return
+        try:
+            left = int(remaining)
+        except ValueError:
+            return
+        with self._cond:
+            if left <= 0:
+                reset = _parse_duration(headers.get("x-ratelimit-reset-requests")) or 1.0
+                self._paused_until = max(self._paused_until, time.monotonic() + reset)
+            elif left < self.limit:
+                self.limit = max(self.minimum, float(left))
+
+class TokenBucket:
+    """Classic token bucket: ``rate`` requests/second with bursts up to ``burst``."""
+
+    def __init__(self, rate: float, burst: Optional[float] = None) -> None:
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return
+                wait = (1.0 - self.tokens) / self.rate
+            time.sleep(wait)
+
+class _ConnectionPool:
+    def __init__(self, url: str, size: int, timeout_s: float) -> None:
+        parts = urlsplit(url)
+        self.scheme = parts.scheme
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port
+        self.prefix = parts.path.rstrip("/")
+        self.timeout_s = timeout_s
+        self._idle: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue(maxsize=size)
+        self.created = 0
+
+    def get(self) -> http.client.HTTPConnection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            self.created += 1
+            if self.scheme == "https":
+                return http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout_s)
+            return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout_s)
+
+    def put(self, conn: http.client.HTTPConnection) -> None:
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+def _to_namespace(obj: Any) -> Any:
+    if isinstance(obj, dict):
+        return SimpleNamespace(**{k: _to_namespace(v) for k, v in obj.items()})
+    if isinstance(obj, list):
+        return [_to_namespace(v) for v in obj]
+    return obj
+
 class LLM:
-    def __init__(self, **kwargs): ...
-    def complete(self, prompt: str) -> str:
-        raise NotImplementedError("LLM not wired; this project runs fully without it.")
\ No newline at end of file
+    """Thread-safe, retrying, connection-pooled client for OpenAI-compatible chat APIs."""
+
+    def __init__(
+        self,
+        *,
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        timeout_s: float = 60.0,
+        max_retries: int = 5,
+        concurrency: int = 8,
+        max_concurrency: int = 64,
+        requests_per_s: Optional[float] = None,
+        backoff_base_s: float = 0.5,
+        backoff_max_s: float = 30.0,
+    ) -> None:
+        self.base_url = base_url or os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
+        self.api_key = api_key if api_key is not None else os.getenv("OPENAI_API_KEY", "")
+        self.max_retries = max(0, max_retries)
+        self.backoff_base_s = backoff_base_s
+        self.backoff_max_s = backoff_max_s
+        self.limiter = AdaptiveLimiter(concurrency, maximum=max_concurrency)
+        self.bucket = TokenBucket(requests_per_s) if requests_per_s else None
+        self.pool = _ConnectionPool(self.base_url, max_concurrency, timeout_s)
+        self.stats: Dict[str, int] = {"requests": 0, "retries": 0, "throttled": 0, "errors": 0}
+        self._stats_lock = threading.Lock()
+        # openai-SDK-shaped entry point: llm.chat.completions.create(**kwargs)
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _count(self, key: str) -> None:
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        if retry_after is not None:
+            return min(self.backoff_max_s, retry_after)
+        cap = min(self.backoff_max_s, self.backoff_base_s * 2 ** attempt)
+        return random.uniform(0, cap)  # full jitter
+
+    def _send(self, path: str, body: bytes) -> tuple[int, Dict[str, str], bytes]:
+        conn = self.pool.get()
+        headers = {"Content-Type": "application/json", "Connection": "keep-alive"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        try:
+            conn.request("POST", self.pool.prefix + path, body=body, headers=headers)
+            resp = conn.getresponse()
+            data = resp.read()
+            resp_headers = {k.lower(): v for k, v in resp.getheaders()}
+        except Exception:
+            conn.close()
+            raise
+        if resp_headers.get("connection", "").lower() == "close":
+            conn.close()
+        else:
+            self.pool.put(conn)
+        return resp.status, resp_headers, data
+
+    def post(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """POST JSON with rate limiting and retries; returns the decoded JSON body."""
+        body = json.dumps(payload).encode("utf-8")
+        last: Optional[Exception] = None
+        for attempt in range(self.max_retries + 1):
+            if self.bucket is not None:
+                self.bucket.take()
+            self.limiter.acquire()
+            retry_after: Optional[float] = None
+            try:
+                self._count("requests")
+                status, headers, data = self._send(path, body)
+                self.limiter.observe(headers)
+                if status < 300:
+                    self.limiter.on_success()
+                    return json.loads(data)
+                retry_after = _parse_duration(headers.get("retry-after"))
+                last = LLMError(f"HTTP {status}: {data[:500].decode('utf-8', 'replace')}", status)
+                if status == 429:
+                    self._count("throttled")
+                    self.limiter.on_throttle(retry_after or 0.0)
+                if status not in _RETRY_STATUS:
+                    break
+            except (OSError, http.client.HTTPException) as e:  # timeouts, resets, refused
+                last = LLMError(f"connection error: {e}")
+            finally:
+                self.limiter.release()
+            if attempt < self.max_retries:
+                self._count("retries")
+                time.sleep(self._backoff(attempt, retry_after))
+        self._count("errors")
+        assert last is not None
+        raise last
+
+    def _create(self, **kwargs: Any) -> Any:
+        return _to_namespace(self.post("/chat/completions", kwargs))
+
+    def complete(self, prompt: str, *, model: str = "gpt-5-mini", **kwargs: Any) -> str:
+        messages: List[Dict[str, str]] = [{"role": "user", "content": prompt}]
+        resp = self.post("/chat/completions", {"model": model, "messages": messages, **kwargs})
+        return resp["choices"][0]["message"]["content"] or ""
+
+    def close(self) -> None:
+        self.pool.close()
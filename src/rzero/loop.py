@@ -1,13 +1,28 @@
 from __future__ import annotations
 
+import asyncio
+import time
 from dataclasses import dataclass, field
-from typing import List
+from functools import partial
+from typing import Any, List, Optional
 
-from .types import Sample
+from .types import Sample, Task
 from .challenger import Challenger
 from .solver import Solver
 from .verifier import Verifier
 from .curriculum import Curriculum
+from .adaptive import AdaptiveBatch
+from .execution import map_ordered
+from .storage import Sink
+from .metrics import Metrics, span
+from .records import SampleRecord, as_models
+from .checkpoint import ProposalState, TrainerCheckpoint
+from .plugins import ExecutionPlan, plan_execution
+
+def _solve_verify(solver: Solver, verifier: Verifier, task: Task) -> Sample:
+    sol = solver.solve(task)
+    ver = verifier.verify(task, sol)
+    return Sample(task=task, solution=sol, verification=ver)
 
 @dataclass
 class Trainer:
@@ -16,46 +31,214 @@ class Trainer:
     verifier: Verifier
     curriculum: Curriculum = field(default_factory=Curriculum)
     difficulty: float = 0.5
+    # Execution mode for solve+verify within an episode: serial | thread | process | asyncio,
+    # or "auto" to pick from the components' capabilities when run() starts (rzero.plugins).
+    # "process" ships a snapshot of solver/verifier to each worker per episode.
+    executor: str = "serial"
+    workers: int = 1
+    max_in_flight: Optional[int] = None
+    # Optional streaming output: each episode is handed to sink.write() as soon as it finishes.
+    # With keep_samples=False, run() returns an empty list and memory stays flat on long runs.
+    sink: Optional[Sink] = None
+    keep_samples: bool = True
+    episode: int = 0
+    # Optional per-stage timings and counters (rzero.metrics); None keeps the hooks free.
+    metrics: Optional[Metrics] = None
+    # Periodic checkpoints (rzero.checkpoint) every ``checkpoint_every`` episodes and at the end.
+    checkpoint: Optional[str] = None
+    checkpoint_every: int = 1
+    # Serial fast path on slotted records (rzero.records) via the *_records hooks; samples are
+    # converted to pydantic only where they leave the loop (run()'s result, Solver.update).
+    records: bool = False
+    # Optional latency-driven episode sizing, run budgets and early stopping (rzero.adaptive);
+    # run()'s ``episodes`` is then an upper bound and ``batch_size`` the first episode's size.
+    adaptive: Optional[AdaptiveBatch] = None
 
-    def run_episode(self, batch_size: int) -> tuple[list[Sample], float]:
-        tasks = self.challenger.propose_batch(batch_size, difficulty=self.difficulty)
-        samples: list[Sample] = []
-        correct = 0
-        for t in tasks:
-            sol = self.solver.solve(t)
-            ver = self.verifier.verify(t, sol)
-            samples.append(Sample(task=t, solution=sol, verification=ver))
-            if ver.passed:
-                correct += 1
-        accuracy = correct / max(1, len(tasks))
-        self.difficulty = self.curriculum.adjust(self.difficulty, accuracy)
+    def run_episode(self, batch_size: int) -> tuple[list[Any], float]:
+        m = self.metrics
+        serial = self.executor == "serial" or self.workers <= 1
+        if self.records and serial:
+            with span(m, "propose"):
+                rtasks = self.challenger.propose_records(batch_size, difficulty=self.difficulty)
+            with span(m, "solve"):
+                rsols = self.solver.solve_records(rtasks)
+            with span(m, "verify"):
+                rvers = self.verifier.verify_records(rtasks, rsols)
+            records = [SampleRecord(t, s, v) for t, s, v in zip(rtasks, rsols, rvers)]
+            return self._finish_episode(records, len(rtasks))
+        with span(m, "propose"):
+            tasks = self.challenger.propose_batch(batch_size, difficulty=self.difficulty)
+        samples: list[Sample]
+        if serial:
+            # Whole-batch hooks let vectorised solvers/verifiers amortise per-task overhead.
+            with span(m, "solve"):
+                sols = self.solver.solve_batch(tasks)
+            with span(m, "verify"):
+                vers = self.verifier.verify_batch(tasks, sols)
+            samples = [
+                Sample(task=t, solution=s, verification=v) for t, s, v in zip(tasks, sols, vers)
+            ]
+        else:
+            # solve and verify interleave per task here, so they are timed as one stage
+            with span(m, "solve_verify"):
+                samples = map_ordered(
+                    partial(_solve_verify, self.solver, self.verifier),
+                    tasks,
+                    executor=self.executor,
+                    workers=self.workers,
+                    max_in_flight=self.max_in_flight,
+                )
+        return self._finish_episode(samples, len(tasks))
+
+    def _finish_episode(self, samples: list[Any], n_tasks: int) -> tuple[list[Any], float]:
+        if self.metrics is not None:
+            self.metrics.count_samples(samples)
+        correct = sum(1 for s in samples if s.verification.passed)
+        accuracy = correct / max(1, n_tasks)
+        self.difficulty = self.curriculum.observe(self.difficulty, correct, n_tasks)
         return samples, accuracy
 
+    def update_components(self, ep_samples: list[Sample], accuracy: float) -> None:
+        """Apply the per-episode solver and challenger training hooks."""
+        # --- Solver update: per-sample reward is verification.score
+        try:
+            if not self.records:
+                self.solver.update(ep_samples)  # trainable solvers learn here
+            elif type(self.solver).update is not Solver.update:  # only convert for real learners
+                self.solver.update(as_models(ep_samples))
+        except AttributeError:
+            pass
+
+        # --- Challenger reward: highest when accuracy near target band mid-point
+        target_mid = (self.curriculum.target_low + self.curriculum.target_high) / 2.0
+        # Simple shaped reward in [0, 1]: 1 at target_mid, tapering off to 0 at band edges or beyond
+        width = max(1e-6, (self.curriculum.target_high - self.curriculum.target_low) / 2.0)
+        chall_reward = max(0.0, 1.0 - abs(accuracy - target_mid) / width)
+
+        try:
+            self.challenger.update({
+                "difficulty": self.difficulty,
+                "accuracy": accuracy,
+                "reward": chall_reward,
+            })  # trainable challengers learn here
+        except AttributeError:
+            pass
+
+    def record(self, ep_samples: list[Sample], log: list[Sample]) -> None:
+        if self.sink is not None:
+            with span(self.metrics, "storage"):
+                self.sink.write(ep_samples, episode=self.episode)
+        if self.keep_samples:
+            log.extend(as_models(ep_samples) if self.records else ep_samples)
+
+    def next_batch_size(self, batch_size: int, in_flight: int = 0) -> int:
+        if self.adaptive is None:
+            return batch_size
+        return self.adaptive.next_size(batch_size, in_flight)
+
+    # Episode-boundary bookkeeping shared by every run loop (run, run_async, PipelinedTrainer.run):
+    # adaptive sizing statistics, the episode counter and periodic/final checkpoints.
+    def _end_episode(self, n: int, seconds: float) -> None:
+        if self.adaptive is not None:
+            self.adaptive.observe(n, seconds, self.curriculum.converged(self.difficulty))
+        self.episode += 1
+        if self.checkpoint is not None and self.episode % max(1, self.checkpoint_every) == 0:
+            self.save_checkpoint(self.checkpoint)
+
+    def _end_run(self, ran: int) -> None:
+        if self.checkpoint is not None and ran and self.episode % max(1, self.checkpoint_every):
+            self.save_checkpoint(self.checkpoint)
+
+    def plan_execution(self) -> Optional[ExecutionPlan]:
+        """Resolve executor="auto" (and enable records where all components support them)."""
+        if self.executor != "auto":
+            return None
+        plan = plan_execution(self.challenger, self.solver, self.verifier, workers=self.workers)
+        self.executor = plan.executor
+        self.records = self.records or plan.records
+        return plan
+
     def run(self, episodes: int, batch_size: int) -> list[Sample]:
+        self.plan_execution()
         log: list[Sample] = []
+        ran = 0
         for _ in range(episodes):
-            ep_samples, accuracy = self.run_episode(batch_size)
-            log.extend(ep_samples)
-
-            # --- Solver update: per-sample reward is verification.score
-            try:
-                self.solver.update(ep_samples)  # trainable solvers learn here
-            except AttributeError:
-                pass
-
-            # --- Challenger reward: highest when accuracy near target band mid-point
-            target_mid = (self.curriculum.target_low + self.curriculum.target_high) / 2.0
-            # Simple shaped reward in [0, 1]: 1 at target_mid, tapering off to 0 at band edges or beyond
-            width = max(1e-6, (self.curriculum.target_high - self.curriculum.target_low) / 2.0)
-            chall_reward = max(0.0, 1.0 - abs(accuracy - target_mid) / width)
-
-            try:
-                self.challenger.update({
-                    "difficulty": self.difficulty,
-                    "accuracy": accuracy,
-                    "reward": chall_reward,
-                })  # trainable challengers learn here
-            except AttributeError:
-                pass
+            n = self.next_batch_size(batch_size)
+            if n == 0:
+                break
+            t0 = time.perf_counter()
+            with span(self.metrics, "episode"):
+                ep_samples, accuracy = self.run_episode(n)
+                self.record(ep_samples, log)
+                with span(self.metrics, "update"):
+                    self.update_components(ep_samples, accuracy)
+            self._end_episode(len(ep_samples), time.perf_counter() - t0)
+            ran += 1
+        self._end_run(ran)
         return log
 
+    def save_checkpoint(self, path: str) -> None:
+        with span(self.metrics, "checkpoint"):
+            TrainerCheckpoint.capture(self, path, self._proposal_state()).save(path)
+
+    def _proposal_state(self) -> Optional[ProposalState]:
+        """RNG/challenger state for the episode being checkpointed; None means "current"."""
+        return None
+
+    def resume(self, path: str) -> TrainerCheckpoint:
+        """Restore state saved by save_checkpoint; call before attaching an appending sink."""
+        ckpt = TrainerCheckpoint.load(path)
+        ckpt.restore(self)
+        return ckpt
+
+@dataclass
+class AsyncTrainer(Trainer):
+    """Trainer that drives solve_async/verify_async on one event loop.
+
+    Each task flows propose -> solve -> verify independently, so verification of early
+    tasks overlaps with solving of later ones. The semaphores bound in-flight calls per stage.
+    """
+    solve_concurrency: int = 64
+    verify_concurrency: int = 16
+
+    async def run_episode_async(self, batch_size: int) -> tuple[list[Sample], float]:
+        with span(self.metrics, "propose"):
+            tasks = await asyncio.to_thread(
+                self.challenger.propose_batch, batch_size, difficulty=self.difficulty
+            )
+        solve_sem = asyncio.Semaphore(max(1, self.solve_concurrency))
+        verify_sem = asyncio.Semaphore(max(1, self.verify_concurrency))
+
+        async def _one(task: Task) -> Sample:
+            async with solve_sem:
+                sol = await self.solver.solve_async(task)
+            async with verify_sem:
+                ver = await self.verifier.verify_async(task, sol)
+            return Sample(task=task, solution=sol, verification=ver)
+
+        with span(self.metrics, "solve_verify"):
+            samples = list(await asyncio.gather(*(_one(t) for t in tasks)))
+        if self.metrics is not None:
+            self.metrics.count_samples(samples)
+        correct = sum(1 for s in samples if s.verification.passed)
+        accuracy = correct / max(1, len(tasks))
+        self.difficulty = self.curriculum.observe(self.difficulty, correct, len(tasks))
+        return samples, accuracy
+
+    async def run_async(self, episodes: int, batch_size: int) -> list[Sample]:
+        log: list[Sample] = []
+        ran = 0
+        for _ in range(episodes):
+            n = self.next_batch_size(batch_size)
+            if n == 0:
+                break
+            t0 = time.perf_counter()
+            with span(self.metrics, "episode"):
+                ep_samples, accuracy = await self.run_episode_async(n)
+                await asyncio.to_thread(self.record, ep_samples, log)
+                with span(self.metrics, "update"):
+                    await asyncio.to_thread(self.update_components, ep_samples, accuracy)
+            await asyncio.to_thread(self._end_episode, len(ep_samples), time.perf_counter() - t0)
+            ran += 1
+        await asyncio.to_thread(self._end_run, ran)
+        return log
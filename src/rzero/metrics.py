@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, ContextManager, Dict, Iterable, Iterator, Optional
+
+from .stats import Reservoir
+from .storage import atomic_write_text
+from .types import Sample
+
+# --- Training-loop metrics: per-stage wall-time histograms and event counters.
+# Trainer holds ``metrics: Optional[Metrics]``; when it is None every hook is a single
+# attribute check (spans return a shared nullcontext), so disabled metrics cost nothing
+# measurable per episode.
+
+STAGES = ("episode", "propose", "solve", "verify", "solve_verify", "update", "storage")
+COUNTERS = ("tasks", "passes", "errors", "cache_hits")
+
+_NULL_SPAN: ContextManager[None] = nullcontext()
+
+@dataclass
+class Histogram:
+    """Count/sum/min/max plus a reservoir for p50/p95/p99 (exact up to ``size`` values)."""
+    size: int = 10_000
+    count: int = 0
+    total: float = 0.0
+    min: float = float("inf")
+    max: float = 0.0
+    reservoir: Reservoir = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.reservoir = Reservoir(size=self.size)
+
+    def observe(self, v: float) -> None:
+        self.count += 1
+        self.total += v
+        self.min = min(self.min, v)
+        self.max = max(self.max, v)
+        self.reservoir.add(v)
+
+    def summary(self) -> Dict[str, Any]:
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.total / self.count,
+            "min": self.min,
+            "max": self.max,
+            **self.reservoir.percentiles(),
+        }
+
+class Metrics:
+    """Thread-safe registry of stage timings (seconds) and counters."""
+
+    def __init__(self, reservoir_size: int = 10_000) -> None:
+        self.reservoir_size = reservoir_size
+        self.histograms: Dict[str, Histogram] = {}
+        self.counters: Dict[str, int] = {name: 0 for name in COUNTERS}
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            h = self.histograms.get(stage)
+            if h is None:
+                h = self.histograms[stage] = Histogram(size=self.reservoir_size)
+            h.observe(seconds)
+
+    def inc(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    @contextmanager
+    def span(self, stage: str) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - t0)
+
+    def count_samples(self, samples: Iterable[Sample]) -> None:
+        """Bump tasks/passes/errors/cache_hits from one episode's samples."""
+        tasks = passes = errors = hits = 0
+        for s in samples:
+            tasks += 1
+            if s.verification.passed:
+                passes += 1
+            if s.solution.meta.get("error"):
+                errors += 1
+            if s.solution.meta.get("cache") in ("hit", "coalesced"):
+                hits += 1
+            if s.verification.meta.get("cache") == "hit":
+                hits += 1
+        with self._lock:
+            self.counters["tasks"] += tasks
+            self.counters["passes"] += passes
+            self.counters["errors"] += errors
+            self.counters["cache_hits"] += hits
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "stages": {k: h.summary() for k, h in self.histograms.items()},
+                "counters": dict(self.counters),
+            }
+
+    def to_prometheus(self, prefix: str = "rzero") -> str:
+        """Prometheus text exposition: stage timings as summaries, counters as *_total."""
+        s = self.summary()
+        lines = [
+            f"# HELP {prefix}_stage_seconds Wall time per training-loop stage.",
+            f"# TYPE {prefix}_stage_seconds summary",
+        ]
+        for stage, h in s["stages"].items():
+            for q in (50, 95, 99):
+                v = h.get(f"p{q}")
+                if v is not None:
+                    labels = f'stage="{stage}",quantile="{q / 100:g}"'
+                    lines.append(f"{prefix}_stage_seconds{{{labels}}} {v:.9g}")
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{stage}"}} {h.get("sum", 0.0):.9g}')
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{stage}"}} {h["count"]}')
+        for name, v in s["counters"].items():
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            lines.append(f"{prefix}_{name}_total {v}")
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, path: str | Path) -> Path:
+        return atomic_write_text(path, json.dumps(self.summary(), indent=2))
+
+    def write_prometheus(self, path: str | Path) -> Path:
+        return atomic_write_text(path, self.to_prometheus())
+
+def span(metrics: Optional[Metrics], stage: str) -> ContextManager[None]:
+    """``with span(self.metrics, "solve"):`` -- a no-op when metrics is None."""
+    return _NULL_SPAN if metrics is None else metrics.span(stage)
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import chain, zip_longest
+from typing import Any, Dict, List, Optional, Sequence
+
+from .loop import Trainer
+from .metrics import Metrics, span
+from .records import as_models
+from .storage import Sink
+from .types import Sample
+
+# --- Several domains in one run.
+# Each domain keeps its own Trainer (challenger, solver, verifier, curriculum, difficulty,
+# executor), so curricula move independently. Per episode a Scheduler splits the batch
+# between domains, every domain's share runs through its own Trainer.run_episode on a
+# separate thread, and the samples are interleaved round-robin into one mixed episode.
+# Scheduler policies:
+#   uniform     equal shares
+#   throughput  shares proportional to observed tasks/s (more samples per wall second)
+#   learning    shares proportional to the learning signal: recent |change in accuracy|
+#               plus acc * (1 - acc), which peaks where the solver is half right
+# ``weight`` scales a domain's share and ``min_tasks`` keeps every domain sampled.
+
+POLICIES = ("uniform", "throughput", "learning")
+
+@dataclass
+class DomainSlot:
+    name: str
+    trainer: Trainer
+    weight: float = 1.0
+    # running statistics (exponential moving averages, updated after every episode)
+    tasks_per_s: Optional[float] = None
+    accuracy: Optional[float] = None
+    progress: float = 0.0
+    tasks: int = 0
+
+    def observe(self, n: int, seconds: float, accuracy: float, alpha: float) -> None:
+        if n == 0:
+            return
+        rate = n / max(seconds, 1e-9)
+        if self.tasks_per_s is None:
+            self.tasks_per_s = rate
+        else:
+            self.tasks_per_s += alpha * (rate - self.tasks_per_s)
+        if self.accuracy is None:
+            self.accuracy = accuracy
+        else:
+            self.progress = (1 - alpha) * self.progress + alpha * abs(accuracy - self.accuracy)
+            self.accuracy += alpha * (accuracy - self.accuracy)
+        self.tasks += n
+
+@dataclass
+class Scheduler:
+    policy: str = "uniform"
+    min_tasks: int = 1
+    alpha: float = 0.3  # EMA smoothing for the statistics policies read
+
+    def __post_init__(self) -> None:
+        if self.policy not in POLICIES:
+            raise ValueError(f"unknown policy {self.policy!r}; expected one of {POLICIES}")
+
+    def score(self, slot: DomainSlot) -> float:
+        if self.policy == "throughput" and slot.tasks_per_s is not None:
+            return slot.tasks_per_s
+        if self.policy == "learning" and slot.accuracy is not None:
+            return slot.progress + slot.accuracy * (1.0 - slot.accuracy) + 1e-3
+        return 1.0  # uniform, or no observation yet
+
+    def allocate(self, slots: Sequence[DomainSlot], batch_size: int) -> List[int]:
+        """Tasks per slot summing to ``batch_size`` (largest-remainder apportionment)."""
+        if not slots:
+            return []
+        floor = min(self.min_tasks, batch_size // len(slots))
+        counts = [floor] * len(slots)
+        rest = batch_size - floor * len(slots)
+        scores = [max(0.0, s.weight) * self.score(s) for s in slots]
+        total = sum(scores)
+        if total > 0:
+            quotas = [rest * sc / total for sc in scores]
+        else:
+            quotas = [rest / len(slots)] * len(slots)
+        for i, q in enumerate(quotas):
+            counts[i] += math.floor(q)
+        leftover = batch_size - sum(counts)
+        by_remainder = sorted(
+            range(len(slots)), key=lambda i: quotas[i] - math.floor(quotas[i]), reverse=True
+        )
+        for i in by_remainder[:leftover]:
+            counts[i] += 1
+        return counts
+
+@dataclass
+class MultiDomainTrainer:
+    slots: List[DomainSlot]
+    scheduler: Scheduler = field(default_factory=Scheduler)
+    # run domains' shares on their own threads; off = one after another (deterministic order)
+    concurrent: bool = True
+    sink: Optional[Sink] = None
+    keep_samples: bool = True
+    metrics: Optional[Metrics] = None
+    episode: int = 0
+    last_allocation: Dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def from_plugins(cls, names: Sequence[str], **kw: Any) -> "MultiDomainTrainer":
+        """Default-constructed components of registered domains (rzero.plugins)."""
+        from . import plugins
+
+        shared = ("difficulty", "executor", "workers", "records")
+        trainer_kw = {k: kw.pop(k) for k in shared if k in kw}
+        slots = []
+        for name in names:
+            challenger, solver, verifier = plugins.get(name).create()
+            trainer = Trainer(challenger, solver, verifier, keep_samples=False, **trainer_kw)
+            slots.append(DomainSlot(name, trainer))
+        return cls(slots, **kw)
+
+    @property
+    def difficulties(self) -> Dict[str, float]:
+        return {s.name: s.trainer.difficulty for s in self.slots}
+
+    def _run_slot(self, slot: DomainSlot, n: int) -> tuple[list[Any], float, float]:
+        if n == 0:
+            return [], 0.0, 0.0
+        t0 = time.perf_counter()
+        samples, accuracy = slot.trainer.run_episode(n)
+        return samples, accuracy, time.perf_counter() - t0
+
+    def run_episode(self, batch_size: int) -> tuple[list[Any], float]:
+        counts = self.scheduler.allocate(self.slots, batch_size)
+        self.last_allocation = {s.name: n for s, n in zip(self.slots, counts)}
+        with span(self.metrics, "solve_verify"):
+            if self.concurrent and len(self.slots) > 1:
+                with ThreadPoolExecutor(
+                    max_workers=len(self.slots), thread_name_prefix="rzero-domain"
+                ) as pool:
+                    results = list(pool.map(self._run_slot, self.slots, counts))
+            else:
+                results = [self._run_slot(s, n) for s, n in zip(self.slots, counts)]
+        for slot, n, (samples, accuracy, seconds) in zip(self.slots, counts, results):
+            slot.observe(n, seconds, accuracy, self.scheduler.alpha)
+            if n:
+                with span(self.metrics, "update"):
+                    slot.trainer.update_components(samples, accuracy)
+        # one mixed episode: domains interleaved round-robin. Slots choose records or pydantic
+        # samples for themselves; sinks encode a batch as one kind, so mixed kinds become models.
+        batches = [r[0] for r in results]
+        if len({type(b[0]) for b in batches if b}) > 1:
+            batches = [as_models(b) for b in batches]
+        sentinel = object()
+        rounds = chain.from_iterable(zip_longest(*batches, fillvalue=sentinel))
+        mixed = [s for s in rounds if s is not sentinel]
+        if self.metrics is not None:
+            self.metrics.count_samples(mixed)
+        correct = sum(1 for s in mixed if s.verification.passed)
+        return mixed, correct / max(1, len(mixed))
+
+    def run(self, episodes: int, batch_size: int) -> list[Sample]:
+        for slot in self.slots:
+            slot.trainer.plan_execution()
+        log: list[Sample] = []
+        for _ in range(episodes):
+            with span(self.metrics, "episode"):
+                samples, _ = self.run_episode(batch_size)
+                if self.sink is not None:
+                    with span(self.metrics, "storage"):
+                        self.sink.write(samples, episode=self.episode)
+                if self.keep_samples:
+                    log.extend(as_models(samples))
+            self.episode += 1
+            for slot in self.slots:
+                slot.trainer.episode = self.episode
+        return log
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            s.name: {
+                "difficulty": s.trainer.difficulty,
+                "tasks": s.tasks,
+                "tasks_per_s": round(s.tasks_per_s or 0.0, 1),
+                "accuracy": round(s.accuracy or 0.0, 3),
+                "share": self.last_allocation.get(s.name, 0),
+            }
+            for s in self.slots
+        }
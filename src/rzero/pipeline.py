@@ -0,0 +1,312 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional
+
+from .checkpoint import ProposalState
+from .execution import map_ordered
+from .loop import Trainer
+from .records import SampleRecord
+from .types import Sample, Solution, Task, Verification
+
+# --- Pipelined training loop. Stages run in their own threads and hand work over through
+# bounded queues:
+#
+#   propose --(episodes)--> solve --(chunks)--> verify --(episodes)--> update (caller thread)
+#
+# so the challenger generates episode N+1 while episode N is solved, and each chunk is
+# verified as soon as it is solved. Queue sizes bound memory; ``max_staleness`` bounds how
+# many finished episodes may still be waiting for their solver/challenger update when the
+# solver starts on a new one.
+
+_DONE = object()
+
+@dataclass
+class StageStats:
+    busy_s: float = 0.0
+    items: int = 0
+
+    def utilization(self, wall_s: float) -> float:
+        return self.busy_s / wall_s if wall_s > 0 else 0.0
+
+@dataclass
+class PipelineStats:
+    wall_s: float = 0.0
+    stages: Dict[str, StageStats] = field(
+        default_factory=lambda: {
+            name: StageStats()
+            for name in ("propose", "solve", "verify", "storage", "update", "checkpoint")
+        }
+    )
+
+    def summary(self) -> Dict[str, Any]:
+        """Per-stage busy time and utilization; the busiest stage is the bottleneck."""
+        stages = {
+            name: {
+                "busy_s": round(s.busy_s, 4),
+                "items": s.items,
+                "utilization": round(s.utilization(self.wall_s), 4),
+            }
+            for name, s in self.stages.items()
+        }
+        bottleneck = None
+        if self.wall_s > 0:
+            bottleneck = max(stages, key=lambda n: stages[n]["utilization"])
+        return {"wall_s": round(self.wall_s, 4), "stages": stages, "bottleneck": bottleneck}
+
+class _Stopped(Exception):
+    pass
+
+@dataclass
+class PipelinedTrainer(Trainer):
+    """Trainer whose propose/solve/verify/update stages overlap.
+
+    ``prefetch`` episodes may be proposed ahead of the solver, ``chunk_size`` tasks move from
+    solve to verify at a time (default: the whole episode), and ``max_staleness`` is how many
+    completed episodes may still await their update when solving of the next one begins
+    (0 = the solver always sees every earlier update). Proposals therefore use a difficulty
+    and challenger state that lag by up to ``prefetch + max_staleness`` episodes.
+    Updates run under the same locks as solving/proposing, so components never see an
+    update land in the middle of a batch call. ``records=True`` uses the *_records hooks
+    where Trainer.run would (serial execution).
+
+    Checkpoints hold the RNG and challenger state as of the checkpointed episode's proposals,
+    not of the episodes proposed ahead of it, so a resumed run draws the tasks the
+    uninterrupted one would have drawn next. Resume is still not an exact replay: the
+    resumed run proposes them at the checkpoint's difficulty, where the uninterrupted run
+    used one that lagged by up to ``prefetch + max_staleness`` episodes.
+    """
+    prefetch: int = 1
+    chunk_size: Optional[int] = None
+    max_staleness: int = 1
+    stats: PipelineStats = field(default_factory=PipelineStats)
+
+    def __post_init__(self) -> None:
+        self._solver_lock = threading.Lock()
+        self._challenger_lock = threading.Lock()
+        self._applied = threading.Condition()
+        self._updated = 0  # episodes (relative to this run) whose update has been applied
+        self._last_applied = 0.0
+        self._in_flight = 0  # tasks proposed but not yet applied (adaptive budgets)
+        self._records = False  # set per run: records and batch-wise (serial) execution
+        self._start = 0  # self.episode when run() started
+        self._applying = -1  # run-relative index of the episode being applied
+        self._proposals: Dict[int, ProposalState] = {}  # by run-relative episode index
+        self._stop = threading.Event()
+        self._error: Optional[BaseException] = None
+
+    # -- plumbing
+    def _timed(
+        self,
+        stage: str,
+        fn: Callable[..., Any],
+        *args: Any,
+        items: int = 1,
+        observe: bool = True,
+    ) -> Any:
+        t0 = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            dt = time.perf_counter() - t0
+            s = self.stats.stages[stage]
+            s.busy_s += dt
+            s.items += items
+            if observe and self.metrics is not None:
+                self.metrics.observe(stage, dt)
+
+    def _put(self, q: "queue.Queue[Any]", item: Any) -> None:
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.05)
+                return
+            except queue.Full:
+                continue
+        raise _Stopped
+
+    def _get(self, q: "queue.Queue[Any]") -> Any:
+        while not self._stop.is_set():
+            try:
+                return q.get(timeout=0.05)
+            except queue.Empty:
+                continue
+        raise _Stopped
+
+    def _stage(self, body: Callable[[], None], out: "queue.Queue[Any]") -> Callable[[], None]:
+        def _run() -> None:
+            try:
+                body()
+            except _Stopped:
+                return
+            except BaseException as e:
+                self._error = e
+                self._stop.set()
+                return
+            try:
+                self._put(out, _DONE)
+            except _Stopped:
+                pass
+        return _run
+
+    def save_checkpoint(self, path: str) -> None:
+        # stage threads call the solver/challenger under these locks; save() must not interleave
+        with self._challenger_lock, self._solver_lock:
+            self._timed("checkpoint", super().save_checkpoint, path, observe=False)
+
+    def _proposal_state(self) -> Optional[ProposalState]:
+        return self._proposals.pop(self._applying, None)  # save_checkpoint holds the lock
+
+    def _snapshot(self, i: int) -> None:
+        """Keep RNG/challenger state after episode ``i``'s proposals; call under the lock."""
+        if self.checkpoint is not None and i >= 0 and i not in self._proposals:
+            path = f"{self.checkpoint}.challenger.ep{self._start + i + 1}"
+            self._proposals[i] = ProposalState.take(self.challenger, path)
+
+    # -- stage bodies
+    def _propose_loop(self, episodes: int, batch_size: int, out: "queue.Queue[Any]") -> None:
+        every = max(1, self.checkpoint_every)
+        for i in range(episodes):
+            # adaptive sizing sees latency up to the last update; proposed-but-unapplied tasks
+            # count against its budgets
+            with self._applied:
+                n = self.next_batch_size(batch_size, self._in_flight)
+                self._in_flight += n
+            if n == 0:
+                with self._challenger_lock:
+                    self._snapshot(i - 1)  # the run's last episode, checkpointed by _end_run
+                return
+            with self._challenger_lock:
+                c = self.challenger
+                hook = c.propose_records if self._records else c.propose_batch
+                propose = partial(hook, n, difficulty=self.difficulty)
+                tasks = self._timed("propose", propose, items=n)
+                if (self._start + i + 1) % every == 0 or i == episodes - 1:
+                    self._snapshot(i)
+            self._put(out, (i, tasks))
+
+    def _solve_chunk(self, tasks: List[Task]) -> List[Solution]:
+        if self._records:
+            return self.solver.solve_records(tasks)
+        if self.executor == "serial" or self.workers <= 1:
+            return self.solver.solve_batch(tasks)
+        return map_ordered(self.solver.solve, tasks, executor=self.executor, workers=self.workers,
+                           max_in_flight=self.max_in_flight)
+
+    def _verify_chunk(self, tasks: List[Task], sols: List[Solution]) -> List[Verification]:
+        if self._records:
+            return self.verifier.verify_records(tasks, sols)
+        if self.executor == "serial" or self.workers <= 1:
+            return self.verifier.verify_batch(tasks, sols)
+        pairs = list(zip(tasks, sols))
+        return map_ordered(partial(_verify_pair, self.verifier), pairs, executor=self.executor,
+                           workers=self.workers, max_in_flight=self.max_in_flight)
+
+    def _solve_loop(self, inp: "queue.Queue[Any]", out: "queue.Queue[Any]") -> None:
+        while True:
+            item = self._get(inp)
+            if item is _DONE:
+                return
+            i, tasks = item
+            with self._applied:
+                while self._updated < i - self.max_staleness and not self._stop.is_set():
+                    self._applied.wait(timeout=0.05)
+            size = self.chunk_size or max(1, len(tasks))
+            for lo in range(0, max(1, len(tasks)), size):  # an empty episode still flows through
+                chunk = tasks[lo:lo + size]
+                with self._solver_lock:
+                    sols = self._timed("solve", self._solve_chunk, chunk, items=len(chunk))
+                self._put(out, (i, len(tasks), chunk, sols))
+
+    def _verify_loop(self, inp: "queue.Queue[Any]", out: "queue.Queue[Any]") -> None:
+        pending: List[Any] = []
+        make = SampleRecord if self._records else Sample
+        while True:
+            item = self._get(inp)
+            if item is _DONE:
+                return
+            i, total, tasks, sols = item
+            vers = self._timed("verify", self._verify_chunk, tasks, sols, items=len(tasks))
+            pending.extend(
+                make(task=t, solution=s, verification=v) for t, s, v in zip(tasks, sols, vers)
+            )
+            if len(pending) >= total:
+                self._put(out, (i, pending))
+                pending = []
+
+    def _apply(self, ep_samples: List[Any], log: List[Sample]) -> None:
+        correct = sum(1 for s in ep_samples if s.verification.passed)
+        accuracy = correct / max(1, len(ep_samples))
+        self.difficulty = self.curriculum.observe(self.difficulty, correct, len(ep_samples))
+        if self.metrics is not None:
+            self.metrics.count_samples(ep_samples)
+        n = len(ep_samples)
+        self._timed("storage", self.record, ep_samples, log, items=n, observe=False)
+        with self._challenger_lock, self._solver_lock:
+            self._timed("update", self.update_components, ep_samples, accuracy, items=n)
+        now = time.perf_counter()
+        with self._applied:
+            self._in_flight -= n
+            # timed between finished episodes, which overlap in the pipeline; checkpoints are
+            # timed by save_checkpoint
+            self._end_episode(n, now - self._last_applied)
+        self._last_applied = now
+
+    def run(self, episodes: int, batch_size: int) -> list[Sample]:
+        self.plan_execution()
+        self._stop.clear()
+        self._error = None
+        self._updated = 0
+        self._in_flight = 0
+        self._records = self.records and (self.executor == "serial" or self.workers <= 1)
+        self._start = self.episode
+        self._applying = -1
+        proposed: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, self.prefetch))
+        solved: "queue.Queue[Any]" = queue.Queue(maxsize=2)
+        verified: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, self.max_staleness + 1))
+        stages = (
+            ("propose", partial(self._propose_loop, episodes, batch_size, proposed), proposed),
+            ("solve", partial(self._solve_loop, proposed, solved), solved),
+            ("verify", partial(self._verify_loop, solved, verified), verified),
+        )
+        threads = [
+            threading.Thread(target=self._stage(loop, out), name=f"rzero-{name}", daemon=True)
+            for name, loop, out in stages
+        ]
+        log: List[Sample] = []
+        t0 = self._last_applied = time.perf_counter()
+        for t in threads:
+            t.start()
+        try:
+            while True:
+                item = self._get(verified)
+                if item is _DONE:
+                    break
+                self._applying, ep_samples = item
+                self._apply(ep_samples, log)
+                with self._applied:
+                    self._updated += 1
+                    self._applied.notify_all()
+        except _Stopped:
+            pass
+        finally:
+            self._stop.set()
+            for t in threads:
+                t.join()
+            self.stats.wall_s += time.perf_counter() - t0
+        try:
+            if self._error is None:
+                self._end_run(self._updated)
+        finally:
+            for state in self._proposals.values():  # proposed ahead, never checkpointed
+                state.discard()
+            self._proposals.clear()
+        if self._error is not None:
+            raise self._error
+        return log
+
+def _verify_pair(verifier: Any, pair: tuple[Task, Solution]) -> Verification:
+    return verifier.verify(*pair)
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import importlib
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+# --- Domain plugins: named Challenger/Solver/Verifier triples, loaded on first use.
+# Built-ins live in rzero.domains. Other packages add domains through the "rzero.domains"
+# entry-point group, pointing at a DomainPlugin (or a callable returning one):
+#
+#   [project.entry-points."rzero.domains"]
+#   sudoku = "rzero_sudoku:PLUGIN"
+#
+# Listing names reads package metadata only; the plugin module is imported by get().
+# Components may declare Capabilities; Trainer(executor="auto") uses them (plan_execution)
+# to pick the fastest way to run a solver/verifier pair.
+
+ENTRY_POINT_GROUP = "rzero.domains"
+
+Factory = Union[str, Callable[[], Any]]  # "module:attr" or a class/zero-argument callable
+
+@dataclass(frozen=True)
+class Capabilities:
+    batched: bool = False       # the *_batch hook beats per-item calls
+    asynchronous: bool = False  # native *_async hook (not the default worker-thread fallback)
+    thread_safe: bool = False   # one instance may be called from several threads at once
+    process_safe: bool = False  # pickles, and copies behave the same in other processes
+    records: bool = False       # implements the Trainer(records=True) hooks natively
+
+# hook name -> capability it implies when a component overrides it
+_INFERRED = {
+    "propose_batch": "batched",  # a challenger's only API is a batch one
+    "solve_batch": "batched",
+    "verify_batch": "batched",
+    "solve_async": "asynchronous",
+    "verify_async": "asynchronous",
+    "propose_records": "records",
+    "solve_records": "records",
+    "verify_records": "records",
+}
+
+def capabilities_of(component: Any) -> Capabilities:
+    """Declared ``component.capabilities`` plus what its overridden hooks imply.
+
+    Works on instances and classes. Thread and process safety cannot be inferred; they are
+    False unless declared.
+    """
+    from .challenger import Challenger
+    from .solver import Solver
+    from .verifier import Verifier
+
+    cls = component if isinstance(component, type) else type(component)
+    declared = getattr(component, "capabilities", None) or Capabilities()
+    inferred: Dict[str, bool] = {}
+    for base in (Challenger, Solver, Verifier):
+        if issubclass(cls, base):
+            for hook, flag in _INFERRED.items():
+                if hasattr(base, hook) and getattr(cls, hook) is not getattr(base, hook):
+                    inferred[flag] = True
+    return replace(declared, **inferred)
+
+@dataclass(frozen=True)
+class ExecutionPlan:
+    executor: str  # one of rzero.execution.EXECUTORS
+    records: bool
+    reason: str
+
+def plan_execution(
+    challenger: Any,
+    solver: Any,
+    verifier: Any,
+    *,
+    workers: int = 1,
+) -> ExecutionPlan:
+    """Fastest execution path all components support, for ``workers`` concurrent workers.
+
+    1. whole-batch hooks on both sides (and no async backend to fan out to) -> serial batch calls
+    2. a native-async solver (an I/O-bound backend) with thread-safe parts -> threads
+    3. process-safe solver and verifier -> processes (real CPU parallelism)
+    4. thread-safe solver and verifier -> threads
+    5. otherwise serial
+    The records fast path is used when the plan is serial and all three implement it.
+    """
+    c, s, v = capabilities_of(challenger), capabilities_of(solver), capabilities_of(verifier)
+    executor, reason = "serial", "single worker"
+    if workers > 1:
+        if s.batched and v.batched and not s.asynchronous:
+            executor, reason = "serial", "solver and verifier are batched"
+        elif s.asynchronous and s.thread_safe and v.thread_safe:
+            executor, reason = "thread", "async (I/O-bound) solver, thread-safe components"
+        elif s.process_safe and v.process_safe:
+            executor, reason = "process", "solver and verifier are process-safe"
+        elif s.thread_safe and v.thread_safe:
+            executor, reason = "thread", "solver and verifier are thread-safe"
+        else:
+            reason = "components are not safe to run concurrently"
+    records = executor == "serial" and c.records and s.records and v.records
+    return ExecutionPlan(executor, records, reason)
+
+@dataclass(frozen=True)
+class DomainPlugin:
+    name: str
+    challenger: Factory
+    solver: Factory
+    verifier: Factory
+    description: str = ""
+
+    def load(self, which: str) -> Callable[[], Any]:
+        """Resolve the ``challenger``/``solver``/``verifier`` factory (imports its module)."""
+        ref = getattr(self, which)
+        if not isinstance(ref, str):
+            return ref
+        module, _, attr = ref.partition(":")
+        return getattr(importlib.import_module(module), attr)
+
+    def create(self) -> Tuple[Any, Any, Any]:
+        """Default-constructed (challenger, solver, verifier)."""
+        return self.load("challenger")(), self.load("solver")(), self.load("verifier")()
+
+_REGISTRY: Dict[str, DomainPlugin] = {}
+_entry_points: Optional[Dict[str, Any]] = None
+
+def register(plugin: DomainPlugin, *, override: bool = False) -> DomainPlugin:
+    if plugin.name in _REGISTRY and not override:
+        raise ValueError(f"domain {plugin.name!r} is already registered")
+    _REGISTRY[plugin.name] = plugin
+    return plugin
+
+def _discover() -> Dict[str, Any]:
+    global _entry_points
+    if _entry_points is None:
+        from importlib.metadata import entry_points
+
+        _entry_points = {ep.name: ep for ep in entry_points(group=ENTRY_POINT_GROUP)}
+    return _entry_points
+
+def _builtins() -> None:
+    from . import domains  # noqa: F401  (registers the built-in plugins on first import)
+
+def names() -> List[str]:
+    """Registered and installed domain names; imports no plugin module."""
+    _builtins()
+    return list(_REGISTRY) + sorted(n for n in _discover() if n not in _REGISTRY)
+
+def get(name: str) -> DomainPlugin:
+    """The plugin for ``name``, loading its entry point on first use."""
+    _builtins()
+    plugin = _REGISTRY.get(name)
+    if plugin is not None:
+        return plugin
+    ep = _discover().get(name)
+    if ep is None:
+        raise KeyError(f"unknown domain {name!r}; available: {', '.join(names())}")
+    obj = ep.load()
+    plugin = obj if isinstance(obj, DomainPlugin) else obj()
+    if not isinstance(plugin, DomainPlugin):
+        raise TypeError(f"entry point {ep.value!r} did not provide a DomainPlugin")
+    if plugin.name != name:
+        plugin = replace(plugin, name=name)
+    return register(plugin)
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .types import Sample, Solution, Task, Verification
+
+# --- Slotted record types for the loop's hot path.
+# They mirror the pydantic models in rzero.types field for field, but skip validation and
+# per-object defaults (a batch shares one created_at), and serialise straight to the same
+# JSON row that Sample.model_dump(mode="json") produces. Convert with to_model()/from_model()
+# wherever samples leave the loop (Trainer.run's return value, Solver.update).
+
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None
+
+def _dumps_json(row: Dict[str, Any]) -> bytes:
+    return json.dumps(row, ensure_ascii=False).encode("utf-8")
+
+# JSON encoder for rows: orjson when installed (pip install rzero[fast]), else the stdlib.
+dumps: Callable[[Dict[str, Any]], bytes] = orjson.dumps if orjson is not None else _dumps_json
+
+@dataclass(slots=True)
+class TaskRecord:
+    id: str
+    domain: str
+    prompt: str
+    difficulty: float = 0.5
+    meta: Dict[str, Any] = field(default_factory=dict)
+    created_at: datetime = field(default_factory=datetime.utcnow)
+
+    def to_model(self) -> Task:
+        return Task(id=self.id, domain=self.domain, prompt=self.prompt, difficulty=self.difficulty,
+                    meta=self.meta, created_at=self.created_at)
+
+    @classmethod
+    def from_model(cls, t: Task) -> "TaskRecord":
+        return cls(t.id, t.domain, t.prompt, t.difficulty, t.meta, t.created_at)
+
+@dataclass(slots=True)
+class SolutionRecord:
+    task_id: str
+    solver: str = "heuristic"
+    content: str = ""
+    latency_ms: Optional[float] = None
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+    def to_model(self) -> Solution:
+        return Solution(task_id=self.task_id, solver=self.solver, content=self.content,
+                        latency_ms=self.latency_ms, meta=self.meta)
+
+    @classmethod
+    def from_model(cls, s: Solution) -> "SolutionRecord":
+        return cls(s.task_id, s.solver, s.content, s.latency_ms, s.meta)
+
+@dataclass(slots=True)
+class VerificationRecord:
+    task_id: str
+    passed: bool
+    score: float
+    feedback: str = ""
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+    def to_model(self) -> Verification:
+        return Verification(task_id=self.task_id, passed=self.passed, score=self.score,
+                            feedback=self.feedback, meta=self.meta)
+
+    @classmethod
+    def from_model(cls, v: Verification) -> "VerificationRecord":
+        return cls(v.task_id, v.passed, v.score, v.feedback, v.meta)
+
+@dataclass(slots=True)
+class SampleRecord:
+    task: TaskRecord
+    solution: SolutionRecord
+    verification: VerificationRecord
+
+    def to_model(self) -> Sample:
+        return Sample(task=self.task.to_model(), solution=self.solution.to_model(),
+                      verification=self.verification.to_model())
+
+    def to_row(self, created_at: Optional[str] = None) -> Dict[str, Any]:
+        """Same dict as Sample.model_dump(mode="json").
+
+        Pass ``created_at`` to reuse an already formatted timestamp.
+        """
+        t, s, v = self.task, self.solution, self.verification
+        return {
+            "task": {"id": t.id, "domain": t.domain, "prompt": t.prompt, "difficulty": t.difficulty,
+                     "meta": t.meta, "created_at": created_at or t.created_at.isoformat()},
+            "solution": {"task_id": s.task_id, "solver": s.solver, "content": s.content,
+                         "latency_ms": s.latency_ms, "meta": s.meta},
+            "verification": {"task_id": v.task_id, "passed": v.passed, "score": v.score,
+                             "feedback": v.feedback, "meta": v.meta},
+        }
+
+def record_rows(
+    samples: Iterable[SampleRecord],
+    episode: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Rows for a batch; tasks proposed together share a created_at, so format it once."""
+    rows: List[Dict[str, Any]] = []
+    last: Optional[datetime] = None
+    stamp = ""
+    for s in samples:
+        if s.task.created_at is not last:
+            last = s.task.created_at
+            stamp = last.isoformat()
+        row = s.to_row(stamp)
+        if episode is not None:
+            row["episode"] = episode
+        rows.append(row)
+    return rows
+
+def as_models(samples: Iterable[Any]) -> List[Sample]:
+    """Pydantic Samples for an API boundary (records are converted, models pass through)."""
+    return [s.to_model() if isinstance(s, SampleRecord) else s for s in samples]
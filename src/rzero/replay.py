@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import itertools
+import json
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Deque, Iterator, List, Optional
+
+from .columnar import ColumnarDataset, is_columnar
+from .samplestore import SampleStore, is_store
+from .solver import Solver
+from .storage import atomic_write_text, iter_lines
+from .types import Sample, Solution, Task, Verification
+
+# --- Chunked offline replay: parse JSON lines in worker processes, feed Solver.update in
+# mini-batches, and checkpoint the row offset so an interrupted replay can resume.
+
+def parse_chunk(lines: List[str]) -> List[Sample]:
+    """Rebuild Samples (schema-validated) from raw JSONL lines."""
+    out: List[Sample] = []
+    for line in lines:
+        row = json.loads(line)
+        out.append(Sample(
+            task=Task(**row["task"]),
+            solution=Solution(**row["solution"]),
+            verification=Verification(**row["verification"]),
+        ))
+    return out
+
+def _lines_from(path: Path, start: int) -> Iterator[str]:
+    if is_columnar(path):
+        ds = ColumnarDataset(path)
+        # rows.jsonl is plain JSONL in row order; seek straight to the first wanted row
+        with (ds.path / "rows.jsonl").open("rb") as f:
+            if start >= len(ds):
+                return
+            f.seek(ds.byte_offset(start))
+            for raw in f:
+                line = raw.decode("utf-8").strip()
+                if line:
+                    yield line
+        return
+    if is_store(path):
+        with SampleStore(path) as store:
+            yield from store.iter_lines(start)
+        return
+    yield from itertools.islice(iter_lines(path), start, None)
+
+def iter_chunks(
+    path: str | Path,
+    chunk_size: int,
+    *,
+    start: int = 0,
+    limit: Optional[int] = None,
+) -> Iterator[List[str]]:
+    """Raw-line chunks of rows [start, start + limit)."""
+    lines = _lines_from(Path(path).expanduser(), start)
+    if limit is not None:
+        lines = itertools.islice(lines, limit)
+    while True:
+        chunk = list(itertools.islice(lines, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+@dataclass
+class ReplayCheckpoint:
+    """Row offset reached in ``dataset`` plus where the solver state was saved."""
+    dataset: str
+    offset: int
+    solver_state: str
+
+    def save(self, path: str | Path) -> None:
+        atomic_write_text(path, json.dumps(self.__dict__, indent=2))
+
+    @classmethod
+    def load(cls, path: str | Path) -> "ReplayCheckpoint":
+        return cls(**json.loads(Path(path).expanduser().read_text(encoding="utf-8")))
+
+def replay(
+    solver: Solver,
+    path: str | Path,
+    *,
+    chunk_size: int = 10_000,
+    update_size: Optional[int] = None,
+    workers: int = 1,
+    start: int = 0,
+    limit: Optional[int] = None,
+    checkpoint: Optional[str | Path] = None,
+    checkpoint_every: int = 1,
+) -> int:
+    """Stream a dataset into ``solver.update`` and return the offset reached.
+
+    At most ``2 * workers`` chunks are parsed ahead of the solver, so peak memory is
+    proportional to ``chunk_size``, not the dataset. ``update`` is called with slices of
+    ``update_size`` samples (default: one call per chunk). With ``checkpoint`` set, the
+    solver is saved and the offset recorded every ``checkpoint_every`` chunks.
+    """
+    offset = start
+    update_size = update_size or chunk_size
+    chunks = iter_chunks(path, chunk_size, start=start, limit=limit)
+
+    def _consume(samples: List[Sample], n_done: int) -> None:
+        nonlocal offset
+        for i in range(0, len(samples), update_size):
+            solver.update(samples[i:i + update_size])
+        offset += len(samples)
+        if checkpoint is not None and n_done % max(1, checkpoint_every) == 0:
+            _checkpoint(solver, path, offset, checkpoint)
+
+    n_done = 0
+    if workers <= 1:
+        for lines in chunks:
+            n_done += 1
+            _consume(parse_chunk(lines), n_done)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending: Deque[Future[List[Sample]]] = deque()
+            for lines in chunks:
+                pending.append(pool.submit(parse_chunk, lines))
+                if len(pending) >= 2 * workers:
+                    n_done += 1
+                    _consume(pending.popleft().result(), n_done)
+            while pending:
+                n_done += 1
+                _consume(pending.popleft().result(), n_done)
+    if checkpoint is not None:
+        _checkpoint(solver, path, offset, checkpoint)
+    return offset
+
+def _checkpoint(solver: Solver, dataset: str | Path, offset: int, path: str | Path) -> None:
+    state = str(Path(path).expanduser()) + ".solver"
+    # state first: the checkpoint never points at a newer offset than the solver saw
+    solver.save(state)
+    ReplayCheckpoint(dataset=str(dataset), offset=offset, solver_state=state).save(path)
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .cache import content_hash
+from .records import dumps
+from .storage import JsonlSink, Sink
+
+# --- Append-only sample store: one SQLite file, one row per distinct sample.
+# Samples are keyed by a content hash of (domain, prompt, solution content) rather than
+# their random task ids, so inserting the same pair again (a later run, another shard) is
+# a no-op. Rows keep insertion order (``id``), which replay and exports follow. Pass/score
+# sit next to the hash, so a prior verification is one indexed lookup, no row parsing.
+
+SQLITE_MAGIC = b"SQLite format 3\x00"
+STORE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    id INTEGER PRIMARY KEY,
+    hash TEXT NOT NULL UNIQUE,
+    domain TEXT NOT NULL,
+    passed INTEGER NOT NULL,
+    score REAL NOT NULL,
+    episode INTEGER,
+    row TEXT NOT NULL
+)
+"""
+
+def sample_hash(domain: str, prompt: str, solution: str) -> str:
+    return content_hash(domain, prompt, solution)
+
+def row_hash(row: Dict[str, Any]) -> str:
+    return sample_hash(row["task"]["domain"], row["task"]["prompt"], row["solution"]["content"])
+
+def is_store(path: str | Path) -> bool:
+    p = Path(path).expanduser()
+    if not p.is_file():
+        return False
+    with p.open("rb") as f:
+        return f.read(len(SQLITE_MAGIC)) == SQLITE_MAGIC
+
+class SampleStore(Sink):
+    """Deduplicating, append-only Sink backed by SQLite (WAL; one transaction per write).
+
+    ``append=False`` empties the store first (like JsonlSink's overwrite).
+    """
+
+    def __init__(self, path: str | Path, *, append: bool = True) -> None:
+        import sqlite3
+
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.count = 0       # rows inserted through this handle
+        self.duplicates = 0  # rows skipped because their hash was already stored
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(_SCHEMA)
+        if not append:
+            self._db.execute("DELETE FROM samples")
+        self._db.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM samples").fetchone()[0]
+
+    def write_rows(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """Insert already-serialised rows, skipping known hashes; returns how many were new."""
+        params = [
+            (row_hash(row), row["task"]["domain"], int(bool(row["verification"]["passed"])),
+             float(row["verification"]["score"]), row.get("episode"), dumps(row).decode("utf-8"))
+            for row in rows
+        ]
+        if not params:
+            return 0
+        with self._lock, self._db:
+            before = self._db.total_changes
+            self._db.executemany(
+                "INSERT OR IGNORE INTO samples (hash, domain, passed, score, episode, row) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                params,
+            )
+            inserted = self._db.total_changes - before
+        self.count += inserted
+        self.duplicates += len(params) - inserted
+        return inserted
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            hit = self._db.execute("SELECT 1 FROM samples WHERE hash = ?", (key,)).fetchone()
+        return hit is not None
+
+    def lookup(self, key: str) -> Optional[Tuple[bool, float]]:
+        """(passed, score) stored for a sample hash, or None."""
+        with self._lock:
+            hit = self._db.execute(
+                "SELECT passed, score FROM samples WHERE hash = ?", (key,)
+            ).fetchone()
+        return (bool(hit[0]), hit[1]) if hit is not None else None
+
+    def verification(self, domain: str, prompt: str, solution: str) -> Optional[Dict[str, Any]]:
+        """The stored Verification (as a dict) for this exact task/solution pair, or None."""
+        key = sample_hash(domain, prompt, solution)
+        with self._lock:
+            hit = self._db.execute("SELECT row FROM samples WHERE hash = ?", (key,)).fetchone()
+        return json.loads(hit[0])["verification"] if hit is not None else None
+
+    def iter_lines(self, start: int = 0, *, batch: int = 10_000) -> Iterator[str]:
+        """Stored rows as JSON text in insertion order, from row ``start`` on (ids are dense)."""
+        last = start
+        while True:
+            with self._lock:
+                chunk = self._db.execute(
+                    "SELECT id, row FROM samples WHERE id > ? ORDER BY id LIMIT ?", (last, batch)
+                ).fetchall()
+            if not chunk:
+                return
+            last = chunk[-1][0]
+            for _, line in chunk:
+                yield line
+
+    def rows(self, start: int = 0) -> Iterator[Dict[str, Any]]:
+        for line in self.iter_lines(start):
+            yield json.loads(line)
+
+    def merge(self, source: str | Path, *, chunk_size: int = 10_000) -> int:
+        """Insert every row of a JSONL file, columnar directory or another store.
+
+        Returns the number of new rows.
+        """
+        from .columnar import iter_rows
+
+        inserted = 0
+        chunk: List[Dict[str, Any]] = []
+        for row in iter_rows(source):
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                inserted += self.write_rows(chunk)
+                chunk = []
+        return inserted + self.write_rows(chunk)
+
+    def checkpoint(self) -> Optional[int]:
+        """Every write is its own transaction; return the last row id as the resume offset."""
+        with self._lock:
+            return self._db.execute("SELECT COALESCE(MAX(id), 0) FROM samples").fetchone()[0]
+
+    def truncate(self, episode: int, *, after_id: int = 0) -> int:
+        """Delete rows of episodes >= ``episode`` inserted after row ``after_id``.
+
+        Rows from earlier runs appended to the same store keep their (lower) ids, so they
+        survive even if their episode numbers are higher. Returns the number of rows deleted.
+        """
+        with self._lock, self._db:
+            deleted = self._db.execute(
+                "DELETE FROM samples WHERE episode >= ? AND id > ?", (episode, after_id)
+            ).rowcount
+        return deleted
+
+    def vacuum(self) -> None:
+        with self._lock:
+            self._db.execute("VACUUM")
+
+    def summary(self) -> Dict[str, Any]:
+        return {"rows": len(self), "inserted": self.count, "duplicates": self.duplicates}
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+def compact(sources: Sequence[str | Path], dst: str | Path) -> Dict[str, int]:
+    """Merge datasets into ``dst`` with one row per distinct sample.
+
+    ``dst`` is a SampleStore when it ends in .db/.sqlite/.sqlite3 (or already is one; rows are
+    appended), otherwise a new JSONL file (.gz/.zst compressed by suffix).
+    """
+    p = Path(dst).expanduser()
+    if p.suffix in STORE_SUFFIXES or is_store(p):
+        with SampleStore(p) as store:
+            for src in sources:
+                store.merge(src)
+            store.vacuum()
+            return {"rows": len(store), "inserted": store.count, "duplicates": store.duplicates}
+    from .columnar import iter_rows
+
+    if any(Path(s).expanduser().resolve() == p.resolve() for s in sources):
+        raise ValueError(f"{p} is one of the sources; write the JSONL output elsewhere")
+    seen: set[str] = set()
+    dropped = 0
+    with JsonlSink(p, append=False, flush_every=16) as sink:
+        for src in sources:
+            chunk: List[Dict[str, Any]] = []
+            for row in iter_rows(src):
+                key = row_hash(row)
+                if key in seen:
+                    dropped += 1
+                    continue
+                seen.add(key)
+                chunk.append(row)
+                if len(chunk) >= 10_000:
+                    sink.write_rows(chunk)
+                    chunk = []
+            sink.write_rows(chunk)
+    return {"rows": len(seen), "inserted": len(seen), "duplicates": dropped}
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import multiprocessing as mp
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, List, Optional, Sequence
+
+from .domains.code_io import run_tests
+
+# --- Process-isolated execution for code-io verification.
+# A fixed set of long-lived worker processes runs untrusted solutions. Each run gets a
+# wall-clock timeout (worker is killed and replaced) and a per-run CPU budget (RLIMIT_CPU);
+# each worker gets an address-space cap (RLIMIT_AS) and is recycled after max_tasks runs.
+
+def _vm_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except Exception:  # pragma: no cover - non-Linux
+        return 0
+
+def _limit(kind: str, soft: int) -> None:
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - Windows
+        return
+    res = getattr(resource, kind)
+    _, hard = resource.getrlimit(res)
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(res, (soft, hard))
+
+def _cpu_used() -> float:
+    try:
+        import resource
+    except ImportError:  # pragma: no cover
+        return 0.0
+    ru = resource.getrusage(resource.RUSAGE_SELF)
+    return ru.ru_utime + ru.ru_stime
+
+def _worker_main(conn: Any, memory_mb: int) -> None:
+    if memory_mb > 0:
+        # headroom on top of the interpreter's own footprint
+        _limit("RLIMIT_AS", _vm_bytes() + memory_mb * 1024 * 1024)
+    while True:
+        try:
+            msg = conn.recv()
+        except (EOFError, OSError):
+            return
+        if msg is None:
+            return
+        code, name, tests, cpu_s = msg
+        if cpu_s > 0:
+            _limit("RLIMIT_CPU", int(_cpu_used() + cpu_s) + 1)  # SIGXCPU kills the worker
+        try:
+            result = run_tests(code, name, tests)
+        except MemoryError:
+            result = (0, "memory limit exceeded")
+        except BaseException as e:  # SystemExit etc. must not take the worker down silently
+            result = (0, f"sandbox error: {e!r}")
+        conn.send(result)
+
+# Outcomes caused by the pool (a slow or dead worker) rather than by the solution; a retry
+# may pass, so callers should not memoise them (see SandboxPool.is_transient).
+TIMEOUT_FEEDBACK = "timeout after {}s"
+CRASH_FEEDBACK = "worker died (cpu or memory limit exceeded)"
+
+@dataclass
+class _Worker:
+    proc: Any
+    conn: Any
+    uses: int = 0
+
+@dataclass
+class SandboxStats:
+    runs: int = 0
+    timeouts: int = 0
+    crashes: int = 0
+    recycled: int = 0
+
+class SandboxPool:
+    """Pool of pre-started worker processes that run code-io tests in isolation.
+
+    ``run`` is thread-safe: each call borrows one idle worker, so a thread executor with
+    N workers keeps up to N solutions executing in parallel. ``run_many`` does the same for
+    a whole batch from a single caller.
+    """
+
+    def __init__(
+        self,
+        workers: int = 4,
+        *,
+        timeout_s: float = 2.0,
+        cpu_s: float = 1.0,
+        memory_mb: int = 256,
+        max_tasks: int = 500,
+        start_method: Optional[str] = None,
+    ) -> None:
+        methods = mp.get_all_start_methods()
+        # fork is cheapest (workers inherit the already-imported verifier code); spawn elsewhere.
+        # Replacements are started mid-run from executor threads, where forking could copy a
+        # lock some other thread holds, so they come from a forkserver (or spawn) instead.
+        self._ctx = mp.get_context(start_method or ("fork" if "fork" in methods else "spawn"))
+        if start_method is None and "forkserver" in methods:
+            self._respawn_ctx = mp.get_context("forkserver")
+            self._respawn_ctx.set_forkserver_preload([__name__])
+        else:
+            self._respawn_ctx = mp.get_context(start_method or "spawn")
+        self.timeout_s = timeout_s
+        self.cpu_s = cpu_s
+        self.memory_mb = memory_mb
+        self.max_tasks = max(1, max_tasks)
+        self.stats = SandboxStats()
+        self._lock = threading.Lock()
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._all: List[_Worker] = []
+        self._size = max(1, workers)
+        self._feeder: Optional[ThreadPoolExecutor] = None
+        for _ in range(self._size):
+            self._idle.put(self._spawn())
+
+    def _spawn(self, ctx: Any = None) -> _Worker:
+        ctx = ctx or self._ctx
+        parent, child = ctx.Pipe()
+        proc = ctx.Process(target=_worker_main, args=(child, self.memory_mb), daemon=True)
+        proc.start()
+        child.close()
+        w = _Worker(proc, parent)
+        with self._lock:
+            self._all.append(w)
+        return w
+
+    def _kill(self, w: _Worker) -> None:
+        if w.proc.is_alive():
+            w.proc.kill()
+        w.proc.join()
+        w.conn.close()
+        with self._lock:
+            if w in self._all:
+                self._all.remove(w)
+
+    def _replace(self, w: _Worker) -> _Worker:
+        self._kill(w)
+        return self._spawn(self._respawn_ctx)
+
+    def _checkout(self) -> _Worker:
+        with self._lock:
+            lost = not self._all
+        if lost:  # every worker was killed and its replacement failed to start
+            return self._spawn(self._respawn_ctx)
+        return self._idle.get()
+
+    def run(self, code: str, name: str, tests: List[Any]) -> tuple[int, str]:
+        """Run tests for one solution -> (passed, feedback); feedback is "" on a clean run.
+
+        If a replacement worker cannot be started the error propagates and the pool shrinks.
+        """
+        w = self._checkout()
+        try:
+            with self._lock:
+                self.stats.runs += 1
+            try:
+                w.conn.send((code, name, list(tests), self.cpu_s))
+            except (BrokenPipeError, OSError):  # worker died between runs
+                w = self._replace(w)
+                w.conn.send((code, name, list(tests), self.cpu_s))
+            if not w.conn.poll(self.timeout_s):
+                w = self._replace(w)
+                with self._lock:
+                    self.stats.timeouts += 1
+                return 0, TIMEOUT_FEEDBACK.format(self.timeout_s)
+            try:
+                result = w.conn.recv()
+            except (EOFError, OSError):
+                w = self._replace(w)
+                with self._lock:
+                    self.stats.crashes += 1
+                return 0, CRASH_FEEDBACK
+            w.uses += 1
+            if w.uses >= self.max_tasks:
+                w = self._replace(w)
+                with self._lock:
+                    self.stats.recycled += 1
+            return result
+        finally:
+            with self._lock:
+                live = w in self._all  # _kill drops workers, so a failed _replace leaves none
+            if live and w.proc.is_alive():
+                self._idle.put(w)
+            elif live:  # died after answering
+                self._kill(w)
+
+    def run_many(self, jobs: Sequence[tuple[str, str, List[Any]]]) -> List[tuple[int, str]]:
+        """``run`` for each (code, name, tests) job, spread over all workers; results in order."""
+        if len(jobs) <= 1:
+            return [self.run(*job) for job in jobs]
+        with self._lock:
+            if self._feeder is None:  # one thread per worker process, each blocked in run()
+                self._feeder = ThreadPoolExecutor(self._size, thread_name_prefix="rzero-sandbox")
+            feeder = self._feeder
+        return list(feeder.map(lambda job: self.run(*job), jobs))
+
+    def is_transient(self, feedback: str) -> bool:
+        """Whether ``run`` feedback reports a timeout or worker crash instead of a test result."""
+        return feedback in (TIMEOUT_FEEDBACK.format(self.timeout_s), CRASH_FEEDBACK)
+
+    def close(self) -> None:
+        with self._lock:
+            workers = list(self._all)
+            feeder, self._feeder = self._feeder, None
+        if feeder is not None:
+            feeder.shutdown()
+        for w in workers:
+            try:
+                w.conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            w.proc.join(timeout=1.0)
+            self._kill(w)
+
+    def __enter__(self) -> "SandboxPool":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def __reduce__(self) -> Any:
+        raise TypeError(
+            "SandboxPool cannot be pickled; use the thread executor with a sandboxed verifier"
+        )
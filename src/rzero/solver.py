@@ -1,7 +1,9 @@
 from __future__ import annotations
+import asyncio
 from abc import ABC, abstractmethod
 from typing import List
 from .types import Task, Solution, Sample
+from .records import SolutionRecord, TaskRecord
 
 class Solver(ABC):
     """Attempts to solve a Task. May optionally learn via update(samples)."""
@@ -11,6 +13,19 @@ class Solver(ABC):
     @abstractmethod
     def solve(self, task: Task) -> Solution: ...
 
+    # Optional batch hook; override when a whole batch can be solved more cheaply than one by one
+    def solve_batch(self, tasks: List[Task]) -> List[Solution]:
+        return [self.solve(t) for t in tasks]
+
+    # Optional fast-path hook (Trainer(records=True)); override to skip pydantic entirely
+    def solve_records(self, tasks: List[TaskRecord]) -> List[SolutionRecord]:
+        sols = self.solve_batch([t.to_model() for t in tasks])
+        return [SolutionRecord.from_model(s) for s in sols]
+
+    # Optional async hook; override for natively async backends (defaults to a worker thread)
+    async def solve_async(self, task: Task) -> Solution:
+        return await asyncio.to_thread(self.solve, task)
+
     # Optional training hook (no-op by default)
     def update(self, samples: List[Sample]) -> None:  # called between episodes
         pass
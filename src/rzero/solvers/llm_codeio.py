@@ -1,17 +1,24 @@
 from __future__ import annotations
 
+import asyncio
 import os
 import re
+import threading
 import time
-from typing import Any, Dict, Optional
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional
 
+from rzero.cache import ResponseCache, content_hash
+from rzero.domains.taskbank import name_of
+from rzero.plugins import Capabilities
 from rzero.solver import Solver
 from rzero.types import Task, Solution
 
 try:
-    from openai import OpenAI  # type: ignore
+    from openai import AsyncOpenAI, OpenAI  # type: ignore
 except Exception:  # pragma: no cover
     OpenAI = None  # type: ignore
+    AsyncOpenAI = None  # type: ignore
 
 
 SYSTEM = (
@@ -39,64 +46,198 @@ def _extract_code(text: str) -> str:
 
 
 class CodeIOLLMSolver(Solver):
-    """LLM-backed solver for the Code-IO domain."""
+    """LLM-backed solver for the Code-IO domain.
+
+    ``client``/``async_client`` may be passed in (e.g. a fake for tests, or one shared
+    ``rzero.llm.LLM`` for every solver in the process); otherwise OpenAI clients are built
+    from OPENAI_API_KEY.
+
+    With ``coalesce`` (default: only when sampling at temperature 0) identical requests (same
+    model, messages and temperature) share one completion: duplicates in a batch and
+    concurrent duplicates wait for one in-flight call. Otherwise every task gets its own
+    sample, keeping the diversity the training loop learns from. With ``cache`` set completed
+    responses are reused until they expire. ``Solution.meta["cache"]`` is "hit", "coalesced"
+    or "miss".
+    """
     name = "codeio-llm"
-
-    def __init__(self, model: str = "gpt-5-mini", temperature: Optional[float] = None) -> None:
-        if OpenAI is None:
-            raise RuntimeError("openai package not installed. Install with: pip install rzero[llm]")
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise RuntimeError("Set OPENAI_API_KEY in your environment.")
-
-        self.client = OpenAI(api_key=api_key)
+    # clients and the in-flight table are shared under a lock
+    capabilities = Capabilities(thread_safe=True)
+
+    def __init__(
+        self,
+        model: str = "gpt-5-mini",
+        temperature: Optional[float] = None,
+        *,
+        client: Any = None,
+        async_client: Any = None,
+        cache: Optional[ResponseCache] = None,
+        coalesce: Optional[bool] = None,
+    ) -> None:
+        if client is None and async_client is None:
+            if OpenAI is None:
+                raise RuntimeError(
+                    "openai package not installed. Install with: pip install rzero[llm]"
+                )
+            api_key = os.getenv("OPENAI_API_KEY")
+            if not api_key:
+                raise RuntimeError("Set OPENAI_API_KEY in your environment.")
+            client = OpenAI(api_key=api_key)
+            if AsyncOpenAI is not None:
+                async_client = AsyncOpenAI(api_key=api_key)
+
+        self.client = client
+        self.async_client = async_client
         self.model = model
+        self.cache = cache
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future[str]] = {}
+        self._ainflight: Dict[str, asyncio.Future[str]] = {}
 
         # If model doesn't support custom temperature, ignore whatever was passed.
         if _supports_free_temperature(model):
             self.temperature: Optional[float] = temperature if temperature is not None else 0.0
         else:
             self.temperature = None  # omit from API call
+        # the model's own default temperature is not 0, so coalescing is opt-in there
+        self.coalesce = coalesce if coalesce is not None else self.temperature == 0
 
-    def solve(self, task: Task) -> Solution:
-        spec = task.meta.get("spec") or {}
-        name = spec.get("name", "")
+    def _request(self, task: Task) -> Dict[str, Any]:
+        name = name_of(task)
         prompt = (
             f"{task.prompt}\n\n"
             f"Function name must be exactly: {name}\n"
             "Return only the code (no comments or prose)."
         )
+        kwargs: Dict[str, Any] = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": SYSTEM},
+                {"role": "user", "content": prompt},
+            ],
+        }
+        if self.temperature is not None:
+            kwargs["temperature"] = self.temperature  # only include when supported
+        return kwargs
+
+    def _solution(self, task: Task, raw: str, dt_ms: int, status: str) -> Solution:
+        return Solution(
+            task_id=task.id,
+            solver=self.name,
+            content=_extract_code(raw),
+            latency_ms=dt_ms,
+            meta={"raw": raw[:5000], "cache": status},  # keep a trimmed copy for debugging
+        )
 
+    def _error(self, task: Task, e: Exception) -> Solution:
+        return Solution(
+            task_id=task.id,
+            solver=self.name,
+            content="# ERROR",
+            latency_ms=None,
+            meta={"error": str(e)},
+        )
+
+    def _call(self, kwargs: Dict[str, Any], key: str) -> str:
+        if self.client is None:
+            raise RuntimeError("no sync client configured; use solve_async")
+        resp = self.client.chat.completions.create(**kwargs)
+        raw = resp.choices[0].message.content or ""
+        if self.cache is not None:
+            self.cache.put(key, raw)
+        return raw
+
+    async def _acall(self, kwargs: Dict[str, Any], key: str) -> str:
+        resp = await self.async_client.chat.completions.create(**kwargs)
+        raw = resp.choices[0].message.content or ""
+        if self.cache is not None:
+            self.cache.put(key, raw)
+        return raw
+
+    def _complete(self, kwargs: Dict[str, Any]) -> tuple[str, str]:
+        key = content_hash(kwargs)
+        if self.cache is not None:
+            hit = self.cache.get(key)
+            if hit is not None:
+                return hit, "hit"
+        if not self.coalesce:
+            return self._call(kwargs, key), "miss"
+        with self._lock:
+            fut = self._inflight.get(key)
+            leader = fut is None
+            if leader:
+                fut = self._inflight[key] = Future()
+        assert fut is not None
+        if not leader:
+            return fut.result(), "coalesced"
         try:
-            kwargs: Dict[str, Any] = {
-                "model": self.model,
-                "messages": [
-                    {"role": "system", "content": SYSTEM},
-                    {"role": "user", "content": prompt},
-                ],
-            }
-            if self.temperature is not None:
-                kwargs["temperature"] = self.temperature  # only include when supported
+            raw = self._call(kwargs, key)
+            fut.set_result(raw)
+            return raw, "miss"
+        except Exception as e:
+            fut.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    async def _acomplete(self, kwargs: Dict[str, Any]) -> tuple[str, str]:
+        key = content_hash(kwargs)
+        if self.cache is not None:
+            hit = self.cache.get(key)
+            if hit is not None:
+                return hit, "hit"
+        if not self.coalesce:
+            return await self._acall(kwargs, key), "miss"
+        fut = self._ainflight.get(key)  # single event loop: no lock needed
+        if fut is not None:
+            return await asyncio.shield(fut), "coalesced"
+        fut = self._ainflight[key] = asyncio.get_running_loop().create_future()
+        try:
+            raw = await self._acall(kwargs, key)
+            fut.set_result(raw)
+            return raw, "miss"
+        except Exception as e:
+            fut.set_exception(e)
+            fut.exception()  # mark retrieved when nobody else was waiting
+            raise
+        finally:
+            self._ainflight.pop(key, None)
 
+    def solve(self, task: Task) -> Solution:
+        try:
+            kwargs = self._request(task)
             t0 = time.perf_counter()
-            resp = self.client.chat.completions.create(**kwargs)
+            raw, status = self._complete(kwargs)
             dt_ms = int((time.perf_counter() - t0) * 1000)
-
-            raw = resp.choices[0].message.content or ""
-            code = _extract_code(raw)
-
-            return Solution(
-                task_id=task.id,
-                solver=self.name,
-                content=code,
-                latency_ms=dt_ms,
-                meta={"raw": raw[:5000]},  # keep a trimmed copy for debugging
-            )
+            return self._solution(task, raw, dt_ms, status)
+        except Exception as e:  # pragma: no cover
+            return self._error(task, e)
+
+    def solve_batch(self, tasks: List[Task]) -> List[Solution]:
+        if not self.coalesce:
+            return [self.solve(t) for t in tasks]
+        # One request per distinct prompt; duplicates within the batch reuse its response.
+        done: Dict[str, Solution] = {}
+        out: List[Solution] = []
+        for t in tasks:
+            key = content_hash(self._request(t))
+            first = done.get(key)
+            if first is None or first.meta.get("error"):
+                done[key] = sol = self.solve(t)
+            else:
+                meta = {**first.meta, "cache": "coalesced"}
+                sol = first.model_copy(update={"task_id": t.id, "latency_ms": 0, "meta": meta})
+            out.append(sol)
+        return out
+
+    async def solve_async(self, task: Task) -> Solution:
+        if self.async_client is None:
+            return await super().solve_async(task)
+        try:
+            kwargs = self._request(task)
+            t0 = time.perf_counter()
+            raw, status = await self._acomplete(kwargs)
+            dt_ms = int((time.perf_counter() - t0) * 1000)
+            return self._solution(task, raw, dt_ms, status)
         except Exception as e:  # pragma: no cover
-            return Solution(
-                task_id=task.id,
-                solver=self.name,
-                content="# ERROR",
-                latency_ms=None,
-                meta={"error": str(e)},
-            )
+            return self._error(task, e)
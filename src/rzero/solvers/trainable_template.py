@@ -2,6 +2,7 @@ from __future__ import annotations
 from typing import List, Dict
 from rzero.solver import Solver
 from rzero.types import Task, Solution, Sample
+from rzero.domains.taskbank import name_of
 
 class CodeIOTrainable(Solver):
     """Minimal trainable example for code-io: cache best-passing code per spec name."""
@@ -12,8 +13,7 @@ class CodeIOTrainable(Solver):
         self.memory: Dict[str, str] = {}
 
     def solve(self, task: Task) -> Solution:
-        spec = (task.meta or {}).get("spec", {})
-        name = spec.get("name", "func")
+        name = name_of(task) or "func"
         code = self.memory.get(
             name,
             f"def {name}(*args, **kwargs):\n    raise NotImplementedError\n",
@@ -25,8 +25,7 @@ class CodeIOTrainable(Solver):
         for s in samples:
             if s.task.domain != "code-io":
                 continue
-            spec = (s.task.meta or {}).get("spec", {})
-            name = spec.get("name")
+            name = name_of(s.task)
             if name and s.verification.passed:
                 self.memory[name] = s.solution.content
 
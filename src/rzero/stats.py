@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import math
+import random
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+# --- One-pass, constant-memory dataset statistics (see `rzero dataset`).
+
+# Dotted fields DatasetStats reads; pass to storage.iter_jsonl(fields=...) to project rows.
+STATS_FIELDS = (
+    "task.domain",
+    "task.difficulty",
+    "solution.solver",
+    "solution.latency_ms",
+    "verification.score",
+)
+
+def percentile(sorted_values: List[float], q: float) -> Optional[float]:
+    """Linear-interpolated percentile (q in [0, 100]) of an already sorted list."""
+    if not sorted_values:
+        return None
+    k = (len(sorted_values) - 1) * q / 100.0
+    lo, hi = math.floor(k), math.ceil(k)
+    if lo == hi:
+        return sorted_values[lo]
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+@dataclass
+class Reservoir:
+    """Uniform sample of at most ``size`` values (Algorithm R); exact while n <= size."""
+    size: int = 10_000
+    seed: int = 0
+    n: int = 0
+    values: List[float] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        self._rng = random.Random(self.seed)
+
+    def add(self, v: float) -> None:
+        self.n += 1
+        if len(self.values) < self.size:
+            self.values.append(v)
+            return
+        j = self._rng.randrange(self.n)
+        if j < self.size:
+            self.values[j] = v
+
+    def percentiles(self, qs: tuple[float, ...] = (50, 95, 99)) -> Dict[str, Optional[float]]:
+        vals = sorted(self.values)
+        return {f"p{q:g}": percentile(vals, q) for q in qs}
+
+@dataclass
+class _Group:
+    n: int = 0
+    correct: int = 0
+    score_sum: float = 0.0
+
+    def add(self, score: float) -> None:
+        self.n += 1
+        self.score_sum += score
+        if score >= 1.0:
+            self.correct += 1
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "samples": self.n,
+            "accuracy": self.correct / max(1, self.n),
+            "mean_score": self.score_sum / max(1, self.n),
+        }
+
+class DatasetStats:
+    """Accumulates accuracy/score overall and per domain, difficulty bucket and solver,
+    plus latency percentiles, from projected rows (see STATS_FIELDS)."""
+
+    def __init__(self, buckets: int = 10, reservoir_size: int = 10_000) -> None:
+        self.buckets = max(1, buckets)
+        self.total = _Group()
+        self.by_domain: Dict[str, _Group] = {}
+        self.by_bucket: Dict[str, _Group] = {}
+        self.by_solver: Dict[str, _Group] = {}
+        self.latency = Reservoir(size=reservoir_size)
+
+    def _bucket(self, difficulty: Optional[float]) -> str:
+        if difficulty is None:
+            return "unknown"
+        i = min(self.buckets - 1, int(float(difficulty) * self.buckets))
+        return f"{i / self.buckets:.2f}-{(i + 1) / self.buckets:.2f}"
+
+    def add(self, row: Dict[str, Any]) -> None:
+        score = float(row.get("verification.score") or 0.0)
+        self.total.add(score)
+        self.by_domain.setdefault(str(row.get("task.domain")), _Group()).add(score)
+        self.by_bucket.setdefault(self._bucket(row.get("task.difficulty")), _Group()).add(score)
+        self.by_solver.setdefault(str(row.get("solution.solver")), _Group()).add(score)
+        lat = row.get("solution.latency_ms")
+        if lat is not None:
+            self.latency.add(float(lat))
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            **self.total.summary(),
+            "by_domain": {k: g.summary() for k, g in sorted(self.by_domain.items())},
+            "by_difficulty": {k: g.summary() for k, g in sorted(self.by_bucket.items())},
+            "by_solver": {k: g.summary() for k, g in sorted(self.by_solver.items())},
+            "latency_ms": {"samples": self.latency.n, **self.latency.percentiles()},
+        }
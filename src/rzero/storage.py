@@ -1,26 +1,260 @@
 from __future__ import annotations
 
+import gzip
+import io
 import json
+import mmap
+import os
+from abc import ABC
 from pathlib import Path
-from typing import Iterable, Any
+from typing import IO, Any, Iterable, Iterator, Optional, Sequence, TypeVar
 
+from .records import SampleRecord, dumps, record_rows
 from .types import Sample
 
-def write_jsonl(samples: Iterable[Sample], path: str | Path) -> Path:
+# --- Compression is picked from the file suffix: .gz (stdlib) or .zst (needs `zstandard`).
+
+def _zstd() -> Any:
+    try:
+        import zstandard  # type: ignore
+    except Exception:  # pragma: no cover
+        raise RuntimeError("zstandard package not installed. Install with: pip install zstandard")
+    return zstandard
+
+def _wrap_writer(p: Path, raw: IO[bytes]) -> IO[bytes]:
+    if p.suffix == ".gz":
+        return gzip.GzipFile(fileobj=raw, mode="wb")  # appends a new gzip member
+    if p.suffix == ".zst":
+        return _zstd().ZstdCompressor().stream_writer(raw, closefd=False)
+    return raw
+
+def open_text(path: str | Path) -> IO[str]:
+    """Open a (possibly compressed) JSONL file for reading; multi-member/frame files are fine."""
+    p = Path(path).expanduser()
+    if p.suffix == ".gz":
+        return gzip.open(p, "rt", encoding="utf-8")
+    if p.suffix == ".zst":
+        raw = p.open("rb")
+        reader = _zstd().ZstdDecompressor().stream_reader(
+            raw, read_across_frames=True, closefd=True
+        )
+        return io.TextIOWrapper(reader, encoding="utf-8")
+    return p.open("r", encoding="utf-8")
+
+def iter_lines(path: str | Path) -> Iterator[str]:
+    """Yield non-empty lines; a truncated compressed tail (crash mid-write) ends iteration."""
+    with open_text(path) as f:
+        try:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield line
+        except EOFError:  # gzip member without trailer: everything flushed so far was yielded
+            return
+
+_S = TypeVar("_S", bound="Sink")
+
+def sample_rows(
+    samples: Iterable[Sample | SampleRecord],
+    episode: Optional[int] = None,
+) -> list[dict[str, Any]]:
+    """JSON rows for a batch; each item is encoded by its own kind (records, pydantic or mixed)."""
+    samples = list(samples)
+    if all(isinstance(s, SampleRecord) for s in samples):
+        return record_rows(samples, episode)  # type: ignore[arg-type]
+    rows: list[dict[str, Any]] = []
+    for s in samples:
+        if isinstance(s, SampleRecord):
+            rows.extend(record_rows([s], episode))
+            continue
+        row = s.model_dump(mode="json")
+        if episode is not None:
+            row["episode"] = episode
+        rows.append(row)
+    return rows
+
+class Sink(ABC):
+    """Receives samples as the loop produces them (see Trainer.sink).
+
+    Subclasses implement ``write_rows`` (already-serialised rows), or override ``write``.
+    """
+
+    def write(
+        self,
+        samples: Iterable[Sample | SampleRecord],
+        *,
+        episode: Optional[int] = None,
+    ) -> None:
+        self.write_rows(sample_rows(samples, episode))
+
+    def write_rows(self, rows: Iterable[dict[str, Any]]) -> Any:
+        raise NotImplementedError(f"{type(self).__name__} must implement write() or write_rows()")
+
+    def flush(self) -> None:
+        pass
+
+    def checkpoint(self) -> Optional[int]:
+        """Make everything written so far durable; return a resumable byte offset if any."""
+        self.flush()
+        return None
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self: _S) -> _S:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+class JsonlSink(Sink):
+    """Streaming JSONL writer with optional gzip/zstd compression.
+
+    Each ``write`` call (one episode, in the Trainer) is encoded and written as a single
+    block. The stream is flushed every ``flush_every`` writes and fsync'ed every
+    ``fsync_every`` writes (0 disables fsync), so a crash loses at most that window.
+    Rows written with an ``episode`` carry it as a top-level ``"episode"`` key.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        append: bool = True,
+        flush_every: int = 1,
+        fsync_every: int = 0,
+    ) -> None:
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_every = max(1, flush_every)
+        self.fsync_every = max(0, fsync_every)
+        self.count = 0
+        self._writes = 0
+        self._raw: IO[bytes] = self.path.open("ab" if append else "wb")
+        self._out = _wrap_writer(self.path, self._raw)
+
+    def write_rows(self, rows: Iterable[dict[str, Any]]) -> None:
+        """Write already-serialised rows as one block (counts as one write for flush/fsync)."""
+        lines = [dumps(row) for row in rows]
+        if not lines:
+            return
+        self._out.write(b"\n".join(lines) + b"\n")
+        self.count += len(lines)
+        self._writes += 1
+        if self.fsync_every and self._writes % self.fsync_every == 0:
+            self.flush(fsync=True)
+        elif self._writes % self.flush_every == 0:
+            self.flush()
+
+    def flush(self, fsync: bool = False) -> None:
+        if self._out is not self._raw:
+            self._out.flush()  # gzip: Z_SYNC_FLUSH, zstd: end current block
+        self._raw.flush()
+        if fsync:
+            os.fsync(self._raw.fileno())
+
+    def checkpoint(self) -> int:
+        """End the current gzip member / zstd frame, fsync, and return the file size.
+
+        The file up to that offset is complete on its own, so a resumed run can truncate
+        back to it and append (see rzero.checkpoint).
+        """
+        if self._out is not self._raw:
+            self._out.close()
+            self._raw.flush()
+            offset = self._raw.tell()
+            os.fsync(self._raw.fileno())
+            self._out = _wrap_writer(self.path, self._raw)
+            return offset
+        self.flush(fsync=True)
+        return self._raw.tell()
+
+    def close(self) -> None:
+        if self._raw.closed:
+            return
+        if self._out is not self._raw:
+            self._out.close()  # writes the gzip trailer / zstd frame end
+        self._raw.flush()
+        if self.fsync_every:
+            os.fsync(self._raw.fileno())
+        self._raw.close()
+
+def atomic_write_text(path: str | Path, text: str) -> Path:
+    """Write via a temp file + fsync + rename, so readers never see a partial file."""
     p = Path(path).expanduser()
     p.parent.mkdir(parents=True, exist_ok=True)
-    with p.open("w", encoding="utf-8") as f:
-        for s in samples:
-            f.write(json.dumps(s.model_dump(mode="json"), ensure_ascii=False) + "\n")
+    tmp = p.with_name(p.name + ".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, p)
     return p
 
-def read_jsonl(path: str | Path) -> list[dict[str, Any]]:
+def atomic_write_bytes(path: str | Path, data: bytes) -> Path:
+    """Like atomic_write_text, for bytes compressed by the path's suffix (.gz/.zst)."""
     p = Path(path).expanduser()
-    rows: list[dict[str, Any]] = []
-    with p.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            rows.append(json.loads(line))
-    return rows
\ No newline at end of file
+    p.parent.mkdir(parents=True, exist_ok=True)
+    tmp = p.with_name(p.name + ".tmp")
+    with tmp.open("wb") as raw:
+        f = _wrap_writer(p, raw)
+        f.write(data)
+        if f is not raw:
+            f.close()  # ends the gzip member / zstd frame, leaves raw open
+        raw.flush()
+        os.fsync(raw.fileno())
+    os.replace(tmp, p)
+    return p
+
+def write_jsonl(samples: Iterable[Sample], path: str | Path) -> Path:
+    with JsonlSink(path, append=False) as sink:
+        sink.write(samples)
+    return sink.path
+
+def _project(row: dict[str, Any], fields: Sequence[tuple[str, ...]]) -> dict[str, Any]:
+    out: dict[str, Any] = {}
+    for parts in fields:
+        v: Any = row
+        for k in parts:
+            v = v.get(k) if isinstance(v, dict) else None
+        out[".".join(parts)] = v
+    return out
+
+def _iter_mmap(p: Path) -> Iterator[bytes]:
+    with p.open("rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for line in iter(mm.readline, b""):
+                if line.strip():
+                    yield line
+
+def iter_jsonl(
+    path: str | Path,
+    *,
+    fields: Optional[Sequence[str]] = None,
+    use_mmap: bool = False,
+) -> Iterator[dict[str, Any]]:
+    """Lazily yield rows one at a time.
+
+    ``fields`` projects each row down to the given dotted paths (e.g. "verification.score"),
+    returned as a flat dict keyed by path (missing -> None), so the full nested row is
+    dropped immediately. ``use_mmap`` reads uncompressed files through a memory map
+    instead of buffered text IO; it is ignored for .gz/.zst.
+    """
+    p = Path(path).expanduser()
+    lines: Iterable[str | bytes]
+    if use_mmap and p.suffix not in (".gz", ".zst"):
+        lines = _iter_mmap(p)
+    else:
+        lines = iter_lines(p)
+    if fields is None:
+        for line in lines:
+            yield json.loads(line)
+        return
+    split = [tuple(f.split(".")) for f in fields]
+    for line in lines:
+        yield _project(json.loads(line), split)
+
+def read_jsonl(path: str | Path) -> list[dict[str, Any]]:
+    return list(iter_jsonl(path))
@@ -1,11 +1,31 @@
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
+from typing import List
 
 from .types import Task, Solution, Verification
+from .records import SolutionRecord, TaskRecord, VerificationRecord
 
 class Verifier(ABC):
     """Verifies a (task, solution) pair and returns a Verification."""
 
     @abstractmethod
-    def verify(self, task: Task, solution: Solution) -> Verification: ...
\ No newline at end of file
+    def verify(self, task: Task, solution: Solution) -> Verification: ...
+
+    # Optional batch hook; override when a whole batch can be verified more cheaply than one by one
+    def verify_batch(self, tasks: List[Task], solutions: List[Solution]) -> List[Verification]:
+        return [self.verify(t, s) for t, s in zip(tasks, solutions)]
+
+    # Optional fast-path hook (Trainer(records=True)); override to skip pydantic entirely
+    def verify_records(
+        self,
+        tasks: List[TaskRecord],
+        solutions: List[SolutionRecord],
+    ) -> List[VerificationRecord]:
+        models = self.verify_batch([t.to_model() for t in tasks], [s.to_model() for s in solutions])
+        return [VerificationRecord.from_model(v) for v in models]
+
+    # Optional async hook; override for natively async verifiers (defaults to a worker thread)
+    async def verify_async(self, task: Task, solution: Solution) -> Verification:
+        return await asyncio.to_thread(self.verify, task, solution)
@@ -0,0 +1,62 @@
+import time
+
+from rzero.adaptive import AdaptiveBatch
+from rzero.curriculum import Curriculum, wilson_interval
+from rzero.domains.arithmetic import ArithmeticChallenger, ArithmeticSolver, ArithmeticVerifier
+from rzero.loop import Trainer
+
+
+class SlowSolver(ArithmeticSolver):
+    def solve_batch(self, tasks):
+        time.sleep(0.002 * len(tasks))
+        return super().solve_batch(tasks)
+
+
+def test_wilson_interval_and_confident_stepping():
+    lo, hi = wilson_interval(7, 10)
+    assert 0.39 < lo < 0.4 and 0.89 < hi < 0.9
+    assert wilson_interval(0, 0) == (0.0, 1.0)
+
+    c = Curriculum(z=1.96)
+    assert c.observe(0.5, 9, 10) == 0.5  # 90% of 10 does not clear the 0.8 bound yet
+    assert c.observe(0.5, 10, 10) == 0.5
+    assert c.observe(0.5, 30, 30) == 0.55  # 49/50 does; evidence resets at the new difficulty
+    assert c.seen == 0
+    assert c.observe(0.55, 35, 50) == 0.55 and not c.converged(0.55)
+    assert c.observe(0.55, 245, 350) == 0.55 and c.converged(0.55)  # interval now inside the band
+    assert Curriculum().observe(0.5, 9, 10) == 0.55  # without z: one noisy episode decides
+
+
+def test_batch_sizing_and_budgets():
+    a = AdaptiveBatch(episode_seconds=1.0, task_budget=250, max_batch=200)
+    assert a.next_size(8) == 8
+    a.observe(8, 0.08)  # 10 ms per task -> 100 tasks per second
+    assert a.next_size(8) == 100
+    a.observe(100, 0.1)
+    assert a.next_size(8) == 137  # the EMA moves towards 1 ms per task
+    a.observe(120, 0.12)
+    assert a.next_size(8) == 250 - 228
+    a.observe(22, 0.02)
+    assert a.next_size(8) == 0 and a.stop_reason == "task budget spent"
+
+    t = AdaptiveBatch(time_budget=1.0)
+    t.observe(10, 0.9)
+    assert t.next_size(50) == 1  # 0.1 s left at 90 ms per task
+    t.observe(1, 0.2)
+    assert t.next_size(50) == 0 and t.stop_reason == "time budget spent"
+
+
+def test_trainer_stops_when_converged():
+    trainer = Trainer(
+        ArithmeticChallenger(),
+        SlowSolver(),
+        ArithmeticVerifier(),
+        curriculum=Curriculum(z=1.96),
+        difficulty=0.85,
+        adaptive=AdaptiveBatch(episode_seconds=0.05),
+    )
+    samples = trainer.run(episodes=50, batch_size=4)
+    # the heuristic solver is always right: difficulty climbs to the cap, then the run stops
+    assert trainer.difficulty == 0.95 and trainer.adaptive.stop_reason == "curriculum converged"
+    assert trainer.episode < 50 and len(samples) == trainer.adaptive.tasks
+    assert len(samples) > 4 * trainer.episode  # episodes grew from the observed latency
@@ -13,4 +13,79 @@ def test_arithmetic_smoke():
     samples = trainer.run(episodes=1, batch_size=5)
     assert len(samples) == 5
     # all should verify fine with heuristic solver
-    assert sum(1 for s in samples if s.verification.passed) == 5
\ No newline at end of file
+    assert sum(1 for s in samples if s.verification.passed) == 5
+
+def test_batch_eval_matches_safe_eval():
+    from rzero.domains.arithmetic import _EVAL_CACHE, _eval_batch, _safe_eval
+
+    exprs = [
+        "1 + 2 * 3", "7 / 2 - 1", "2 ** 3 ** 2", "9 // 2 % 4", "1 / 0", "(1 + 2) * 3", "-4 + 1",
+        "abs(1)", "1 + 2 * 3",
+    ]
+    _EVAL_CACHE.clear()
+    batch = _eval_batch(exprs)
+    _EVAL_CACHE.clear()  # the reference values must not come from the batch's cache entries
+    for e, got in zip(exprs, batch):
+        try:
+            want = _safe_eval(e)
+        except Exception as err:
+            assert type(got) is type(err)
+        else:
+            assert got == want
+
+def test_tree_generator_is_seeded_deep_and_carries_answers(tmp_path):
+    from rzero.domains.arithmetic import TreeArithmeticChallenger, _safe_eval
+    from rzero.types import Solution
+
+    a, b = TreeArithmeticChallenger(7), TreeArithmeticChallenger(7)
+    tasks = a.propose_batch(50, difficulty=1.0)
+    again = b.propose_batch(50, difficulty=1.0)
+    assert [(t.id, t.prompt) for t in tasks] == [(t.id, t.prompt) for t in again]
+    # depth 8: the left spine alone nests 7 times
+    assert all(t.prompt.count("(") >= 6 for t in tasks)
+    assert all(_safe_eval(t.prompt) == t.meta["answer"] for t in tasks)
+
+    # the verifier trusts the stored answer rather than re-evaluating the prompt
+    rigged = tasks[0].model_copy(update={"meta": {"answer": 1.0}})
+    answer = Solution(task_id=rigged.id, content="1")
+    assert ArithmeticVerifier().verify_batch([rigged], [answer])[0].passed
+    assert ArithmeticVerifier().verify(rigged, answer).passed
+
+    solver, verifier = ArithmeticSolver(), ArithmeticVerifier()
+    assert all(v.passed for v in verifier.verify_batch(tasks, solver.solve_batch(tasks)))
+
+    # generator state round-trips through the checkpoint hooks
+    a.save(str(tmp_path / "rng.json"))
+    nxt = a.propose_batch(5, difficulty=0.5)
+    a.load(str(tmp_path / "rng.json"))
+    assert [t.prompt for t in a.propose_batch(5, difficulty=0.5)] == [t.prompt for t in nxt]
+
+def test_compiled_eval_guards_and_memoises():
+    import pytest
+
+    from rzero.domains.arithmetic import _EVAL_CACHE, _eval_batch, _safe_eval, compile_expr
+
+    f = compile_expr("-(2 + 3) * 4 ** 0.5")
+    assert f() == f() == -10.0
+    for bad in ("True + 1", "abs(1)", "x + 1", "1 < 2"):
+        with pytest.raises(ValueError):
+            compile_expr(bad)
+    with pytest.raises(ValueError, match="exponent"):
+        _safe_eval("2 ** 10 ** 6")
+    assert isinstance(_eval_batch(["9 ** 99999"])[0], ValueError)  # flat column path guards too
+
+    _EVAL_CACHE.clear()
+    for _ in range(3):
+        with pytest.raises(ZeroDivisionError):
+            _safe_eval("(1 + 2) / 0")
+        assert _safe_eval("(1 + 2) * 3") == 9.0
+    assert _EVAL_CACHE.stats.hits >= 4 and len(_EVAL_CACHE) == 2
+
+def test_batch_eval_shares_the_cache():
+    from rzero.domains.arithmetic import _EVAL_CACHE, _eval_batch
+
+    _EVAL_CACHE.clear()
+    assert _eval_batch(["1 + 2 * 3", "4 - 1"]) == [7.0, 3.0]
+    hits = _EVAL_CACHE.stats.hits
+    assert _eval_batch(["4 - 1", "1 + 2 * 3", "4 - 1"]) == [3.0, 7.0, 3.0]
+    assert _EVAL_CACHE.stats.hits == hits + 2  # verify_batch after solve_batch: all hits
@@ -0,0 +1,47 @@
+import asyncio
+from types import SimpleNamespace
+
+from rzero.curriculum import Curriculum
+from rzero.domains.code_io import CodeIOChallenger, CodeIOSolver, CodeIOVerifier
+from rzero.loop import AsyncTrainer
+from rzero.solvers.llm_codeio import CodeIOLLMSolver
+
+
+class FakeAsyncClient:
+    """Mimics openai.AsyncOpenAI.chat.completions.create, answering with the heuristic code."""
+
+    def __init__(self, delay: float = 0.02) -> None:
+        self.delay = delay
+        self.in_flight = 0
+        self.peak = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, **kwargs):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        user = kwargs["messages"][-1]["content"]
+        name = user.split("Function name must be exactly: ")[1].split("\n")[0]
+        task = SimpleNamespace(id="x", meta={"spec": {"name": name}})
+        code = CodeIOSolver().solve(task).content  # type: ignore[arg-type]
+        message = SimpleNamespace(content=f"```python\n{code}```")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def test_async_trainer_with_fake_client():
+    client = FakeAsyncClient()
+    trainer = AsyncTrainer(
+        challenger=CodeIOChallenger(),
+        solver=CodeIOLLMSolver(model="test-model", async_client=client),
+        verifier=CodeIOVerifier(),
+        curriculum=Curriculum(),
+        solve_concurrency=8,
+    )
+    samples = asyncio.run(trainer.run_async(episodes=2, batch_size=20))
+    assert len(samples) == 40
+    assert all(s.verification.passed for s in samples)
+    assert all(s.solution.latency_ms is not None for s in samples)
+    assert 1 < client.peak <= 8
@@ -0,0 +1,21 @@
+from rzero import bench
+
+
+def test_suite_runs_and_compares_against_baseline(tmp_path):
+    report = bench.run_suite(
+        ["safe_eval", "sample_construct", "trainer_run"],
+        sizes=[5],
+        episodes=[1, 2],
+        repeat=1,
+        warmup=0,
+    )
+    assert set(report["results"]) == {
+        "safe_eval[n=5]", "sample_construct[n=5]", "trainer_run[e=1,n=5]", "trainer_run[e=2,n=5]",
+    }
+    assert report["results"]["trainer_run[e=2,n=5]"]["items"] == 10
+
+    baseline = bench.load(bench.save(report, tmp_path / "base.json"))
+    assert not any(r["regressed"] for r in bench.compare(report, baseline))
+    for r in baseline["results"].values():
+        r["items_per_s"] *= 10  # pretend the baseline was 10x faster
+    assert all(r["regressed"] for r in bench.compare(report, baseline, tolerance=0.5))
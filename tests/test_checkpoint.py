@@ -0,0 +1,94 @@
+import importlib.util
+import random
+from pathlib import Path
+
+from rzero.domains.code_io import CodeIOChallenger, CodeIOVerifier
+from rzero.loop import Trainer
+from rzero.solvers.trainable_template import CodeIOTrainable
+from rzero.storage import JsonlSink, read_jsonl
+
+_spec = importlib.util.spec_from_file_location(
+    "rewrite_template", Path(__file__).parents[1] / "src/rzero/challengers.py/trainable_template.py"
+)
+rewrite = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(rewrite)
+
+
+def _components():
+    return dict(challenger=CodeIOChallenger(), solver=CodeIOTrainable(), verifier=CodeIOVerifier())
+
+
+def _trainer(sink, ckpt):
+    return Trainer(**_components(), sink=sink, checkpoint=str(ckpt), keep_samples=False)
+
+
+def _rows(path):
+    rows = read_jsonl(path)
+    for r in rows:
+        r["task"].pop("created_at")
+    return rows
+
+
+def test_resume_continues_exactly(tmp_path):
+    random.seed(11)
+    with JsonlSink(tmp_path / "full.jsonl.gz", append=False) as sink:
+        full = _trainer(sink, tmp_path / "full.ckpt")
+        full.run(episodes=6, batch_size=5)
+
+    random.seed(11)
+    part = tmp_path / "part.jsonl.gz"
+    with JsonlSink(part, append=False) as sink:
+        first = _trainer(sink, tmp_path / "part.ckpt")
+        first.run(episodes=3, batch_size=5)
+        sink.write(first.run_episode(5)[0], episode=3)  # "crashed" mid-episode 3, after writing
+
+    random.seed(999)  # a fresh process would have unrelated RNG state
+    resumed = _trainer(None, tmp_path / "part.ckpt")
+    ckpt = resumed.resume(str(tmp_path / "part.ckpt"))
+    assert ckpt.episode == 3 and ckpt.solver_state and ckpt.challenger_state is None
+    ckpt.truncate_dataset()
+    with JsonlSink(part) as sink:
+        resumed.sink = sink
+        resumed.run(episodes=3, batch_size=5)
+
+    assert _rows(part) == _rows(tmp_path / "full.jsonl.gz")
+    assert resumed.difficulty == full.difficulty and resumed.episode == 6
+
+
+def test_challenger_state_roundtrip(tmp_path):
+    ch = rewrite.RewriteChallengerTrainable()
+    ch.bias = 0.14
+    ch.save(str(tmp_path / "c.json"))
+    other = rewrite.RewriteChallengerTrainable()
+    other.load(str(tmp_path / "c.json"))
+    assert other.bias == 0.14
+
+
+def test_pipelined_and_async_loops_checkpoint(tmp_path):
+    import asyncio
+
+    from rzero.checkpoint import TrainerCheckpoint
+    from rzero.loop import AsyncTrainer
+    from rzero.pipeline import PipelinedTrainer
+
+    with JsonlSink(tmp_path / "pipe.jsonl", append=False) as sink:
+        piped = PipelinedTrainer(
+            **_components(),
+            sink=sink,
+            checkpoint=str(tmp_path / "pipe.ckpt"),
+            checkpoint_every=2,
+            keep_samples=False,
+        )
+        piped.run(episodes=3, batch_size=4)
+    ckpt = TrainerCheckpoint.load(tmp_path / "pipe.ckpt")
+    assert ckpt.episode == 3 and ckpt.solver_state  # every 2 episodes, plus one at the end
+    assert ckpt.dataset_offset == (tmp_path / "pipe.jsonl").stat().st_size
+
+    resumed = PipelinedTrainer(**_components(), checkpoint=str(tmp_path / "pipe.ckpt"))
+    resumed.resume(str(tmp_path / "pipe.ckpt"))
+    assert len(resumed.run(episodes=2, batch_size=4)) == 8 and resumed.episode == 5
+    assert TrainerCheckpoint.load(tmp_path / "pipe.ckpt").episode == 5
+
+    async_trainer = AsyncTrainer(**_components(), checkpoint=str(tmp_path / "async.ckpt"))
+    asyncio.run(async_trainer.run_async(episodes=2, batch_size=4))
+    assert TrainerCheckpoint.load(tmp_path / "async.ckpt").episode == 2
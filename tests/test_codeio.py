@@ -12,4 +12,99 @@ def test_codeio_smoke():
     )
     samples = trainer.run(episodes=1, batch_size=6)
     assert len(samples) == 6
-    assert sum(1 for s in samples if s.verification.passed) >= 4  # some randomness allowed
\ No newline at end of file
+    assert sum(1 for s in samples if s.verification.passed) >= 4  # some randomness allowed
+
+def test_sandboxed_verifier_survives_infinite_loop():
+    from rzero.sandbox import SandboxPool
+    from rzero.types import Solution
+
+    task = CodeIOChallenger().propose_batch(1, difficulty=0.5)[0]
+    good = CodeIOSolver().solve(task)
+    name = task.meta["name"]
+    hang = Solution(task_id=task.id, content=f"def {name}(*a):\n    while True:\n        pass\n")
+    with SandboxPool(1, timeout_s=0.5, max_tasks=2) as pool:
+        verifier = CodeIOVerifier(sandbox=pool)
+        assert verifier.verify(task, good).passed
+        bad = verifier.verify(task, hang)
+        assert not bad.passed and "timeout" in bad.feedback
+        assert verifier.verify(task, good).passed  # replacement worker picked up
+        assert pool.stats.timeouts == 1
+
+        from rzero.cache import LRUCache
+        cached = CodeIOVerifier(sandbox=pool, cache=LRUCache(max_entries=10))
+        assert "timeout" in cached.verify(task, hang).feedback
+        assert len(cached.cache) == 0  # a timeout may pass on retry, so it is not memoised
+        cached.verify(task, good)
+        assert len(cached.cache) == 1
+
+def test_sandboxed_verify_batch_uses_every_worker():
+    import threading
+
+    from rzero.cache import LRUCache
+    from rzero.sandbox import SandboxPool
+    from rzero.types import Solution
+
+    tasks = CodeIOChallenger().propose_batch(4, difficulty=0.5)
+    sols = [CodeIOSolver().solve(t) for t in tasks]
+    hang = [
+        Solution(task_id=t.id, content=f"def {t.meta['name']}(*a):  # {i}\n    while True:\n"
+                 "        pass\n")
+        for i, t in enumerate(tasks)
+    ]
+    with SandboxPool(4, timeout_s=0.3) as pool:
+        verifier = CodeIOVerifier(sandbox=pool, cache=LRUCache(max_entries=10))
+        assert [v.passed for v in verifier.verify_batch(tasks, sols)] == [True] * 4
+        assert all(v.meta == {"cache": "hit"} for v in verifier.verify_batch(tasks, sols))
+        timed_out = verifier.verify_batch(tasks, hang)
+        assert all("timeout" in v.feedback for v in timed_out) and pool.stats.timeouts == 4
+        assert len(verifier.cache) == len({s.content for s in sols})  # timeouts not memoised
+
+        run, together = pool.run, threading.Barrier(4, timeout=10)
+
+        def run_after_barrier(*job):
+            together.wait()  # only passes once four runs are in flight at the same time
+            return run(*job)
+
+        pool.run = run_after_barrier
+        verified = CodeIOVerifier(sandbox=pool).verify_batch(tasks, sols)
+        assert all(v.passed for v in verified)
+
+def test_sandbox_respawn_failure_propagates_and_pool_recovers():
+    import pytest
+
+    from rzero.sandbox import SandboxPool
+
+    tests = [[[1, 2], 3]]
+    hang = "def f(*a):\n    while True:\n        pass\n"
+    with SandboxPool(1, timeout_s=0.3) as pool:
+        assert pool._respawn_ctx.get_start_method() in ("forkserver", "spawn")  # never fork mid-run
+        spawn = pool._spawn
+
+        def broken(ctx=None):
+            raise OSError("no more processes")
+
+        pool._spawn = broken
+        with pytest.raises(OSError):
+            pool.run(hang, "f", tests)  # times out, then the replacement fails to start
+        assert pool._idle.empty() and not pool._all  # the killed worker was not put back
+        pool._spawn = spawn
+        assert pool.run("def f(a, b):\n    return a + b\n", "f", tests) == (1, "")
+
+
+def test_verification_cache_hits_and_persists(tmp_path):
+    from rzero.cache import LRUCache
+
+    tasks = CodeIOChallenger().propose_batch(30, difficulty=0.5)
+    solver = CodeIOSolver()
+    cache = LRUCache(max_entries=2)
+    verifier = CodeIOVerifier(cache=cache)
+    results = [verifier.verify(t, solver.solve(t)) for t in tasks]
+    assert all(r.passed for r in results)
+    assert cache.stats.hits + cache.stats.misses == 30 and cache.stats.hits > 0
+    assert len(cache) <= 2
+    assert any(r.meta.get("cache") == "hit" for r in results)
+
+    path = tmp_path / "verify-cache.json"
+    cache.save_json(path)
+    warm = LRUCache(max_entries=2)
+    assert warm.load_json(path) == len(cache)
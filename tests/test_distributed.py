@@ -0,0 +1,63 @@
+import random
+import threading
+from multiprocessing.connection import Client
+
+from rzero.distributed import Coordinator, DistributedTrainer, start_local_workers
+from rzero.domains.arithmetic import ArithmeticChallenger, ArithmeticSolver, ArithmeticVerifier
+from rzero.loop import Trainer
+
+
+def _trainer(cls, **kw):
+    random.seed(3)
+    return cls(ArithmeticChallenger(), ArithmeticSolver(), ArithmeticVerifier(), **kw)
+
+
+def test_distributed_matches_local_trainer():
+    with Coordinator(lease_size=5, authkey=b"k") as coord:
+        procs = start_local_workers(2, coord.address, authkey=b"k")
+        trainer = _trainer(DistributedTrainer, coordinator=coord)
+        samples = trainer.run(episodes=3, batch_size=12)
+    for p in procs:
+        p.join(timeout=5)
+    local = _trainer(Trainer)
+    expected = local.run(episodes=3, batch_size=12)
+    assert [s.task.id for s in samples] == [s.task.id for s in expected]
+    assert [s.verification.passed for s in samples] == [s.verification.passed for s in expected]
+    assert trainer.difficulty == local.difficulty
+    assert coord.stats.leases == 9 and coord.stats.workers_seen == 2
+    assert all(p.exitcode == 0 for p in procs)
+
+
+def test_lease_of_dead_worker_is_reclaimed():
+    with Coordinator(lease_size=4, authkey=b"k") as coord:
+        # a worker that takes a lease and disappears without answering
+        flaky = Client(coord.address, authkey=b"k")
+        trainer = _trainer(DistributedTrainer, coordinator=coord)
+        coord.set_components(trainer.solver, trainer.verifier)
+        tasks = trainer.challenger.propose_batch(8, difficulty=0.5)
+        result = {}
+        t = threading.Thread(target=lambda: result.setdefault("samples", coord.run_batch(tasks)))
+        t.start()
+        flaky.send(("ready",))
+        assert flaky.recv()[0] == "lease"
+        flaky.close()
+        procs = start_local_workers(1, coord.address, authkey=b"k")
+        t.join(timeout=10)
+    for p in procs:
+        p.join(timeout=5)
+    assert [s.task.id for s in result["samples"]] == [t.id for t in tasks]
+    assert coord.stats.reclaimed >= 1 and coord.stats.workers_lost >= 1
+
+
+def test_authkey_required_off_loopback(monkeypatch):
+    import pytest
+
+    from rzero.distributed import coordinator_authkey
+
+    monkeypatch.delenv("RZERO_AUTHKEY", raising=False)
+    with pytest.raises(ValueError, match="RZERO_AUTHKEY"):
+        coordinator_authkey(("0.0.0.0", 7000))
+    key, generated = coordinator_authkey(("127.0.0.1", 0))
+    assert generated and len(key) == 32 and key != coordinator_authkey(("localhost", 0))[0]
+    monkeypatch.setenv("RZERO_AUTHKEY", "secret")
+    assert coordinator_authkey(("0.0.0.0", 7000)) == (b"secret", False)
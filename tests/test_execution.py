@@ -0,0 +1,27 @@
+import random
+
+import pytest
+
+from rzero.curriculum import Curriculum
+from rzero.domains.arithmetic import ArithmeticChallenger, ArithmeticSolver, ArithmeticVerifier
+from rzero.loop import Trainer
+
+
+@pytest.mark.parametrize("executor", ["serial", "thread", "process", "asyncio"])
+def test_executors_match_serial(executor):
+    def _run(kind):
+        random.seed(1234)
+        trainer = Trainer(
+            challenger=ArithmeticChallenger(),
+            solver=ArithmeticSolver(),
+            verifier=ArithmeticVerifier(),
+            curriculum=Curriculum(),
+            difficulty=0.7,
+            executor=kind,
+            workers=4,
+            max_in_flight=3,
+        )
+        samples = trainer.run(episodes=2, batch_size=16)
+        return [s.task.id for s in samples], trainer.difficulty
+
+    assert _run(executor) == _run("serial")
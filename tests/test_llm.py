@@ -0,0 +1,131 @@
+import asyncio
+from types import SimpleNamespace
+
+from rzero.cache import ResponseCache
+from rzero.domains.code_io import CodeIOChallenger, CodeIOSolver
+from rzero.solvers.llm_codeio import CodeIOLLMSolver
+
+
+def _reply(kwargs):
+    user = kwargs["messages"][-1]["content"]
+    name = user.split("Function name must be exactly: ")[1].split("\n")[0]
+    code = CodeIOSolver().solve(SimpleNamespace(id="x", meta={"spec": {"name": name}})).content  # type: ignore[arg-type]
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=code))])
+
+
+class FakeClient:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **kwargs):
+        self.calls += 1
+        return _reply(kwargs)
+
+
+class FakeAsyncClient(FakeClient):
+    async def create(self, **kwargs):  # type: ignore[override]
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return _reply(kwargs)
+
+
+def test_response_cache_and_batch_dedup(tmp_path):
+    tasks = CodeIOChallenger().propose_batch(12, difficulty=0.5)
+    distinct = len({t.meta["name"] for t in tasks})
+    client = FakeClient()
+    cache = ResponseCache(ttl_s=60, path=tmp_path / "llm.sqlite")
+    sols = CodeIOLLMSolver(model="m", client=client, cache=cache).solve_batch(tasks)
+    assert client.calls == distinct
+    assert [s.task_id for s in sols] == [t.id for t in tasks]
+    assert {s.meta["cache"] for s in sols} <= {"miss", "coalesced"}
+
+    # a fresh process-level cache backed by the same SQLite file answers without calling out
+    warm_client = FakeClient()
+    cache = ResponseCache(path=tmp_path / "llm.sqlite")
+    warm = CodeIOLLMSolver(model="m", client=warm_client, cache=cache)
+    assert all(warm.solve(t).meta["cache"] == "hit" for t in tasks)
+    assert warm_client.calls == 0
+
+
+def test_sampling_models_are_not_coalesced():
+    tasks = CodeIOChallenger().propose_batch(12, difficulty=0.5)
+    client = FakeClient()
+    # gpt-5 models sample at their default temperature
+    sols = CodeIOLLMSolver(model="gpt-5-mini", client=client).solve_batch(tasks)
+    assert client.calls == len(tasks) and {s.meta["cache"] for s in sols} == {"miss"}
+
+    opted_in = FakeClient()
+    CodeIOLLMSolver(model="gpt-5-mini", client=opted_in, coalesce=True).solve_batch(tasks)
+    assert opted_in.calls == len({t.meta["name"] for t in tasks})
+
+
+def test_async_requests_are_coalesced():
+    tasks = CodeIOChallenger().propose_batch(20, difficulty=0.5)
+    client = FakeAsyncClient()
+    solver = CodeIOLLMSolver(model="m", async_client=client)
+
+    async def _all():
+        return await asyncio.gather(*(solver.solve_async(t) for t in tasks))
+
+    sols = asyncio.run(_all())
+    assert client.calls == len({t.meta["name"] for t in tasks})
+    assert sum(s.meta["cache"] == "coalesced" for s in sols) == len(tasks) - client.calls
+
+
+def test_shared_http_client_retries_and_pools():
+    import json
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    from rzero.llm import LLM
+
+    seen = {"requests": 0, "connections": set()}
+
+    class Stub(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            seen["requests"] += 1
+            seen["connections"].add(self.client_address)
+            if seen["requests"] <= 2:
+                payload, status = b'{"error": "slow down"}', 429
+                headers = {"Retry-After": "0"}
+            else:
+                message = _reply(body).choices[0].message.__dict__
+                payload, status = json.dumps({"choices": [{"message": message}]}).encode(), 200
+                headers = {"x-ratelimit-remaining-requests": "100"}
+            self.send_response(status)
+            headers["Content-Type"] = "application/json"
+            headers["Content-Length"] = str(len(payload))
+            for k, v in headers.items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Stub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        llm = LLM(
+            base_url=f"http://127.0.0.1:{server.server_port}/v1",
+            api_key="k",
+            concurrency=4,
+            backoff_base_s=0.0,
+        )
+        tasks = CodeIOChallenger().propose_batch(6, difficulty=0.5)
+        # two solvers sharing one client
+        a = CodeIOLLMSolver(model="m", client=llm).solve_batch(tasks[:3])
+        b = CodeIOLLMSolver(model="m", client=llm).solve_batch(tasks[3:])
+        assert all(not s.meta.get("error") for s in a + b)
+        assert llm.stats["throttled"] == 2 and llm.stats["retries"] == 2
+        assert llm.stats["errors"] == 0
+        assert llm.limiter.limit < 4  # backed off after the 429s
+        assert len(seen["connections"]) == 1  # every request reused one keep-alive connection
+        llm.close()
+    finally:
+        server.shutdown()
+        server.server_close()
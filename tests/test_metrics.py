@@ -0,0 +1,35 @@
+import json
+
+from rzero.cache import LRUCache
+from rzero.domains.code_io import CodeIOChallenger, CodeIOSolver, CodeIOVerifier
+from rzero.loop import Trainer
+from rzero.metrics import Metrics
+
+
+def test_trainer_metrics_stages_counters_and_exports(tmp_path):
+    metrics = Metrics()
+    trainer = Trainer(
+        challenger=CodeIOChallenger(),
+        solver=CodeIOSolver(),
+        verifier=CodeIOVerifier(cache=LRUCache()),
+        metrics=metrics,
+    )
+    trainer.run(episodes=4, batch_size=10)
+    summary = metrics.summary()
+    for stage in ("episode", "propose", "solve", "verify", "update"):
+        h = summary["stages"][stage]
+        assert h["count"] == 4 and 0 <= h["p50"] <= h["p95"] <= h["p99"] <= h["max"]
+    assert summary["counters"]["tasks"] == 40 and summary["counters"]["passes"] == 40
+    assert summary["counters"]["cache_hits"] > 0  # verifier cache: only 3 distinct specs
+
+    written = json.loads(metrics.write_json(tmp_path / "m.json").read_text())
+    assert written["counters"]["tasks"] == 40
+    prom = metrics.write_prometheus(tmp_path / "m.prom").read_text()
+    assert 'rzero_stage_seconds{stage="solve",quantile="0.95"}' in prom
+    assert "rzero_tasks_total 40" in prom
+
+
+def test_metrics_disabled_by_default():
+    trainer = Trainer(CodeIOChallenger(), CodeIOSolver(), CodeIOVerifier())
+    trainer.run(episodes=1, batch_size=4)
+    assert trainer.metrics is None
@@ -0,0 +1,88 @@
+import time
+
+from rzero.domains.arithmetic import ArithmeticChallenger, ArithmeticSolver, ArithmeticVerifier
+from rzero.domains.code_io import CodeIOChallenger, CodeIOSolver, CodeIOVerifier
+from rzero.loop import Trainer
+from rzero.multidomain import DomainSlot, MultiDomainTrainer, Scheduler
+from rzero.types import Solution
+
+
+class WrongSolver(ArithmeticSolver):
+    def solve_batch(self, tasks):
+        return [Solution(task_id=t.id, content="nope") for t in tasks]
+
+
+class SlowCodeSolver(CodeIOSolver):
+    def solve_batch(self, tasks):
+        time.sleep(0.2)
+        return super().solve_batch(tasks)
+
+
+class SlowArithSolver(ArithmeticSolver):
+    def solve_batch(self, tasks):
+        time.sleep(0.2)
+        return super().solve_batch(tasks)
+
+
+def _slot(name, challenger, solver, verifier, **kw):
+    return DomainSlot(name, Trainer(challenger, solver, verifier, keep_samples=False), **kw)
+
+
+def test_scheduler_allocation():
+    a, b = _slot("a", None, None, None), _slot("b", None, None, None, weight=3.0)
+    assert Scheduler().allocate([a, b], 10) == [3, 7]
+    a.tasks_per_s, b.tasks_per_s = 900.0, 100.0
+    b.weight = 1.0
+    assert Scheduler("throughput").allocate([a, b], 20) == [17, 3]  # 1 reserved each, 18 split 9:1
+    assert Scheduler("throughput", min_tasks=5).allocate([a, b], 20) == [14, 6]
+    a.accuracy, b.accuracy = 1.0, 0.5  # a is saturated, b is in the learning zone
+    assert Scheduler("learning").allocate([a, b], 10) == [1, 9]
+    assert sum(Scheduler("learning").allocate([a, b], 1)) == 1
+
+
+def test_mixed_episode_has_per_domain_curricula():
+    trainer = MultiDomainTrainer([
+        _slot("arithmetic", ArithmeticChallenger(), ArithmeticSolver(), ArithmeticVerifier()),
+        _slot("broken", ArithmeticChallenger(), WrongSolver(), ArithmeticVerifier()),
+    ])
+    samples = trainer.run(episodes=3, batch_size=10)
+    assert len(samples) == 30
+    assert [s.verification.passed for s in samples[:4]] == [True, False, True, False]  # interleaved
+    assert trainer.difficulties["arithmetic"] > 0.5 > trainer.difficulties["broken"]
+    assert trainer.summary()["broken"]["accuracy"] == 0.0
+
+
+def test_domains_run_concurrently():
+    trainer = MultiDomainTrainer([
+        _slot("arithmetic", ArithmeticChallenger(), SlowArithSolver(), ArithmeticVerifier()),
+        _slot("code-io", CodeIOChallenger(), SlowCodeSolver(), CodeIOVerifier()),
+    ], scheduler=Scheduler("throughput"))
+    t0 = time.perf_counter()
+    samples, accuracy = trainer.run_episode(8)
+    assert time.perf_counter() - t0 < 0.35  # two 0.2 s solves overlapped
+    assert {s.task.domain for s in samples} == {"arithmetic", "code-io"} and accuracy == 1.0
+
+
+def test_from_plugins():
+    trainer = MultiDomainTrainer.from_plugins(
+        ["arithmetic", "code-io"], difficulty=0.3, records=True
+    )
+    assert len(trainer.run(episodes=1, batch_size=6)) == 6
+
+
+def test_records_and_model_domains_mix(tmp_path):
+    from rzero.storage import JsonlSink, read_jsonl
+
+    arithmetic = Trainer(
+        ArithmeticChallenger(), ArithmeticSolver(), ArithmeticVerifier(), records=True
+    )
+    trainer = MultiDomainTrainer([
+        DomainSlot("arithmetic", arithmetic),
+        _slot("code-io", CodeIOChallenger(), CodeIOSolver(), CodeIOVerifier()),
+    ])
+    with JsonlSink(tmp_path / "mixed.jsonl") as sink:
+        trainer.sink = sink
+        samples = trainer.run(episodes=2, batch_size=6)
+    rows = read_jsonl(tmp_path / "mixed.jsonl")
+    assert len(rows) == len(samples) == 12
+    assert {r["task"]["domain"] for r in rows} == {"arithmetic", "code-io"}
@@ -0,0 +1,115 @@
+import threading
+import time
+
+from rzero.domains.arithmetic import ArithmeticChallenger, ArithmeticSolver, ArithmeticVerifier
+from rzero.pipeline import PipelinedTrainer
+
+
+class SlowSolver(ArithmeticSolver):
+    def __init__(self, ahead=None):
+        self.updates = 0
+        self.seen_at_solve = []  # updates applied when each solve call started
+        self.ahead = ahead
+        self.overlapped = None
+
+    def solve_batch(self, tasks):
+        self.seen_at_solve.append(self.updates)
+        if self.ahead is not None and self.overlapped is None:
+            # a serial loop would only propose the next episode after this call returns
+            self.overlapped = self.ahead.wait(timeout=5)
+        time.sleep(0.05)
+        return super().solve_batch(tasks)
+
+    def update(self, samples):
+        self.updates += 1
+
+
+class SlowChallenger(ArithmeticChallenger):
+    def __init__(self):
+        self.calls = 0
+        self.ahead = threading.Event()  # set when proposing beyond the first episode
+
+    def propose_batch(self, n, *, difficulty):
+        self.calls += 1
+        if self.calls > 1:
+            self.ahead.set()
+        time.sleep(0.05)
+        return super().propose_batch(n, difficulty=difficulty)
+
+
+def test_pipeline_overlaps_stages_within_staleness_bound():
+    challenger = SlowChallenger()
+    solver = SlowSolver(ahead=challenger.ahead)
+    trainer = PipelinedTrainer(
+        challenger=challenger,
+        solver=solver,
+        verifier=ArithmeticVerifier(),
+        prefetch=2,
+        max_staleness=1,
+    )
+    samples = trainer.run(episodes=6, batch_size=8)
+    assert len(samples) == 48 and trainer.episode == 6 and solver.updates == 6
+    assert solver.overlapped  # episode 2 was proposed while episode 1 was being solved
+    assert all(i - seen <= 1 for i, seen in enumerate(solver.seen_at_solve))
+    summary = trainer.stats.summary()
+    assert summary["stages"]["solve"]["items"] == 48
+    assert summary["bottleneck"] in ("propose", "solve")
+
+
+def test_pipeline_without_staleness_sees_every_update():
+    solver = SlowSolver()
+    trainer = PipelinedTrainer(
+        challenger=ArithmeticChallenger(),
+        solver=solver,
+        verifier=ArithmeticVerifier(),
+        chunk_size=3,
+        max_staleness=0,
+    )
+    samples = trainer.run(episodes=4, batch_size=7)
+    assert len(samples) == 28
+    # chunks of 3 -> 3 solve calls per episode, all after the previous episode's update
+    assert solver.seen_at_solve == [0, 0, 0, 1, 1, 1, 2, 2, 2, 3, 3, 3]
+
+
+def test_pipeline_shares_episode_bookkeeping():
+    from rzero.adaptive import AdaptiveBatch
+
+    trainer = PipelinedTrainer(
+        challenger=ArithmeticChallenger(),
+        solver=ArithmeticSolver(),
+        verifier=ArithmeticVerifier(),
+        adaptive=AdaptiveBatch(task_budget=20),
+    )
+    samples = trainer.run(episodes=10, batch_size=8)
+    assert len(samples) == 20 and trainer.episode == 3  # 8 + 8 + 4, then the budget stops proposing
+    assert trainer.adaptive.tasks == 20 and trainer.adaptive.stop_reason == "task budget spent"
+
+
+def test_pipeline_honours_records_and_times_storage_and_checkpoints(tmp_path):
+    from rzero.records import SampleRecord
+    from rzero.storage import JsonlSink
+    from rzero.types import Sample
+
+    class RecordSolver(ArithmeticSolver):
+        def solve_records(self, tasks):
+            self.saw = type(tasks[0]).__name__
+            return super().solve_records(tasks)
+
+    solver = RecordSolver()
+    with JsonlSink(tmp_path / "s.jsonl") as sink:
+        trainer = PipelinedTrainer(
+            challenger=ArithmeticChallenger(),
+            solver=solver,
+            verifier=ArithmeticVerifier(),
+            records=True,
+            sink=sink,
+            checkpoint=str(tmp_path / "run.ckpt"),
+            checkpoint_every=2,
+        )
+        samples = trainer.run(episodes=3, batch_size=4)
+    assert solver.saw == "TaskRecord"
+    assert len(samples) == 12 and all(isinstance(s, Sample) for s in samples)
+    assert not isinstance(samples[0], SampleRecord)
+    stages = trainer.stats.summary()["stages"]
+    assert stages["storage"]["items"] == 12 and stages["update"]["items"] == 12
+    assert stages["checkpoint"]["items"] == 2  # after episode 2 and at the end of the run
@@ -0,0 +1,78 @@
+from typing import List
+
+import pytest
+
+from rzero import plugins
+from rzero.domains.arithmetic import ArithmeticChallenger, ArithmeticSolver, ArithmeticVerifier
+from rzero.domains.code_io import CodeIOChallenger, CodeIOSolver, CodeIOVerifier
+from rzero.loop import Trainer
+from rzero.plugins import Capabilities, DomainPlugin, capabilities_of, plan_execution
+from rzero.solver import Solver
+from rzero.types import Solution, Task
+
+
+class EchoSolver(Solver):
+    def solve(self, task: Task) -> Solution:
+        return Solution(task_id=task.id, content=task.prompt)
+
+
+class AsyncEchoSolver(EchoSolver):
+    capabilities = Capabilities(thread_safe=True)
+
+    async def solve_async(self, task: Task) -> Solution:
+        return self.solve(task)
+
+    def solve_batch(self, tasks: List[Task]) -> List[Solution]:
+        return [self.solve(t) for t in tasks]
+
+
+def test_capabilities_are_declared_or_inferred():
+    assert capabilities_of(EchoSolver()) == Capabilities()
+    caps = capabilities_of(AsyncEchoSolver)  # classes work too
+    assert caps.asynchronous and caps.batched and caps.thread_safe and not caps.process_safe
+    assert capabilities_of(ArithmeticVerifier()).records
+
+
+def test_plan_picks_fastest_supported_path():
+    arith = (ArithmeticChallenger(), ArithmeticSolver(), ArithmeticVerifier())
+    plan = plan_execution(*arith, workers=8)
+    assert (plan.executor, plan.records) == ("serial", True)
+    code = (CodeIOChallenger(), CodeIOSolver(), CodeIOVerifier())
+    assert plan_execution(*code, workers=4).executor == "process"
+    assert plan_execution(*code, workers=1).executor == "serial"
+    async_code = (CodeIOChallenger(), AsyncEchoSolver(), CodeIOVerifier())
+    assert plan_execution(*async_code, workers=4).executor == "thread"
+    echo = (CodeIOChallenger(), EchoSolver(), CodeIOVerifier())
+    assert plan_execution(*echo, workers=4).executor == "serial"
+
+    trainer = Trainer(*arith, executor="auto", workers=4)
+    trainer.run(episodes=1, batch_size=4)
+    assert trainer.executor == "serial" and trainer.records
+
+
+class _EntryPoint:
+    name, value = "toy", "toy_plugin:PLUGIN"
+
+    def __init__(self) -> None:
+        self.loaded = 0
+
+    def load(self):
+        self.loaded += 1
+        return lambda: DomainPlugin(
+            "renamed", ArithmeticChallenger, EchoSolver, ArithmeticVerifier, "echo"
+        )
+
+
+def test_entry_point_plugins_load_lazily(monkeypatch):
+    ep = _EntryPoint()
+    monkeypatch.setattr(plugins, "_entry_points", {"toy": ep})
+    monkeypatch.setattr(plugins, "_REGISTRY", dict(plugins._REGISTRY))
+    assert plugins.names() == ["arithmetic", "code-io", "toy"] and ep.loaded == 0
+    plugin = plugins.get("toy")
+    assert plugin.name == "toy" and plugins.get("toy") is plugin and ep.loaded == 1
+    samples = Trainer(*plugin.create()).run(episodes=1, batch_size=3)
+    assert len(samples) == 3
+    with pytest.raises(KeyError, match="available: arithmetic, code-io, toy"):
+        plugins.get("missing")
+    with pytest.raises(ValueError):
+        plugins.register(plugin)
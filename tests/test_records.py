@@ -0,0 +1,44 @@
+import json
+import random
+
+from rzero.domains.arithmetic import ArithmeticChallenger, ArithmeticSolver, ArithmeticVerifier
+from rzero.domains.code_io import CodeIOChallenger, CodeIOSolver, CodeIOVerifier
+from rzero.loop import Trainer
+from rzero.records import SampleRecord, TaskRecord, record_rows
+from rzero.storage import JsonlSink, read_jsonl
+
+
+def _run(records, tmp_path, challenger, solver, verifier):
+    random.seed(7)
+    path = tmp_path / f"{records}.jsonl"
+    with JsonlSink(path, append=False) as sink:
+        trainer = Trainer(challenger, solver, verifier, records=records, sink=sink)
+        samples = trainer.run(episodes=3, batch_size=20)
+    return samples, read_jsonl(path), trainer.difficulty
+
+
+def test_record_fast_path_matches_pydantic_path(tmp_path):
+    for domain in (
+        (ArithmeticChallenger, ArithmeticSolver, ArithmeticVerifier),
+        (CodeIOChallenger, CodeIOSolver, CodeIOVerifier),
+    ):
+        slow = _run(False, tmp_path, *(cls() for cls in domain))
+        fast = _run(True, tmp_path, *(cls() for cls in domain))
+        # run() still returns pydantic Samples
+        assert [s.model_dump(exclude={"task": {"created_at"}}) for s in slow[0]] == \
+            [s.model_dump(exclude={"task": {"created_at"}}) for s in fast[0]]
+        for row in slow[1] + fast[1]:
+            row["task"].pop("created_at")
+        assert slow[1] == fast[1] and slow[2] == fast[2]
+
+
+def test_record_rows_match_model_dump():
+    random.seed(1)
+    task = ArithmeticChallenger().propose_records(1, difficulty=0.9)[0]
+    sol = ArithmeticSolver().solve_records([task])[0]
+    ver = ArithmeticVerifier().verify_records([task], [sol])[0]
+    rec = SampleRecord(task, sol, ver)
+    expected = {**rec.to_model().model_dump(mode="json"), "episode": 4}
+    assert record_rows([rec], episode=4)[0] == expected
+    assert TaskRecord.from_model(task.to_model()) == task
+    assert json.loads(json.dumps(rec.to_row()))["verification"]["passed"] is True
@@ -0,0 +1,37 @@
+from rzero.curriculum import Curriculum
+from rzero.domains.code_io import CodeIOChallenger, CodeIOSolver, CodeIOVerifier
+from rzero.loop import Trainer
+from rzero.replay import ReplayCheckpoint, replay
+from rzero.solvers.trainable_template import CodeIOTrainable
+from rzero.storage import JsonlSink
+
+
+class CountingTrainable(CodeIOTrainable):
+    def __init__(self) -> None:
+        super().__init__()
+        self.batches: list[int] = []
+
+    def update(self, samples):
+        self.batches.append(len(samples))
+        super().update(samples)
+
+
+def test_chunked_replay_with_resume(tmp_path):
+    path = tmp_path / "samples.jsonl"
+    with JsonlSink(path, append=False) as sink:
+        components = (CodeIOChallenger(), CodeIOSolver(), CodeIOVerifier(), Curriculum())
+        Trainer(*components, sink=sink).run(episodes=3, batch_size=10)
+
+    ckpt = tmp_path / "replay.json"
+    first = CountingTrainable()
+    done = replay(first, path, chunk_size=8, update_size=3, workers=2, limit=16, checkpoint=ckpt)
+    assert done == 16
+    assert first.batches == [3, 3, 2, 3, 3, 2]
+    state = ReplayCheckpoint.load(ckpt)
+    assert state.offset == 16
+
+    resumed = CountingTrainable()
+    resumed.load(state.solver_state)
+    assert resumed.memory == first.memory
+    assert replay(resumed, path, chunk_size=8, start=state.offset) == 30
+    assert sum(resumed.batches) == 14
@@ -0,0 +1,74 @@
+from rzero.columnar import iter_rows, write_columnar
+from rzero.domains.arithmetic import ArithmeticChallenger, ArithmeticSolver, ArithmeticVerifier
+from rzero.loop import Trainer
+from rzero.replay import iter_chunks, parse_chunk
+from rzero.samplestore import SampleStore, compact, is_store, row_hash, sample_hash
+from rzero.storage import read_jsonl, write_jsonl
+
+
+def _trainer(records=False):
+    components = (ArithmeticChallenger(), ArithmeticSolver(), ArithmeticVerifier())
+    return Trainer(*components, records=records)
+
+
+def _samples(n=20, records=False):
+    return _trainer(records).run(episodes=1, batch_size=n)
+
+
+def test_store_dedupes_on_insert_and_looks_up_verifications(tmp_path):
+    samples = _samples()
+    path = tmp_path / "samples.db"
+    with SampleStore(path) as store:
+        store.write(samples, episode=0)
+        # same pairs under fresh random task ids are still duplicates
+        renamed = [s.task.model_copy(update={"id": "other"}) for s in samples]
+        store.write([s.model_copy(update={"task": t}) for s, t in zip(samples, renamed)])
+        assert len(store) == len({row_hash(s.model_dump(mode="json")) for s in samples})
+        assert store.duplicates == len(samples) + len(samples) - len(store)
+        s = samples[0]
+        key = sample_hash(s.task.domain, s.task.prompt, s.solution.content)
+        assert key in store and store.lookup(key) == (True, 1.0)
+        stored = store.verification(s.task.domain, s.task.prompt, s.solution.content)
+        assert stored["passed"] is True
+        assert store.lookup(sample_hash("arithmetic", s.task.prompt, "wrong")) is None
+    assert is_store(path) and not is_store(tmp_path / "missing.db")
+
+    # stores read like any dataset, and replay seeks by row
+    rows = list(iter_rows(path, fields=["task.domain", "episode"]))
+    assert rows[0] == {"task.domain": "arithmetic", "episode": 0}
+    assert len(parse_chunk(next(iter_chunks(path, 100, start=2)))) == len(rows) - 2
+
+
+def test_compact_merges_shards(tmp_path):
+    a, b = _samples(30), _samples(30, records=True)
+    write_jsonl(a, tmp_path / "a.jsonl")
+    write_jsonl(a + b, tmp_path / "b.jsonl.gz")
+    write_columnar(read_jsonl(tmp_path / "a.jsonl"), tmp_path / "cols")
+    distinct = {row_hash(r) for r in read_jsonl(tmp_path / "b.jsonl.gz")}
+
+    shards = [tmp_path / "a.jsonl", tmp_path / "b.jsonl.gz", tmp_path / "cols"]
+    result = compact(shards, tmp_path / "out.jsonl")
+    assert result["rows"] == len(distinct) and result["duplicates"] == 120 - len(distinct)
+    assert [row_hash(r) for r in read_jsonl(tmp_path / "out.jsonl")] == list(dict.fromkeys(
+        row_hash(r) for r in read_jsonl(tmp_path / "b.jsonl.gz")))  # first occurrence order
+
+    assert compact(shards, tmp_path / "out.db")["rows"] == len(distinct)
+    again = compact([tmp_path / "out.jsonl"], tmp_path / "out.db")  # merging into an existing store
+    assert again == {"rows": len(distinct), "inserted": 0, "duplicates": len(distinct)}
+
+
+def test_sinks_encode_mixed_batches_and_store_overwrite(tmp_path):
+    from rzero.storage import JsonlSink
+
+    models = _samples(4)
+    records = _trainer(records=True).run_episode(4)[0]
+    batch = [x for pair in zip(records, models) for x in pair]  # SampleRecord, Sample, ...
+    with JsonlSink(tmp_path / "mixed.jsonl") as sink:
+        sink.write(batch, episode=1)
+    with SampleStore(tmp_path / "mixed.db") as store:
+        store.write(batch, episode=1)
+        assert len(store) == len({row_hash(r) for r in read_jsonl(tmp_path / "mixed.jsonl")})
+    assert all(r["episode"] == 1 for r in read_jsonl(tmp_path / "mixed.jsonl"))
+
+    with SampleStore(tmp_path / "mixed.db", append=False) as store:
+        assert len(store) == 0  # overwrite empties the store
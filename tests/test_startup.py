@@ -0,0 +1,30 @@
+import pytest
+
+from rzero.bench import STARTUP_BUDGET_US, import_times
+
+
+def test_cli_import_is_lazy_and_within_budget():
+    times = import_times("import rzero.cli")
+    heavy = [
+        m for m in times
+        if m.split(".")[0] in ("pydantic", "asyncio")
+        or m.startswith(("rzero.domains.", "rzero.loop", "rzero.types"))
+    ]
+    assert heavy == []
+    # best of a few runs, so a noisy neighbour does not fail the suite
+    reruns = [import_times("import rzero.cli")["rzero.cli"][1] for _ in range(2)]
+    best = min([times["rzero.cli"][1]] + reruns)
+    assert best < STARTUP_BUDGET_US
+
+
+def test_lazy_package_exports_and_domain_registry():
+    import rzero
+    from rzero import domains
+    from rzero.cli import EXECUTOR_CHOICES
+    from rzero.execution import EXECUTORS
+
+    assert rzero.Trainer.__module__ == "rzero.loop" and "Sample" in dir(rzero)
+    assert EXECUTOR_CHOICES == EXECUTORS  # "auto" is added on top in the CLI
+    assert domains.load("code-io").CodeIOChallenger
+    with pytest.raises(KeyError, match="available"):
+        domains.load("nope")
@@ -0,0 +1,64 @@
+from rzero.curriculum import Curriculum
+from rzero.domains.arithmetic import ArithmeticChallenger, ArithmeticSolver, ArithmeticVerifier
+from rzero.loop import Trainer
+from rzero.storage import JsonlSink, read_jsonl
+
+
+def _trainer(**kw):
+    return Trainer(
+        challenger=ArithmeticChallenger(),
+        solver=ArithmeticSolver(),
+        verifier=ArithmeticVerifier(),
+        curriculum=Curriculum(),
+        **kw,
+    )
+
+
+def test_sink_streams_and_appends(tmp_path):
+    path = tmp_path / "samples.jsonl.gz"
+    with JsonlSink(path, append=False, fsync_every=1) as sink:
+        trainer = _trainer(sink=sink, keep_samples=False)
+        assert trainer.run(episodes=3, batch_size=4) == []
+        assert len(read_jsonl(path)) == 12  # visible before close (flushed per episode)
+    with JsonlSink(path, append=True) as sink:
+        _trainer(sink=sink).run(episodes=1, batch_size=5)
+    rows = read_jsonl(path)
+    assert len(rows) == 17
+    assert [r["episode"] for r in rows[:12:4]] == [0, 1, 2]
+
+
+def test_stats_one_pass_with_projection(tmp_path):
+    from rzero.stats import STATS_FIELDS, DatasetStats
+    from rzero.storage import iter_jsonl
+
+    path = tmp_path / "samples.jsonl"
+    with JsonlSink(path, append=False) as sink:
+        _trainer(sink=sink, difficulty=0.3).run(episodes=2, batch_size=10)
+    rows = list(iter_jsonl(path, fields=STATS_FIELDS, use_mmap=True))
+    assert set(rows[0]) == set(STATS_FIELDS) and len(rows) == 20
+
+    stats = DatasetStats()
+    for i, row in enumerate(rows):
+        stats.add({**row, "solution.latency_ms": float(i)})
+    summary = stats.summary()
+    assert summary["accuracy"] == 1.0
+    assert summary["by_domain"]["arithmetic"]["samples"] == 20
+    assert summary["latency_ms"]["p50"] == 9.5
+
+
+def test_columnar_roundtrip_and_indexes(tmp_path):
+    from rzero.columnar import ColumnarDataset, convert
+
+    path = tmp_path / "samples.jsonl"
+    with JsonlSink(path, append=False) as sink:
+        _trainer(sink=sink).run(episodes=3, batch_size=4)
+    rows = read_jsonl(path)
+    ds = ColumnarDataset(convert(path, tmp_path / "col"))
+    assert len(ds) == 12
+    assert list(ds.column("verification.score")) == [r["verification"]["score"] for r in rows]
+    assert ds.column("task.domain", 2, 4) == ["arithmetic", "arithmetic"]
+    assert ds.ranges(episode=1) == [(4, 8)]
+    assert list(ds.rows(4, 8)) == rows[4:8]
+    assert ds.find(rows[7]["task"]["id"]) == rows[7]
+    assert ds.find("missing") is None
+    assert read_jsonl(convert(tmp_path / "col", tmp_path / "back.jsonl", to="jsonl")) == rows
@@ -0,0 +1,63 @@
+import json
+import pickle
+import random
+
+from rzero.domains.code_io import CodeIOChallenger, CodeIOSolver, CodeIOVerifier
+from rzero.domains.taskbank import _BANKS, TaskBank, spec_of, synthesize
+from rzero.loop import Trainer
+
+
+def test_synthesized_bank_roundtrip_and_difficulty_sampling(tmp_path):
+    specs = synthesize(2000, seed=1)
+    assert len(specs) > 500 and len({s["id"] for s in specs}) == len(specs)
+    assert specs == synthesize(2000, seed=1)
+
+    path = tmp_path / "bank.jsonl.gz"
+    TaskBank(specs).save(path)
+    bank = TaskBank.load(path)
+    assert len(bank) == len(specs)
+
+    rng = random.Random(0)
+    easy = [bank.sample(0.1, rng=rng)["difficulty"] for _ in range(200)]
+    hard = [bank.sample(0.9, rng=rng)["difficulty"] for _ in range(200)]
+    assert max(easy) < 0.3 and min(hard) >= 0.7
+    # falls back to the nearest bucket with the tag
+    assert all("string" in bank.sample(0.9, tag="string", rng=rng)["tags"] for _ in range(50))
+
+
+def test_tasks_reference_specs_and_verify(tmp_path):
+    bank = TaskBank(synthesize(300, seed=2))
+    tasks = CodeIOChallenger(bank).propose_batch(40, difficulty=0.6)
+    assert all(set(t.meta) == {"bank", "spec_id", "name"} for t in tasks)
+    assert "tests" not in json.dumps(tasks[0].model_dump(mode="json"))
+
+    solver, verifier = CodeIOSolver(), CodeIOVerifier(bank=bank)
+    assert all(verifier.verify(t, solver.solve(t)).passed for t in tasks)  # reference solutions
+
+    # a pickled verifier re-registers its bank (as in a fresh worker process)
+    del _BANKS[bank.id]
+    clone = pickle.loads(pickle.dumps(verifier))
+    assert spec_of(tasks[0]) is clone.bank.get(tasks[0].meta["spec_id"])
+
+
+def test_default_bank_trainer_and_legacy_meta():
+    trainer = Trainer(CodeIOChallenger(), CodeIOSolver(), CodeIOVerifier())
+    samples = trainer.run(episodes=1, batch_size=6)
+    assert all(s.verification.passed for s in samples)
+    legacy = {"name": "add", "tests": [[[1, 2], 3]]}
+    assert spec_of(samples[0].task.model_copy(update={"meta": {"spec": legacy}})) is legacy
+
+
+def test_unloaded_bank_is_an_error():
+    import pytest
+
+    from rzero.domains.taskbank import name_of
+
+    bank = TaskBank(synthesize(50, seed=3), id="elsewhere")
+    task = CodeIOChallenger(bank).propose_batch(1, difficulty=0.5)[0]
+    del _BANKS["elsewhere"]  # as in a fresh process that never loaded the bank
+    with pytest.raises(KeyError, match="elsewhere"):
+        spec_of(task)
+    with pytest.raises(KeyError):
+        CodeIOSolver().solve(task)  # needs the reference solution from the spec
+    assert name_of(task) == task.meta["name"]  # solvers that only need the name keep working